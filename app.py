@@ -4,10 +4,17 @@ Dashboard Interativo - Previsão de Séries Temporais
 """
 
 import os
+import time
 import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
 
+from src.forecast_store import salvar_repositorio_previsoes, RepositorioPrevisoes
+from src.downsampling import reduzir_serie, METODOS
+from src.forecast_service import ServicoPrevisao, MODELOS_CLASSICOS
+from src.registry import listar_modelos_registrados
+from src.cache import CacheAjustes
+
 
 # =====================================================
 # CONFIGURAÇÃO DA PÁGINA
@@ -24,69 +31,151 @@ st.markdown("Comparação entre Modelos Clássicos e LSTM")
 # ✅ CAMINHO ABSOLUTO
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, "Data", "processed")
+REPOSITORIO_DIR = os.path.join(DATA_DIR, "repositorio_previsoes")
+REGISTRO_DIR = os.path.join(DATA_DIR, "modelos")
+CACHE_DIR = os.path.join(DATA_DIR, "cache_ajustes")
 
 
 # =====================================================
 # FUNÇÕES AUXILIARES
 # =====================================================
 
+EXTENSOES = (".parquet", ".csv")  # Parquet tem prioridade
+
+
+def ler_tabela(path):
+    """Lê Parquet (DATA já tipada) ou CSV."""
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    
+    return pd.read_csv(path)
+
+
+def localizar_arquivo(nome_base):
+    """Retorna o caminho do arquivo (Parquet ou CSV) ou None."""
+    for extensao in EXTENSOES:
+        path = os.path.join(DATA_DIR, nome_base + extensao)
+        if os.path.exists(path):
+            return path
+    
+    return None
+
+
 @st.cache_data
 def carregar_metricas():
-    path = os.path.join(DATA_DIR, "metricas_modelos.csv")
+    path = localizar_arquivo("metricas_modelos")
     
-    if not os.path.exists(path):
+    if path is None:
         st.error("❌ Arquivo de métricas não encontrado! Execute o pipeline primeiro (main.py)")
         st.stop()
     
-    return pd.read_csv(path)
+    return ler_tabela(path)
 
 
-@st.cache_data
-def carregar_previsao(nome_arquivo):
-    path = os.path.join(DATA_DIR, nome_arquivo)
-    
-    if not os.path.exists(path):
-        st.error(f"❌ Arquivo não encontrado: {nome_arquivo}")
+def listar_arquivos_previsao():
+    """Arquivos previsao_* avulsos (saída de versões anteriores do main.py)."""
+    if not os.path.exists(DATA_DIR):
+        st.error("❌ Pasta Data/processed não encontrada! Execute o pipeline primeiro.")
         st.stop()
     
-    df = pd.read_csv(path)
+    arquivos = set(os.listdir(DATA_DIR))
+    return [
+        arq for arq in sorted(arquivos)
+        if arq.startswith("previsao_") and arq.endswith(EXTENSOES)
+        # Se houver CSV e Parquet do mesmo modelo, mantém só o Parquet
+        and not (arq.endswith(".csv") and arq[:-4] + ".parquet" in arquivos)
+    ]
+
+
+def consolidar_arquivos_previsao():
+    """Monta o repositório a partir dos arquivos avulsos (uma única vez)."""
+    arquivos = listar_arquivos_previsao()
     
-    # ✅ VALIDAÇÃO DE COLUNAS
-    if "DATA" not in df.columns:
-        st.error(f"❌ Arquivo {nome_arquivo} não contém a coluna 'DATA'")
-        st.info(f"Colunas encontradas: {df.columns.tolist()}")
+    if not arquivos:
+        st.warning("⚠️ Nenhum arquivo de previsão encontrado! Execute o main.py.")
         st.stop()
     
-    df["DATA"] = pd.to_datetime(df["DATA"])
-    return df
+    df_previsoes = pd.concat(
+        [
+            ler_tabela(os.path.join(DATA_DIR, arq)).assign(MODELO=extrair_nome_modelo(arq))
+            for arq in arquivos
+        ],
+        ignore_index=True
+    )
+    
+    serie = None
+    path_serie = localizar_arquivo("serie_temporal_mensal")
+    
+    if path_serie is not None:
+        df_serie = ler_tabela(path_serie)
+        serie = pd.Series(
+            df_serie.iloc[:, 1].to_numpy(),
+            index=pd.to_datetime(df_serie["DATA"])
+        )
+    
+    salvar_repositorio_previsoes(df_previsoes, REPOSITORIO_DIR, serie=serie)
+
+
+@st.cache_resource
+def _abrir_repositorio(mtime_indice):
+    # mtime na chave: um novo main.py invalida o repositório em cache
+    return RepositorioPrevisoes(REPOSITORIO_DIR)
+
+
+def abrir_repositorio():
+    """Repositório consolidado (memory-map), sem listar a pasta a cada rerun."""
+    path_indice = os.path.join(REPOSITORIO_DIR, "indice.json")
+    
+    if not os.path.exists(path_indice):
+        consolidar_arquivos_previsao()
+    
+    return _abrir_repositorio(os.path.getmtime(path_indice))
+
+
+def carregar_previsao(modelo):
+    # Fatia do array em memory-map: sem parsing de arquivo
+    return abrir_repositorio().previsao(modelo)
 
 
-@st.cache_data
 def carregar_serie_completa():
-    """✅ NOVA FUNÇÃO: Carrega série temporal completa"""
-    path = os.path.join(DATA_DIR, "serie_temporal_mensal.csv")
+    """Série temporal completa (guardada no repositório)"""
+    return abrir_repositorio().serie()
+
+
+def versao_repositorio():
+    """mtime do índice: muda a cada nova gravação do repositório."""
+    return os.path.getmtime(os.path.join(REPOSITORIO_DIR, "indice.json"))
+
+
+def periodo_repositorio():
+    """Primeira e última data do repositório (série + previsões)."""
+    indice = abrir_repositorio().indice
+    return (
+        pd.Timestamp(indice["DATA_INICIO"].min()).date(),
+        pd.Timestamp(indice["DATA_FIM"].max()).date()
+    )
+
+
+@st.cache_data(max_entries=512)
+def carregar_traco(modelo, coluna, inicio, fim, n_pontos, metodo, versao):
+    """
+    Traço recortado ao período e reduzido a no máximo n_pontos
+    (modelo None = série histórica). Em cache por (modelo, período,
+    resolução); `versao` invalida o cache quando o main.py regrava.
+    """
+    df = carregar_serie_completa() if modelo is None else carregar_previsao(modelo)
     
-    if not os.path.exists(path):
+    if df is None:
         return None
     
-    df = pd.read_csv(path)
-    df["DATA"] = pd.to_datetime(df["DATA"])
-    return df
+    return reduzir_serie(df, coluna, n_pontos, inicio, fim, metodo)
 
 
 def listar_modelos():
-    if not os.path.exists(DATA_DIR):
-        st.error("❌ Pasta Data/processed não encontrada! Execute o pipeline primeiro.")
-        st.stop()
-    
-    arquivos = os.listdir(DATA_DIR)
-    modelos = [
-        arq for arq in arquivos
-        if arq.startswith("previsao_") and arq.endswith(".csv")
-    ]
+    modelos = abrir_repositorio().modelos
     
     if not modelos:
-        st.warning("⚠️ Nenhum arquivo de previsão encontrado! Execute o main.py.")
+        st.warning("⚠️ Nenhuma previsão no repositório! Execute o main.py.")
         st.stop()
     
     return modelos
@@ -94,7 +183,7 @@ def listar_modelos():
 
 def extrair_nome_modelo(nome_arquivo):
     """✅ NOVA FUNÇÃO: Extrai nome limpo do modelo"""
-    nome = nome_arquivo.replace("previsao_", "").replace(".csv", "")
+    nome = os.path.splitext(nome_arquivo.replace("previsao_", ""))[0]
     
     # Padroniza nomes conhecidos
     mapeamento = {
@@ -109,23 +198,17 @@ def extrair_nome_modelo(nome_arquivo):
     return mapeamento.get(nome.lower(), nome)
 
 
-def plotar_previsao(df_previsao, nome_modelo, df_serie_completa=None):
-    """✅ GRÁFICO COM SÉRIE COMPLETA + PREVISÃO"""
+def plotar_previsao(df_real, df_previsto, nome_modelo, df_historico=None):
+    """✅ GRÁFICO COM SÉRIE COMPLETA + PREVISÃO (traços já reduzidos)"""
     
     fig = go.Figure()
     
-    # ✅ Adiciona série histórica completa (se disponível)
-    if df_serie_completa is not None:
-        # Pega apenas dados anteriores ao período de teste
-        data_inicio_teste = df_previsao["DATA"].min()
-        df_historico = df_serie_completa[
-            df_serie_completa["DATA"] < data_inicio_teste
-        ]
-        
+    # ✅ Adiciona série histórica (se disponível)
+    if df_historico is not None:
         fig.add_trace(
             go.Scatter(
                 x=df_historico["DATA"],
-                y=df_historico.iloc[:, 1],  # Primeira coluna numérica
+                y=df_historico["REAL"],
                 mode="lines",
                 name="Histórico",
                 line=dict(color="gray", width=1.5),
@@ -136,8 +219,8 @@ def plotar_previsao(df_previsao, nome_modelo, df_serie_completa=None):
     # Real (período de teste)
     fig.add_trace(
         go.Scatter(
-            x=df_previsao["DATA"],
-            y=df_previsao["REAL"],
+            x=df_real["DATA"],
+            y=df_real["REAL"],
             mode="lines+markers",
             name="Real (Teste)",
             line=dict(color="blue", width=2),
@@ -148,8 +231,8 @@ def plotar_previsao(df_previsao, nome_modelo, df_serie_completa=None):
     # Previsão
     fig.add_trace(
         go.Scatter(
-            x=df_previsao["DATA"],
-            y=df_previsao["PREVISAO"],
+            x=df_previsto["DATA"],
+            y=df_previsto["PREVISAO"],
             mode="lines+markers",
             name="Previsto",
             line=dict(color="red", width=2, dash="dash"),
@@ -186,8 +269,7 @@ modelos_disponiveis = listar_modelos()
 
 modelo_escolhido = st.sidebar.selectbox(
     "Escolha o modelo:",
-    modelos_disponiveis,
-    format_func=extrair_nome_modelo  # ✅ Exibe nome formatado
+    modelos_disponiveis
 )
 
 mostrar_ranking = st.sidebar.checkbox(
@@ -195,16 +277,50 @@ mostrar_ranking = st.sidebar.checkbox(
     value=True
 )
 
+# Cada traço é recortado ao período e reduzido no servidor antes de ir
+# para o Plotly (séries diárias / muitas UFs não travam o navegador)
+st.sidebar.subheader("🔍 Visualização")
+
+data_min, data_max = periodo_repositorio()
+
+periodo = st.sidebar.slider(
+    "Período exibido:",
+    min_value=data_min,
+    max_value=data_max,
+    value=(data_min, data_max),
+    format="MM/YYYY"
+)
+
+n_pontos = st.sidebar.select_slider(
+    "Pontos por traço:",
+    options=[250, 500, 1000, 2000, 5000],
+    value=1000
+)
+
+metodo_reducao = st.sidebar.selectbox(
+    "Redução:",
+    METODOS,
+    format_func={"lttb": "LTTB (forma da curva)", "minmax": "Mín/máx (picos)"}.get
+)
+
 
 # =====================================================
 # CARREGAR DADOS
 # =====================================================
 
 df_metricas = carregar_metricas()
-df_previsao = carregar_previsao(modelo_escolhido)
-df_serie_completa = carregar_serie_completa()  # ✅ Série completa
 
-nome_modelo_exibicao = extrair_nome_modelo(modelo_escolhido)
+janela = (*periodo, n_pontos, metodo_reducao, versao_repositorio())
+
+df_real = carregar_traco(modelo_escolhido, "REAL", *janela)
+df_previsto = carregar_traco(modelo_escolhido, "PREVISAO", *janela)
+
+# ✅ Histórico: só o trecho anterior ao período de teste
+inicio_teste = carregar_previsao(modelo_escolhido)["DATA"].min()
+fim_historico = min(periodo[1], (inicio_teste - pd.Timedelta(days=1)).date())
+df_historico = carregar_traco(None, "REAL", periodo[0], fim_historico, *janela[2:])
+
+nome_modelo_exibicao = modelo_escolhido
 
 
 # =====================================================
@@ -214,7 +330,7 @@ nome_modelo_exibicao = extrair_nome_modelo(modelo_escolhido)
 col1, col2 = st.columns([2, 1])
 
 with col1:
-    plotar_previsao(df_previsao, nome_modelo_exibicao, df_serie_completa)
+    plotar_previsao(df_real, df_previsto, nome_modelo_exibicao, df_historico)
 
 with col2:
     st.subheader("📈 Métricas do Modelo")
@@ -275,16 +391,14 @@ st.subheader("📊 Comparação Visual entre Modelos")
 comparar = st.multiselect(
     "Selecione modelos para comparar:",
     modelos_disponiveis,
-    default=modelos_disponiveis[:2] if len(modelos_disponiveis) >= 2 else modelos_disponiveis,
-    format_func=extrair_nome_modelo
+    default=modelos_disponiveis[:2] if len(modelos_disponiveis) >= 2 else modelos_disponiveis
 )
 
 if comparar:
     fig = go.Figure()
     
-    for arquivo in comparar:
-        df_temp = carregar_previsao(arquivo)
-        nome_temp = extrair_nome_modelo(arquivo)
+    for nome_temp in comparar:
+        df_temp = carregar_traco(nome_temp, "PREVISAO", *janela)
         
         fig.add_trace(
             go.Scatter(
@@ -306,6 +420,140 @@ if comparar:
     st.plotly_chart(fig, use_container_width=True)
 
 
+# =====================================================
+# PREVISÃO SOB DEMANDA
+# =====================================================
+
+@st.cache_resource
+def servico_previsao(versao):
+    """
+    Serviço único por versão do repositório: a thread de fundo e as
+    previsões já calculadas sobrevivem aos reruns e às sessões.
+    """
+    df_serie = carregar_serie_completa()
+    serie = pd.Series(df_serie["REAL"].to_numpy(), index=pd.DatetimeIndex(df_serie["DATA"]))
+    
+    return ServicoPrevisao(
+        serie,
+        cache=CacheAjustes(CACHE_DIR),
+        registro_dir=REGISTRO_DIR
+    )
+
+
+@st.fragment(run_every=1)
+def aguardar_previsao(futuro, pedido, servico):
+    """
+    Atualiza só este trecho a cada segundo enquanto o pedido está na
+    fila; ao terminar, reexecuta a página uma vez e deixa de existir
+    (o resultado é desenhado fora do fragmento, sem polling).
+    """
+    if futuro.done():
+        st.rerun()
+    
+    st.info(f"⏳ Calculando {pedido['modelo']} em segundo plano... "
+            f"({servico.em_andamento()} pedido(s) na fila)")
+
+
+def painel_sob_demanda(servico):
+    """Acompanha o pedido atual sem bloquear o restante da página."""
+    pedido = st.session_state.get("pedido_previsao")
+    
+    if pedido is None:
+        st.info("Escolha os parâmetros e clique em **Prever agora**.")
+        return
+    
+    inicio = time.perf_counter()
+    futuro = servico.solicitar(**pedido)
+    
+    if not futuro.done():
+        aguardar_previsao(futuro, pedido, servico)
+        return
+    
+    if futuro.exception() is not None:
+        st.error(f"❌ Falha na previsão: {futuro.exception()}")
+        return
+    
+    df_sob_demanda, segundos = futuro.result()
+    latencia = time.perf_counter() - inicio
+    
+    col_fria, col_quente = st.columns(2)
+    col_fria.metric("Latência fria (cálculo)", f"{segundos:.2f}s")
+    col_quente.metric("Latência quente (cache)", f"{latencia * 1000:.2f}ms")
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=df_sob_demanda["DATA"],
+        y=df_sob_demanda["REAL"],
+        mode="lines+markers",
+        name="Real",
+        line=dict(color="blue", width=2)
+    ))
+    fig.add_trace(go.Scatter(
+        x=df_sob_demanda["DATA"],
+        y=df_sob_demanda["PREVISAO"],
+        mode="lines+markers",
+        name="Previsto",
+        line=dict(color="red", width=2, dash="dash")
+    ))
+    fig.update_layout(
+        title=f"Previsão sob demanda — {pedido['modelo']} ({pedido['horizonte']} meses)",
+        xaxis_title="Data",
+        yaxis_title="Número de Óbitos",
+        template="plotly_white",
+        height=450
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+
+st.markdown("---")
+st.subheader("⚡ Previsão sob Demanda")
+
+if carregar_serie_completa() is None:
+    st.info("Série histórica ausente do repositório: execute o main.py.")
+else:
+    servico = servico_previsao(versao_repositorio())
+    
+    with st.form("form_sob_demanda"):
+        col_modelo, col_horizonte, col_treino = st.columns(3)
+        
+        modelo_sob_demanda = col_modelo.selectbox(
+            "Modelo:",
+            list(MODELOS_CLASSICOS) + listar_modelos_registrados(REGISTRO_DIR)
+        )
+        horizonte_sob_demanda = col_horizonte.number_input(
+            "Horizonte (meses):", min_value=1, max_value=60, value=12
+        )
+        proporcao_sob_demanda = col_treino.slider(
+            "Proporção de treino:", min_value=0.5, max_value=0.95, value=0.8, step=0.05
+        )
+        
+        # Ordem (usada só pelo SARIMA)
+        col_ordem, col_sazonal = st.columns(2)
+        order_sob_demanda = col_ordem.text_input("Ordem SARIMA (p,d,q):", "1,1,1")
+        sazonal_sob_demanda = col_sazonal.text_input("Ordem sazonal (P,D,Q,s):", "1,1,1,12")
+        
+        if st.form_submit_button("🔮 Prever agora"):
+            try:
+                st.session_state["pedido_previsao"] = {
+                    "modelo": modelo_sob_demanda,
+                    "horizonte": int(horizonte_sob_demanda),
+                    "proporcao_treino": float(proporcao_sob_demanda),
+                    "order": tuple(int(v) for v in order_sob_demanda.split(",")),
+                    "seasonal_order": tuple(int(v) for v in sazonal_sob_demanda.split(","))
+                }
+            except ValueError:
+                st.error("❌ Ordens devem ser inteiros separados por vírgula.")
+    
+    st.caption(
+        "LSTMs usam a rede do registro, sem retreino, prevendo a partir do fim do treino. "
+        "Pedidos repetidos são respondidos do cache."
+    )
+    
+    painel_sob_demanda(servico)
+
+
 # =====================================================
 # RODAPÉ
 # =====================================================
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: marcar_cids (src.ingestion) vs. `verificar_cid` com
+apply(axis=1) do notebook de tratamento.
+
+Uso:
+    python -m benchmarks.bench_cids --linhas 1000000 --grupos 24
+
+A versão do notebook é medida em uma amostra (--amostra)
+e extrapolada linearmente.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.ingestion import marcar_cids, GRUPOS_CID, COLUNAS_CID
+
+
+# =====================================================
+# REFERÊNCIA: FUNÇÃO DO NOTEBOOK
+# =====================================================
+
+def verificar_cid(row, lista_cids):
+    for col in ['LINHAA', 'LINHAB', 'LINHAC', 'LINHAD', 'LINHAII', 'CAUSABAS_O']:
+        if pd.notna(row[col]):
+            for cid in lista_cids:
+                if cid in row[col]:
+                    return 1
+    return 0
+
+
+def notebook(df, grupos):
+    df = df.copy()
+    for nome, cids in grupos.items():
+        df[nome] = df.apply(verificar_cid, axis=1, lista_cids=cids)
+    return df
+
+
+# =====================================================
+# DADOS SINTÉTICOS
+# =====================================================
+
+def gerar_grupos(n_grupos):
+    grupos = dict(GRUPOS_CID)
+    grupos["covid"] = ["U071", "U072"]
+
+    letras = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    i = 0
+    while len(grupos) < n_grupos:
+        grupos[f"grupo_{i}"] = [f"{letras[i % 26]}{j:02d}" for j in range(i % 5, i % 5 + 4)]
+        i += 1
+
+    return grupos
+
+
+def gerar_linhas(n, seed=42):
+    rng = np.random.default_rng(seed)
+
+    letras = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+    vocabulario = np.array([
+        f"*{letra}{numero:03d}"
+        for letra in letras
+        for numero in range(0, 1000, 7)
+    ] + ["*I10X", "*E149", "*E669", "*F172", "*U071", "*I219"])
+
+    dados = {}
+    for coluna in COLUNAS_CID:
+        primeiro = rng.choice(vocabulario, size=n)
+        segundo = rng.choice(vocabulario, size=n)
+        valores = np.char.add(primeiro, segundo).astype(object)
+        valores[rng.random(n) < 0.4] = np.nan
+        dados[coluna] = valores
+
+    return pd.DataFrame(dados)
+
+
+# =====================================================
+# EXECUÇÃO
+# =====================================================
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    parser.add_argument("--amostra", type=int, default=20_000)
+    parser.add_argument("--grupos", type=int, default=24)
+    args = parser.parse_args()
+
+    grupos = gerar_grupos(args.grupos)
+    df = gerar_linhas(args.linhas)
+    amostra = df.iloc[:min(args.amostra, args.linhas)]
+
+    inicio = time.perf_counter()
+    ref = notebook(amostra, grupos)
+    t_nb = time.perf_counter() - inicio
+
+    novo = marcar_cids(amostra, grupos)
+    for nome in grupos:
+        assert (ref[nome].to_numpy() == novo[nome].to_numpy()).all(), nome
+
+    inicio = time.perf_counter()
+    marcar_cids(df, grupos)
+    t_vec = time.perf_counter() - inicio
+
+    t_nb_total = t_nb * len(df) / len(amostra)
+
+    print(f"Linhas: {len(df):,} | Grupos: {len(grupos)}")
+    print(f"Notebook (amostra {len(amostra):,}): {t_nb:.2f}s")
+    print(f"Notebook (extrapolado):        {t_nb_total:.1f}s")
+    print(f"marcar_cids:                   {t_vec:.2f}s")
+    print(f"Speedup:                       {t_nb_total / t_vec:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
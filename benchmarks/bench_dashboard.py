@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: leitura do dashboard — um arquivo previsao_* por modelo
+(listagem da pasta + parsing do CSV) vs. repositório consolidado
+(índice + fatia do array em memory-map).
+
+Uso:
+    python -m benchmarks.bench_dashboard --modelos 48 --chaves 27
+
+Os dados são sintéticos: `--modelos` modelos × `--chaves` séries
+(UFs) × `--meses` meses de teste, mais a série histórica.
+
+- carga a frio: listar modelos + série histórica + primeiro modelo
+- troca de modelo: previsões de outro modelo para uma UF (sem cache)
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.forecast_store import salvar_repositorio_previsoes, RepositorioPrevisoes
+
+
+UFS = [
+    "AC", "AL", "AM", "AP", "BA", "CE", "DF", "ES", "GO", "MA", "MG", "MS", "MT", "PA",
+    "PB", "PE", "PI", "PR", "RJ", "RN", "RO", "RR", "RS", "SC", "SE", "SP", "TO"
+]
+
+
+def _gerar_previsoes(n_modelos, n_chaves, n_meses, rng):
+    datas = pd.date_range("2020-01-01", periods=n_meses, freq="MS")
+    chaves = (UFS * (n_chaves // len(UFS) + 1))[:n_chaves]
+    chaves = [f"{c}{i // len(UFS) or ''}" for i, c in enumerate(chaves)]
+
+    return pd.DataFrame({
+        "MODELO": np.repeat([f"MODELO_{m:03d}" for m in range(n_modelos)], n_chaves * n_meses),
+        "CHAVE": np.tile(np.repeat(chaves, n_meses), n_modelos),
+        "DATA": np.tile(datas, n_modelos * n_chaves),
+        "REAL": rng.random(n_modelos * n_chaves * n_meses) * 1000,
+        "PREVISAO": rng.random(n_modelos * n_chaves * n_meses) * 1000
+    })
+
+
+# =====================================================
+# ANTES: UM ARQUIVO POR MODELO
+# =====================================================
+
+def _ler_csv(path):
+    df = pd.read_csv(path)
+    df["DATA"] = pd.to_datetime(df["DATA"])
+    return df
+
+
+def _listar(diretorio):
+    return sorted(a for a in os.listdir(diretorio) if a.startswith("previsao_"))
+
+
+def antes_carga_fria(diretorio):
+    arquivos = _listar(diretorio)
+    _ler_csv(os.path.join(diretorio, "serie_temporal_mensal.csv"))
+    df = _ler_csv(os.path.join(diretorio, arquivos[0]))
+    return df[df["CHAVE"] == df["CHAVE"].iloc[0]]
+
+
+def antes_troca(diretorio, arquivo, chave):
+    _listar(diretorio)  # o dashboard lista a pasta a cada rerun
+    df = _ler_csv(os.path.join(diretorio, arquivo))
+    return df[df["CHAVE"] == chave]
+
+
+# =====================================================
+# DEPOIS: REPOSITÓRIO CONSOLIDADO
+# =====================================================
+
+def depois_carga_fria(diretorio):
+    repositorio = RepositorioPrevisoes(diretorio)
+    repositorio.serie()
+    modelo = repositorio.modelos[0]
+    return repositorio, repositorio.previsao(modelo, repositorio.chaves(modelo)[0])
+
+
+def _medir(funcao, repeticoes):
+    tempos = []
+
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+
+    return np.median(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modelos", type=int, default=48)
+    parser.add_argument("--chaves", type=int, default=27)
+    parser.add_argument("--meses", type=int, default=36)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    df = _gerar_previsoes(args.modelos, args.chaves, args.meses, rng)
+    serie = pd.Series(
+        rng.random(180) * 1000,
+        index=pd.date_range("2010-01-01", periods=180, freq="MS")
+    )
+
+    with tempfile.TemporaryDirectory() as diretorio:
+
+        for i, (modelo, grupo) in enumerate(df.groupby("MODELO")):
+            grupo.drop(columns="MODELO").to_csv(
+                os.path.join(diretorio, f"previsao_{modelo.lower()}.csv"), index=False
+            )
+
+        serie.rename_axis("DATA").reset_index().to_csv(
+            os.path.join(diretorio, "serie_temporal_mensal.csv"), index=False
+        )
+
+        dir_repositorio = os.path.join(diretorio, "repositorio_previsoes")
+
+        inicio = time.perf_counter()
+        salvar_repositorio_previsoes(df, dir_repositorio, serie=serie)
+        t_gravacao = time.perf_counter() - inicio
+
+        arquivos = _listar(diretorio)
+        repositorio, _ = depois_carga_fria(dir_repositorio)
+        chaves = repositorio.chaves(repositorio.modelos[0])
+        trocas = [(m, chaves[m % len(chaves)]) for m in range(args.modelos)]
+
+        # Mesmo conteúdo nas duas leituras
+        modelo, chave = repositorio.modelos[-1], chaves[-1]
+        ref = antes_troca(diretorio, arquivos[-1], chave)
+        assert np.allclose(ref["PREVISAO"], repositorio.previsao(modelo, chave)["PREVISAO"])
+
+        t_fria_antes = _medir(lambda: antes_carga_fria(diretorio), args.repeticoes)
+        t_fria_depois = _medir(lambda: depois_carga_fria(dir_repositorio), args.repeticoes)
+
+        t_troca_antes = _medir(
+            lambda: [antes_troca(diretorio, arquivos[m], c) for m, c in trocas],
+            args.repeticoes
+        ) / len(trocas)
+        t_troca_depois = _medir(
+            lambda: [repositorio.previsao(repositorio.modelos[m], c) for m, c in trocas],
+            args.repeticoes
+        ) / len(trocas)
+
+    print(
+        f"Modelos: {args.modelos} | séries: {args.chaves} | meses: {args.meses} "
+        f"| linhas: {len(df):,} | gravação do repositório: {t_gravacao * 1000:.0f}ms"
+    )
+    print(f"{'':<18} {'arquivos':>10} {'repositório':>12} {'ganho':>8}")
+    print(f"{'carga a frio':<18} {t_fria_antes:8.2f}ms {t_fria_depois:10.2f}ms "
+          f"{t_fria_antes / t_fria_depois:7.1f}x")
+    print(f"{'troca de modelo':<18} {t_troca_antes:8.2f}ms {t_troca_depois:10.2f}ms "
+          f"{t_troca_antes / t_troca_depois:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
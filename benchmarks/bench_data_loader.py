@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: carregamento de previsões em CSV vs. Parquet (src.data_loader).
+
+Uso:
+    python -m benchmarks.bench_data_loader --linhas 1000000
+
+Mede a leitura completa e a leitura com projeção de colunas
+(apenas DATA + PREVISAO).
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data_loader import carregar_previsao, salvar_tabela
+
+
+def cronometrar(func, repeticoes=5):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({
+        "DATA": pd.date_range("1900-01-01", periods=args.linhas, freq="D"),
+        "REAL": rng.integers(5000, 9000, size=args.linhas).astype(float),
+        "PREVISAO": rng.normal(7000, 500, size=args.linhas)
+    })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path_csv = os.path.join(tmp, "previsao.csv")
+        path_pq = os.path.join(tmp, "previsao.parquet")
+
+        salvar_tabela(df, path_csv)
+        salvar_tabela(df, path_pq)
+
+        resultados = {
+            "CSV completo": cronometrar(lambda: carregar_previsao(path_csv)),
+            "Parquet completo": cronometrar(lambda: carregar_previsao(path_pq)),
+            "CSV (DATA, PREVISAO)": cronometrar(
+                lambda: carregar_previsao(path_csv, colunas=["PREVISAO"])
+            ),
+            "Parquet (DATA, PREVISAO)": cronometrar(
+                lambda: carregar_previsao(path_pq, colunas=["PREVISAO"])
+            )
+        }
+
+        print(f"Linhas: {args.linhas:,}")
+        print(f"Tamanho CSV:     {os.path.getsize(path_csv) / 1024 ** 2:.1f} MB")
+        print(f"Tamanho Parquet: {os.path.getsize(path_pq) / 1024 ** 2:.1f} MB")
+
+        for nome, tempo in resultados.items():
+            print(f"{nome:<26} {tempo * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: ingestão dos arquivos do DATASUS — .dbc lido direto vs.
+o fluxo antigo (converter para CSV e ler o CSV).
+
+Uso:
+    python -m benchmarks.bench_dbc --ufs 4 --registros 50000 --workers 2
+
+Gera um DOxx2019.dbc sintético por UF (colunas e códigos do SIM,
+comprimidos com `gravar_dbc`) e mede:
+- descompressão (MB/s de DBF descomprimido)
+- leitura + decodificação de cada arquivo (.dbc direto vs. CSV)
+- agregação da série mensal de todos os arquivos (1 vs. N workers)
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.dbc import explodir, gravar_dbc, ler_dbc
+from src.ingestion import COLUNAS_BASE, ler_sim_em_blocos, agregar_arquivos_sim
+
+
+def sim_sintetico(n: int, uf: str = "35", ano: int = 2019, seed: int = 0) -> pd.DataFrame:
+    """
+    Registros do SIM sintéticos (todas as COLUNAS_BASE, como texto).
+    """
+
+    rng = np.random.default_rng(seed)
+    cids = np.array(["I219", "I10X", "E149", "J189", "C349", "I64X", "R99X"])
+
+    linha = lambda: np.where(  # noqa: E731
+        rng.random(n) < 0.4, "", "*" + rng.choice(cids, n)
+    )
+
+    df = pd.DataFrame({
+        "TIPOBITO": "2",
+        "IDADE": np.char.add("4", rng.integers(10, 99, n).astype(str)),
+        "SEXO": rng.choice(["1", "2"], n),
+        "LINHAA": linha(),
+        "LINHAB": linha(),
+        "LINHAC": linha(),
+        "LINHAD": linha(),
+        "LINHAII": linha(),
+        "CAUSABAS": rng.choice(cids, n),
+        "CAUSABAS_O": rng.choice(cids, n),
+        "RACACOR": rng.choice(["1", "2", "3", "4", "5", ""], n),
+        "ESC": rng.choice(["1", "2", "3", "4", "5", "9", ""], n),
+        "ATESTADO": linha(),
+        "DTOBITO": [
+            f"{d:02d}{m:02d}{ano}"
+            for d, m in zip(rng.integers(1, 29, n), rng.integers(1, 13, n))
+        ],
+        "CODMUNRES": np.char.add(uf, rng.integers(0, 9999, n).astype(str)),
+        "CODMUNOCOR": np.char.add(uf, rng.integers(0, 9999, n).astype(str)),
+    })
+
+    return df[COLUNAS_BASE]
+
+
+def _tempo(funcao, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcao(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+
+def _ler(path):
+    return pd.concat(list(ler_sim_em_blocos(path)), ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ufs", type=int, default=4)
+    parser.add_argument("--registros", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    ufs = ["35", "33", "31", "41", "43", "29", "26", "23"][:args.ufs]
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        paths_dbc, paths_csv = [], []
+
+        for i, uf in enumerate(ufs):
+            df = sim_sintetico(args.registros, uf, seed=i)
+            path = os.path.join(diretorio, f"DO{uf}2019.dbc")
+            gravar_dbc(df, path)
+            paths_dbc.append(path)
+
+            # Fluxo antigo: DBC convertido para CSV por ferramenta externa
+            df.to_csv(path.replace(".dbc", ".csv"), index=False)
+            paths_csv.append(path.replace(".dbc", ".csv"))
+
+        tamanho_dbc = sum(os.path.getsize(p) for p in paths_dbc) / 2**20
+        tamanho_csv = sum(os.path.getsize(p) for p in paths_csv) / 2**20
+
+        print(f"Arquivos: {len(ufs)} UFs × {args.registros:,} registros | "
+              f".dbc {tamanho_dbc:.1f}MB | .csv {tamanho_csv:.1f}MB")
+
+        # Descompressão pura
+        with open(paths_dbc[0], "rb") as f:
+            dados = f.read()
+        inicio_dbf = int.from_bytes(dados[8:10], "little") + 4
+        bruto, segundos = _tempo(lambda: b"".join(explodir(dados, inicio_dbf)))
+        print(f"explodir: {len(bruto) / 2**20:.1f}MB em {segundos:.2f}s "
+              f"({len(bruto) / 2**20 / segundos:.1f} MB/s)")
+
+        # Leitura + decodificação por arquivo
+        _, s_dbc = _tempo(lambda: [_ler(p) for p in paths_dbc])
+        _, s_csv = _tempo(lambda: [_ler(p) for p in paths_csv])
+        _, s_bruto = _tempo(lambda: [ler_dbc(p) for p in paths_dbc])
+        print(f"{'leitura':<22} {'.dbc':>8} {'.csv':>8}")
+        print(f"{'ler_sim_em_blocos':<22} {s_dbc:7.2f}s {s_csv:7.2f}s")
+        print(f"{'ler_dbc (sem decodif.)':<22} {s_bruto:7.2f}s {'-':>8}")
+
+        # Todos os arquivos: série mensal, 1 vs. N workers
+        serie_1, s_1 = _tempo(agregar_arquivos_sim, paths_dbc, n_workers=1)
+        serie_n, s_n = _tempo(agregar_arquivos_sim, paths_dbc, n_workers=args.workers)
+        assert serie_1.equals(serie_n)
+        print(f"agregar_arquivos_sim: 1 worker {s_1:.2f}s | "
+              f"{args.workers} workers {s_n:.2f}s (CPUs: {os.cpu_count()})")
+
+
+if __name__ == "__main__":
+    main()
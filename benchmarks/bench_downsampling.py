@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: pontos enviados ao Plotly na comparação multimodelo —
+todos os pontos vs. traços reduzidos (LTTB e mín/máx).
+
+Uso:
+    python -m benchmarks.bench_downsampling --ufs 27 --modelos 6 --anos 10
+
+Série diária sintética (tendência + sazonalidade anual e semanal +
+ruído) para cada UF × modelo. O payload é o JSON das colunas x/y de
+todos os traços, como o Plotly serializa para o navegador; o tempo
+de redução é o custo no servidor na primeira vez (depois o traço
+vem do cache do dashboard).
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.downsampling import reduzir_serie, METODOS
+
+
+def _series(n_ufs, n_modelos, anos, rng):
+    datas = pd.date_range("2010-01-01", periods=int(365.25 * anos), freq="D")
+    t = np.arange(len(datas))
+
+    return datas, {
+        (uf, modelo): pd.DataFrame({
+            "DATA": datas,
+            "PREVISAO": (
+                200 + 0.01 * t
+                + 30 * np.sin(2 * np.pi * t / 365.25)
+                + 10 * np.sin(2 * np.pi * t / 7)
+                + rng.normal(0, 8, len(t))
+            )
+        })
+        for uf in range(n_ufs)
+        for modelo in range(n_modelos)
+    }
+
+
+def _payload_kb(tracos):
+    return sum(
+        len(json.dumps({
+            "x": df["DATA"].dt.strftime("%Y-%m-%d").tolist(),
+            "y": df["PREVISAO"].round(2).tolist()
+        }))
+        for df in tracos
+    ) / 1024
+
+
+def _amplitude_mantida(df, reduzido):
+    """
+    Amplitude (máx - mín) dos pontos mantidos / amplitude da série:
+    1 = picos e vales preservados.
+    """
+
+    return np.ptp(reduzido["PREVISAO"]) / np.ptp(df["PREVISAO"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ufs", type=int, default=27)
+    parser.add_argument("--modelos", type=int, default=6)
+    parser.add_argument("--anos", type=int, default=10)
+    parser.add_argument("--pontos", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    datas, series = _series(args.ufs, args.modelos, args.anos, rng)
+
+    tracos = list(series.values())
+    n_total = sum(len(df) for df in tracos)
+
+    print(f"Traços: {len(tracos)} ({args.ufs} UFs × {args.modelos} modelos) "
+          f"| {len(datas)} dias cada | pontos por traço: {args.pontos}")
+    print(f"{'':<10} {'pontos':>10} {'payload':>11} {'redução':>10} {'amplitude':>10}")
+    print(f"{'completo':<10} {n_total:>10,} {_payload_kb(tracos):9.0f}KB {'-':>10} {'-':>10}")
+
+    for metodo in METODOS:
+        inicio = time.perf_counter()
+        reduzidos = [reduzir_serie(df, "PREVISAO", args.pontos, metodo=metodo) for df in tracos]
+        segundos = time.perf_counter() - inicio
+
+        amplitude = np.mean([_amplitude_mantida(df, r) for df, r in zip(tracos, reduzidos)])
+
+        print(
+            f"{metodo:<10} {sum(len(r) for r in reduzidos):>10,} "
+            f"{_payload_kb(reduzidos):9.0f}KB {segundos * 1000:8.0f}ms {amplitude:9.1%}"
+        )
+
+    # Zoom: só o último ano, mesma resolução
+    inicio_zoom = datas[-1] - pd.DateOffset(years=1)
+    inicio = time.perf_counter()
+    zoom = [reduzir_serie(df, "PREVISAO", args.pontos, inicio=inicio_zoom) for df in tracos]
+    segundos = time.perf_counter() - inicio
+
+    print(f"{'zoom 1 ano':<10} {sum(len(r) for r in zoom):>10,} "
+          f"{_payload_kb(zoom):9.0f}KB {segundos * 1000:8.0f}ms {'-':>10}")
+
+
+if __name__ == "__main__":
+    main()
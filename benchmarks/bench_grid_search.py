@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: busca de ordens SARIMA — grade completa serial vs.
+busca paralela com poda (src.grid_search).
+
+Uso:
+    python -m benchmarks.bench_grid_search --workers 8
+
+Grade padrão: 3×2×3 × 2×1×2 = 72 candidatos. Com AIC/BIC, d é fixado
+pelo teste ADF e a referência serial usa a mesma metade da grade.
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from src.data_loader import carregar_serie
+from src.grid_search import buscar_ordem_sarima, gerar_candidatos, escolher_diferenciacao
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--serie", default="Data/processed/serie_temporal_mensal.csv")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--criterio", default="aic")
+    parser.add_argument("--sem-serial", action="store_true")
+    args = parser.parse_args()
+
+    serie = carregar_serie(args.serie)
+    train = serie[:int(len(serie) * 0.8)]
+
+    candidatos = gerar_candidatos()
+
+    if args.criterio != "holdout":
+        d = escolher_diferenciacao(train)
+        candidatos = [c for c in candidatos if c[0][1] == d]
+
+    coluna = {"aic": "AIC", "bic": "BIC", "holdout": "MSE_holdout"}[args.criterio]
+
+    inicio = time.perf_counter()
+    melhor, tabela = buscar_ordem_sarima(
+        train, criterio=args.criterio, n_workers=args.workers
+    )
+    t_busca = time.perf_counter() - inicio
+
+    print(f"Candidatos: {len(candidatos)} | sobreviventes: {(~tabela['podado']).sum()}")
+    print(f"Busca paralela com poda ({args.workers} workers): {t_busca:.1f}s → {melhor}")
+    print(tabela.head(5).to_string())
+
+    if not args.sem_serial and args.criterio != "holdout":
+        # Referência: um ajuste completo por vez, como em modelo_sarima
+        inicio = time.perf_counter()
+        serial = []
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for order, seasonal_order in candidatos:
+                try:
+                    fit = SARIMAX(
+                        train,
+                        order=order,
+                        seasonal_order=seasonal_order,
+                        enforce_stationarity=False,
+                        enforce_invertibility=False
+                    ).fit(disp=False)
+                    serial.append((getattr(fit, coluna.lower()), order, seasonal_order))
+                except (ValueError, np.linalg.LinAlgError):
+                    pass
+        t_serial = time.perf_counter() - inicio
+
+        melhor_serial = min(serial)
+        print(f"Grade completa serial: {t_serial:.1f}s → {melhor_serial[1:]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: tempo e memória (pico de RSS) de inicialização do pacote,
+cada caso em um processo Python novo.
+
+Uso:
+    python -m benchmarks.bench_import --repeticoes 3
+
+O caso "carregamento antigo" reproduz o que `import src` fazia antes
+do carregamento preguiçoso: todos os submódulos com TensorFlow,
+statsmodels e sklearn.
+"""
+
+import argparse
+import subprocess
+import sys
+
+CASOS = {
+    "import src": "import src",
+    "src.carregar_serie + calcular_mape": (
+        "import src; src.carregar_serie; src.calcular_mape"
+    ),
+    "src.modelo_sarima (statsmodels)": (
+        "import src, statsmodels.tsa.statespace.sarimax; src.modelo_sarima"
+    ),
+    "carregamento antigo (tudo)": (
+        "import src; [getattr(src, n) for n in src.__all__]; "
+        "import tensorflow.keras, statsmodels.tsa.api, sklearn.metrics"
+    ),
+}
+
+MEDIDOR = (
+    "import time, resource; inicio = time.perf_counter(); {codigo}; "
+    "print(time.perf_counter() - inicio, "
+    "resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)"
+)
+
+
+def _medir(codigo):
+    saida = subprocess.run(
+        [sys.executable, "-c", MEDIDOR.format(codigo=codigo)],
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.split()
+
+    # ru_maxrss em KB no Linux
+    return float(saida[-2]), int(saida[-1]) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeticoes", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'Caso':<36} {'tempo (s)':>10} {'RSS (MB)':>10}")
+
+    for nome, codigo in CASOS.items():
+        medidas = [_medir(codigo) for _ in range(args.repeticoes)]
+        tempo = min(m[0] for m in medidas)
+        rss = min(m[1] for m in medidas)
+
+        print(f"{nome:<36} {tempo:10.3f} {rss:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: latência de uma janela (1 série, SEQ_LENGTH meses) —
+`model.predict` + `scaler.inverse_transform` vs. `inferir_rapido`
+(tf.function com assinatura fixa, XLA quando suportado).
+
+Uso:
+    python -m benchmarks.bench_inferencia --repeticoes 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.preprocessing import MinMaxScaler
+
+from main import CONFIGURACOES_LSTM, SEQ_LENGTH
+from src.forecasting import construir_lstm, inferir_rapido
+
+
+def _latencias(funcao, repeticoes):
+    tempos = np.empty(repeticoes)
+
+    for i in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos[i] = time.perf_counter() - inicio
+
+    return np.percentile(tempos, [50, 99]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeticoes", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    scaler = MinMaxScaler().fit(rng.random((100, 1)) * 10_000)
+    janela = rng.random((1, SEQ_LENGTH, 1)).astype(np.float32)
+
+    print(f"{'Configuração':<16} {'predict p50/p99 (ms)':>22} {'rápido p50/p99 (ms)':>22}")
+
+    for nome, config in CONFIGURACOES_LSTM.items():
+        model = construir_lstm(
+            input_shape=(SEQ_LENGTH, 1),
+            unidades_lstm=config["unidades_lstm"],
+            unidades_dense=config["unidades_dense"],
+            optimizer=config["optimizer"],
+            weight_decay=config.get("weight_decay", 0.0)
+        )
+
+        def predict():
+            return scaler.inverse_transform(model.predict(janela, verbose=0))
+
+        def rapido():
+            return inferir_rapido(model, janela, scaler)
+
+        # Aquecimento (compilação) e conferência
+        assert np.allclose(predict(), rapido(), rtol=1e-4)
+
+        p_predict = _latencias(predict, max(1, args.repeticoes // 10))
+        p_rapido = _latencias(rapido, args.repeticoes)
+
+        print(
+            f"{nome:<16} {p_predict[0]:10.2f} / {p_predict[1]:8.2f} "
+            f"{p_rapido[0]:12.3f} / {p_rapido[1]:7.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
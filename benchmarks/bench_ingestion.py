@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: decodificadores vetorizados (src.ingestion) vs.
+funções linha a linha do notebook de tratamento.
+
+Uso:
+    python -m benchmarks.bench_ingestion --linhas 10000000
+
+As funções do notebook levam horas em 10M linhas; por isso são
+medidas em uma amostra (--amostra) e extrapoladas linearmente.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.ingestion import (
+    decodificar_idade,
+    decodificar_dtobito,
+    mapear_uf,
+    UFS
+)
+
+
+# =====================================================
+# REFERÊNCIA: FUNÇÕES DO NOTEBOOK
+# =====================================================
+
+def transformar_idade(codigo):
+    if pd.isna(codigo):
+        return np.nan
+
+    codigo = str(int(codigo)).zfill(3)
+    unidade = int(codigo[0])
+    quantidade = int(codigo[1:])
+
+    if unidade == 0:
+        return quantidade / (60 * 24 * 365)
+    elif unidade == 1:
+        return quantidade / (24 * 365)
+    elif unidade == 2:
+        return quantidade / 365
+    elif unidade == 3:
+        return quantidade / 12
+    elif unidade == 4:
+        return quantidade
+    elif unidade == 5:
+        return 100 + quantidade
+    else:
+        return np.nan
+
+
+def separar_data(data):
+    data = str(data).zfill(8)
+    return pd.Series({
+        'DIA_OBITO': data[:2],
+        'MES_OBITO': data[2:4],
+        'ANO_OBITO': data[4:]
+    })
+
+
+def notebook(df):
+    idade = df['IDADE'].apply(transformar_idade)
+    datas = df['DTOBITO'].apply(separar_data)
+    estado = df['CODMUNOCOR'].astype(str).str[:2].map(UFS)
+    return idade, datas, estado
+
+
+def vetorizado(df):
+    idade = decodificar_idade(df['IDADE'])
+    datas = decodificar_dtobito(df['DTOBITO'])
+    estado = mapear_uf(df['CODMUNOCOR'])
+    return idade, datas, estado
+
+
+# =====================================================
+# DADOS SINTÉTICOS
+# =====================================================
+
+def gerar_registros(n, seed=42):
+    rng = np.random.default_rng(seed)
+
+    unidade = rng.choice([2, 3, 4, 4, 4, 4, 5], size=n)
+    idade = unidade * 100 + rng.integers(0, 100, size=n)
+
+    dia = rng.integers(1, 29, size=n)
+    mes = rng.integers(1, 13, size=n)
+    ano = rng.integers(2010, 2022, size=n)
+    dtobito = dia * 1_000_000 + mes * 10_000 + ano
+
+    ufs = np.array([int(codigo) for codigo in UFS])
+    codmun = rng.choice(ufs, size=n) * 10_000 + rng.integers(0, 10_000, size=n)
+
+    return pd.DataFrame({
+        'IDADE': idade,
+        'DTOBITO': dtobito,
+        'CODMUNOCOR': codmun
+    })
+
+
+def cronometrar(func, df):
+    inicio = time.perf_counter()
+    resultado = func(df)
+    return time.perf_counter() - inicio, resultado
+
+
+# =====================================================
+# EXECUÇÃO
+# =====================================================
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=10_000_000)
+    parser.add_argument("--amostra", type=int, default=200_000)
+    args = parser.parse_args()
+
+    df = gerar_registros(args.linhas)
+    amostra = df.iloc[:min(args.amostra, args.linhas)]
+
+    t_nb, (idade_nb, datas_nb, estado_nb) = cronometrar(notebook, amostra)
+    t_vec_amostra, (idade_vec, datas_vec, estado_vec) = cronometrar(vetorizado, amostra)
+
+    # Conferência de equivalência na amostra
+    np.testing.assert_allclose(idade_vec, idade_nb.to_numpy(dtype=float))
+    datas_ref = pd.to_datetime(
+        datas_nb['ANO_OBITO'] + datas_nb['MES_OBITO'] + datas_nb['DIA_OBITO'],
+        format='%Y%m%d'
+    ).to_numpy()
+    assert (datas_vec == datas_ref.astype('datetime64[D]')).all()
+    assert (np.asarray(estado_vec, dtype=object) == estado_nb.to_numpy()).all()
+
+    t_vec, _ = cronometrar(vetorizado, df)
+
+    t_nb_total = t_nb * len(df) / len(amostra)
+
+    print(f"Linhas: {len(df):,}")
+    print(f"Notebook (amostra {len(amostra):,}): {t_nb:.2f}s")
+    print(f"Notebook (extrapolado):        {t_nb_total:.1f}s")
+    print(f"Vetorizado:                    {t_vec:.2f}s")
+    print(f"Speedup:                       {t_nb_total / t_vec:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: `avaliar_modelo` chamado por série (5 chamadas sklearn
+cada) vs. `calcular_metricas_lote` (uma passada sobre séries × tempo).
+
+Uso:
+    python -m benchmarks.bench_metricas --series 5570 --meses 24
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.metrics import avaliar_modelo, calcular_metricas_lote
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--series", type=int, default=5570)
+    parser.add_argument("--meses", type=int, default=24)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    y_true = rng.poisson(20, (args.series, args.meses)).astype(np.float64)
+    y_pred = y_true + rng.normal(0, 3, y_true.shape)
+
+    inicio = time.perf_counter()
+    ref = [avaliar_modelo(real, previsto) for real, previsto in zip(y_true, y_pred)]
+    t_loop = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    lote = calcular_metricas_lote(y_true, y_pred)
+    t_lote = time.perf_counter() - inicio
+
+    for coluna in ("MSE", "RMSE", "MAE", "MAPE (%)", "R2"):
+        assert np.allclose([r[coluna] for r in ref], lote[coluna], equal_nan=True)
+
+    print(f"Séries: {args.series} | Meses: {args.meses}")
+    print(f"avaliar_modelo por série: {t_loop:8.3f}s")
+    print(f"calcular_metricas_lote:   {t_lote:8.4f}s ({t_loop / t_lote:.0f}x, inclui sMAPE)")
+
+
+if __name__ == "__main__":
+    main()
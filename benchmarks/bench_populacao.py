@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: população por UF e ano nas taxas por 100 mil habitantes —
+merge por nome do estado (notebook) vs. lookup por índice inteiro.
+
+Uso:
+    python -m benchmarks.bench_populacao --registros 1000000
+
+Tabela de população sintética (27 UFs × 2010-2021, no formato da
+planilha do IBGE). Mede a junção com os registros individuais
+(como no notebook) e com o painel mensal por UF, e o carregamento
+do cache .npz (o `read_excel` não é medido: ele só roda na conversão).
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.ingestion import UFS
+from src.population import TabelaPopulacao, carregar_populacao, taxa_por_100k
+
+
+def _planilha(rng):
+    """
+    DataFrame como o lido da planilha ('11 Rondônia', Total, ano).
+    """
+
+    return pd.DataFrame([
+        {"Unidade da Federação": f"{codigo} {nome}", "Total": int(rng.integers(4e5, 4e7)), "ano": ano}
+        for ano in range(2010, 2022)
+        for codigo, nome in UFS.items()
+    ])
+
+
+def _notebook(registros, planilha):
+    """
+    Abordagem do notebook: separa código e nome e faz merge por
+    (ano, nome do estado).
+    """
+
+    populacao = planilha.copy()
+    populacao[["Codigo_Estado", "Estado"]] = (
+        populacao["Unidade da Federação"].str.split(" ", n=1, expand=True)
+    )
+
+    combinados = pd.merge(
+        registros,
+        populacao,
+        left_on=["ANO_OBITO", "Estado"],
+        right_on=["ano", "Estado"],
+        how="inner"
+    )
+
+    return combinados["Total"].to_numpy()
+
+
+def _tempo(funcao, *args, repeticoes=3):
+    melhor = float("inf")
+
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao(*args)
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    return resultado, melhor
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--registros", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    planilha = _planilha(rng)
+
+    codigos = np.array([int(codigo) for codigo in UFS])
+    tabela = TabelaPopulacao(
+        planilha["Unidade da Federação"].str[:2].astype(int),
+        planilha["ano"],
+        {"TOTAL": planilha["Total"].to_numpy()}
+    )
+
+    # Registros individuais (como o dataset do notebook)
+    uf = rng.choice(codigos, args.registros)
+    ano = rng.integers(2010, 2022, args.registros)
+    registros = pd.DataFrame({
+        "ANO_OBITO": ano,
+        "Estado": pd.Series(uf.astype(str)).map(UFS).astype("category"),
+        "CODIGO_UF": uf
+    })
+
+    por_nome, s_nome = _tempo(_notebook, registros, planilha)
+    por_indice, s_indice = _tempo(tabela.populacao, uf, ano)
+
+    # O merge reordena as linhas: compara os totais
+    assert por_nome.sum() == por_indice.sum()
+
+    print(f"Registros: {args.registros:,} | tabela: {len(planilha)} linhas (UF × ano)")
+    print(f"{'junção':<26} {'merge por nome':>15} {'índice inteiro':>15}")
+    print(f"{'registros individuais':<26} {s_nome * 1000:13.1f}ms {s_indice * 1000:13.1f}ms")
+
+    # Painel mensal por UF (CHAVE, DATA, OBITOS)
+    datas = pd.date_range("2010-01-01", "2021-12-01", freq="MS")
+    painel = pd.DataFrame({
+        "CHAVE": np.repeat(codigos, len(datas)),
+        "DATA": np.tile(datas, len(codigos)),
+        "OBITOS": rng.integers(0, 900, len(codigos) * len(datas))
+    })
+    painel_nomes = painel.assign(
+        ANO_OBITO=painel["DATA"].dt.year,
+        Estado=painel["CHAVE"].astype(str).map(UFS)
+    )
+
+    _, s_nome = _tempo(_notebook, painel_nomes, planilha)
+    _, s_indice = _tempo(taxa_por_100k, painel, tabela)
+    print(f"{'painel mensal por UF':<26} {s_nome * 1000:13.1f}ms {s_indice * 1000:13.1f}ms")
+
+    # Cache .npz lido a cada execução
+    with tempfile.TemporaryDirectory() as diretorio:
+        path = os.path.join(diretorio, "populacao_uf.npz")
+        np.savez(
+            path,
+            CODIGO_UF=planilha["Unidade da Federação"].str[:2].astype(np.int16).to_numpy(),
+            ANO=planilha["ano"].astype(np.int16).to_numpy(),
+            TOTAL=planilha["Total"].to_numpy(np.int64)
+        )
+
+        _, segundos = _tempo(carregar_populacao, path, os.path.join(diretorio, "ausente.xlsx"))
+        print(f"carregar_populacao (.npz, {os.path.getsize(path) / 1024:.1f}KB): {segundos * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
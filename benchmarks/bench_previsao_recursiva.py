@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: previsão recursiva multi-passo das LSTMs — laço Python com
+`model.predict` por amostra vs. `prever_recursivo` (todas as séries e
+configurações em uma chamada por passo).
+
+Uso:
+    python -m benchmarks.bench_previsao_recursiva --series 27
+
+Previsões/s = séries × configurações / tempo (cada previsão cobre
+o horizonte inteiro). As redes não são treinadas: só a inferência
+é medida.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from main import CONFIGURACOES_LSTM, SEQ_LENGTH
+from src.forecasting import construir_lstm, prever_recursivo
+
+
+# =====================================================
+# REFERÊNCIA: UMA CHAMADA predict POR SÉRIE E PASSO
+# =====================================================
+
+def prever_recursivo_loop(model, janelas, horizonte):
+    previsoes = np.empty((len(janelas), horizonte))
+
+    for s, janela in enumerate(janelas):
+        janela = janela.copy()
+
+        for h in range(horizonte):
+            proximo = model.predict(janela[None, ...], verbose=0)[0, 0]
+            previsoes[s, h] = proximo
+            janela = np.concatenate([janela[1:], [[proximo]]])
+
+    return previsoes
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--series", type=int, default=27)
+    parser.add_argument("--horizontes", type=int, nargs="+", default=[12, 24])
+    args = parser.parse_args()
+
+    modelos = {
+        nome: construir_lstm(
+            input_shape=(SEQ_LENGTH, 1),
+            unidades_lstm=config["unidades_lstm"],
+            unidades_dense=config["unidades_dense"],
+            optimizer=config["optimizer"],
+            weight_decay=config.get("weight_decay", 0.0)
+        )
+        for nome, config in CONFIGURACOES_LSTM.items()
+    }
+
+    rng = np.random.default_rng(42)
+    janelas = {
+        nome: rng.random((args.series, SEQ_LENGTH, 1)).astype(np.float32)
+        for nome in modelos
+    }
+
+    n_previsoes = args.series * len(modelos)
+
+    # Aquecimento (compilação do laço recursivo)
+    prever_recursivo(modelos, janelas, 1)
+
+    print(f"Séries: {args.series} | configurações: {len(modelos)}")
+
+    for horizonte in args.horizontes:
+
+        inicio = time.perf_counter()
+        ref = {
+            nome: prever_recursivo_loop(model, janelas[nome], horizonte)
+            for nome, model in modelos.items()
+        }
+        t_loop = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        lote = prever_recursivo(modelos, janelas, horizonte)
+        t_lote = time.perf_counter() - inicio
+
+        for nome in modelos:
+            assert np.allclose(ref[nome], lote[nome], atol=1e-4)
+
+        print(
+            f"H={horizonte:<3} laço predict: {n_previsoes / t_loop:8.1f} prev/s | "
+            f"lote: {n_previsoes / t_lote:8.1f} prev/s | "
+            f"ganho {t_loop / t_lote:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
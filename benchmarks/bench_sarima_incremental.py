@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: atualização mensal do SARIMA — reajuste do zero vs.
+modo incremental (filtro com parâmetros anteriores / MLE com warm start).
+
+Uso:
+    python -m benchmarks.bench_sarima_incremental --meses 12
+
+Simula a chegada de um mês novo por vez sobre a série nacional e
+confere que as previsões incrementais ficam próximas do reajuste
+completo (tolerância relativa em --tolerancia).
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+
+from src.data_loader import carregar_serie
+from src.forecasting import modelo_sarima
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--serie", default="Data/processed/serie_temporal_mensal.csv")
+    parser.add_argument("--meses", type=int, default=12)
+    parser.add_argument("--horizonte", type=int, default=12)
+    parser.add_argument("--tolerancia", type=float, default=0.05)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+
+    serie = carregar_serie(args.serie)
+    inicio_origem = len(serie) - args.meses - args.horizonte
+
+    _, ajuste_filtro = modelo_sarima(
+        serie[:inicio_origem], serie[inicio_origem:inicio_origem + args.horizonte],
+        retornar_ajuste=True
+    )
+    ajuste_mle = ajuste_filtro
+
+    tempos = {"reajuste": [], "filtrar": [], "reajustar": []}
+    desvios = {"filtrar": [], "reajustar": []}
+
+    for origem in range(inicio_origem + 1, inicio_origem + args.meses + 1):
+        train = serie[:origem]
+        test = serie[origem:origem + args.horizonte]
+
+        t = time.perf_counter()
+        frio = modelo_sarima(train, test)
+        tempos["reajuste"].append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        filtro, ajuste_filtro = modelo_sarima(
+            train, test, ajuste_anterior=ajuste_filtro,
+            modo_incremental="filtrar", retornar_ajuste=True
+        )
+        tempos["filtrar"].append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        mle, ajuste_mle = modelo_sarima(
+            train, test, ajuste_anterior=ajuste_mle,
+            modo_incremental="reajustar", retornar_ajuste=True
+        )
+        tempos["reajustar"].append(time.perf_counter() - t)
+
+        desvios["filtrar"].append(np.max(np.abs(filtro - frio) / np.abs(frio)))
+        desvios["reajustar"].append(np.max(np.abs(mle - frio) / np.abs(frio)))
+
+    for modo, lista in tempos.items():
+        print(f"{modo:<10} mediana {np.median(lista) * 1000:8.1f} ms")
+
+    for modo, lista in desvios.items():
+        print(f"{modo:<10} desvio relativo máximo vs. reajuste: {max(lista):.4f}")
+        assert max(lista) < args.tolerancia, modo
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: criar_sequencias (sliding_window_view) vs. laço Python
+original, em séries diárias de vários municípios.
+
+Uso:
+    python -m benchmarks.bench_sequencias --series 500 --dias 3650 --seq 30
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.preprocessing import criar_sequencias
+
+
+# =====================================================
+# REFERÊNCIA: VERSÃO ORIGINAL (LAÇO PYTHON)
+# =====================================================
+
+def criar_sequencias_loop(data, seq_length):
+    X, y = [], []
+
+    for i in range(len(data) - seq_length):
+        X.append(data[i:i + seq_length])
+        y.append(data[i + seq_length])
+
+    return np.array(X), np.array(y)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--series", type=int, default=500)
+    parser.add_argument("--dias", type=int, default=3650)
+    parser.add_argument("--seq", type=int, default=30)
+    args = parser.parse_args()
+
+    painel = np.random.default_rng(42).random((args.series, args.dias, 1))
+
+    inicio = time.perf_counter()
+    ref = [criar_sequencias_loop(serie, args.seq) for serie in painel]
+    t_loop = time.perf_counter() - inicio
+    bytes_loop = sum(X.nbytes + y.nbytes for X, y in ref)
+
+    inicio = time.perf_counter()
+    X, y = criar_sequencias(painel, args.seq)
+    t_view = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    X_c, y_c = criar_sequencias(painel, args.seq, copiar=True)
+    t_copia = time.perf_counter() - inicio
+
+    assert (X[0] == ref[0][0]).all() and (y[-1] == ref[-1][1]).all()
+
+    print(f"Séries: {args.series} | Dias: {args.dias} | Janela: {args.seq}")
+    print(f"Laço Python:        {t_loop:8.3f}s | {bytes_loop / 1024 ** 2:8.0f} MB")
+    print(f"Visão (sem cópia):  {t_view:8.5f}s | {0:8.0f} MB")
+    print(f"Visão + cópia:      {t_copia:8.3f}s | {(X_c.nbytes + y_c.nbytes) / 1024 ** 2:8.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: memória de pico da ingestão em blocos (agregar_serie_mensal)
+vs. leitura integral com pd.read_csv, para arquivos de tamanhos diferentes.
+
+Uso:
+    python -m benchmarks.bench_streaming --linhas 500000 2000000
+
+A memória de pico da versão em blocos deve ficar constante
+com o tamanho do arquivo.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.ingestion import agregar_serie_mensal, COLUNAS_BASE, UFS
+
+
+# =====================================================
+# DADOS SINTÉTICOS
+# =====================================================
+
+def gerar_csv(path, n, seed=42, bloco=500_000):
+    rng = np.random.default_rng(seed)
+    ufs = np.array([int(codigo) for codigo in UFS])
+    municipios = rng.choice(ufs, size=5570) * 10_000 + rng.integers(0, 10_000, size=5570)
+    cids = np.array(["*I219", "*I219*I10X", "*E149*I219", "*I64X", "*I500"])
+
+    for inicio in range(0, n, bloco):
+        m = min(bloco, n - inicio)
+
+        codmun = rng.choice(municipios, size=m)
+        dtobito = (
+            rng.integers(1, 29, size=m) * 1_000_000
+            + rng.integers(1, 13, size=m) * 10_000
+            + rng.integers(2010, 2022, size=m)
+        )
+
+        df = pd.DataFrame({
+            'TIPOBITO': 2,
+            'IDADE': rng.integers(400, 499, size=m),
+            'SEXO': rng.integers(1, 3, size=m),
+            'LINHAA': rng.choice(cids, size=m),
+            'LINHAB': rng.choice(cids, size=m),
+            'LINHAC': "",
+            'LINHAD': "",
+            'LINHAII': rng.choice(cids, size=m),
+            'CAUSABAS': "I219",
+            'CAUSABAS_O': "I219",
+            'RACACOR': rng.integers(1, 6, size=m),
+            'ESC': rng.integers(1, 6, size=m),
+            'ATESTADO': "",
+            'DTOBITO': np.char.zfill(dtobito.astype(str), 8),
+            'CODMUNRES': codmun,
+            'CODMUNOCOR': codmun,
+            'OUTRA_COLUNA': rng.random(m)
+        })
+
+        df.to_csv(path, mode="a", header=(inicio == 0), index=False)
+
+
+def medir(func):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    func()
+    tempo = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tempo, pico / 1024 ** 2
+
+
+def leitura_integral(path):
+    dataset = pd.read_csv(path, low_memory=False)
+    dataset_filtrado = dataset[COLUNAS_BASE].copy()
+    datas = pd.to_datetime(
+        dataset_filtrado['DTOBITO'].astype(str).str.zfill(8), format='%d%m%Y'
+    )
+    return datas.dt.to_period('M').value_counts()
+
+
+# =====================================================
+# EXECUÇÃO
+# =====================================================
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, nargs="+", default=[500_000, 2_000_000])
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.linhas:
+            path = os.path.join(tmp, f"sim_{n}.csv")
+            gerar_csv(path, n)
+            tamanho = os.path.getsize(path) / 1024 ** 2
+
+            t_int, m_int = medir(lambda: leitura_integral(path))
+            t_blc, m_blc = medir(
+                lambda: agregar_serie_mensal(path, chunksize=args.chunksize)
+            )
+
+            print(f"Linhas: {n:,} ({tamanho:.0f} MB)")
+            print(f"  Leitura integral: {t_int:.2f}s | pico {m_int:.0f} MB")
+            print(f"  Em blocos:        {t_blc:.2f}s | pico {m_blc:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: treino das LSTMs com arrays NumPy (validação a cada época)
+vs. pipeline tf.data (cache + prefetch, validação a cada N épocas),
+para cada entrada de CONFIGURACOES_LSTM.
+
+Uso:
+    python -m benchmarks.bench_tf_data --epochs 20 --validacao-a-cada 5
+
+Passos/s = épocas × batches por época / tempo de treino.
+"""
+
+import argparse
+import math
+import time
+
+from main import CONFIGURACOES_LSTM, SEQ_LENGTH
+from src.data_loader import carregar_serie
+from src.preprocessing import preparar_dados_lstm
+from src.forecasting import construir_lstm, treinar_lstm, criar_dataset_lstm
+from src.parallel import fixar_seeds
+
+
+def _modelo(config):
+    return construir_lstm(
+        input_shape=(SEQ_LENGTH, 1),
+        unidades_lstm=config["unidades_lstm"],
+        unidades_dense=config["unidades_dense"],
+        optimizer=config["optimizer"],
+        weight_decay=config.get("weight_decay", 0.0)
+    )
+
+
+def _passos_por_segundo(model, dados, epochs, batch_size, validacao_a_cada, n_passos):
+    # Primeira época à parte: compilação do grafo não entra na medida
+    treinar_lstm(model, *dados, epochs=1, batch_size=batch_size,
+                 validacao_a_cada=validacao_a_cada)
+
+    inicio = time.perf_counter()
+    history = treinar_lstm(model, *dados, epochs=epochs, batch_size=batch_size,
+                           validacao_a_cada=validacao_a_cada)
+    segundos = time.perf_counter() - inicio
+
+    return epochs * n_passos / segundos, history.history["loss"][-1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--serie", default="Data/processed/serie_temporal_mensal.csv")
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--validacao-a-cada", type=int, default=5)
+    args = parser.parse_args()
+
+    serie = carregar_serie(args.serie)
+    scaler, X_train, X_test, y_train, y_test = preparar_dados_lstm(serie, SEQ_LENGTH)
+    serie_escalada = scaler.transform(serie.values.reshape(-1, 1))
+
+    print(f"Janelas de treino: {len(X_train)} | épocas medidas: {args.epochs}")
+    print(f"{'Configuração':<16} {'NumPy':>10} {'tf.data':>10} {'ganho':>7}")
+
+    for nome, config in CONFIGURACOES_LSTM.items():
+        batch_size = config["batch_size"]
+        n_passos = math.ceil(len(X_train) / batch_size)
+
+        fixar_seeds(42)
+        antes, _ = _passos_por_segundo(
+            _modelo(config),
+            (X_train, y_train, X_test, y_test),
+            args.epochs, batch_size, 1, n_passos
+        )
+
+        fixar_seeds(42)
+        ds_treino, ds_validacao = criar_dataset_lstm(
+            serie_escalada, SEQ_LENGTH, batch_size=batch_size
+        )
+        depois, _ = _passos_por_segundo(
+            _modelo(config),
+            (ds_treino, None, ds_validacao, None),
+            args.epochs, batch_size, args.validacao_a_cada, n_passos
+        )
+
+        print(f"{nome:<16} {antes:8.1f}/s {depois:8.1f}/s {depois / antes:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,34 +4,68 @@ Main pipeline do projeto de previsão de séries temporais.
 """
 
 import os
+import time
+import argparse
 import pandas as pd
 import numpy as np
-import tensorflow as tf
 import random
 
 # ✅ FIXAR SEEDS PARA REPRODUTIBILIDADE
+# (a do TensorFlow é fixada por fixar_seeds nos caminhos das LSTMs:
+# os workers do pool reimportam este módulo e os que só ajustam
+# SARIMA/Holt-Winters não devem carregar o TensorFlow)
 SEED = 42
 
 random.seed(SEED)
 np.random.seed(SEED)
-tf.random.set_seed(SEED)
 
 # Configuração adicional para garantir determinismo
+# (lida pelo TensorFlow quando ele for importado)
 os.environ['PYTHONHASHSEED'] = str(SEED)
 os.environ['TF_DETERMINISTIC_OPS'] = '1'
 os.environ['TF_CUDNN_DETERMINISTIC'] = '1'
 
 from src import (
     carregar_serie,
+    salvar_tabela,
+    validar_serie,
+    tratar_nulos,
+    criar_sequencias,
+    split_temporal,
     preparar_dados_lstm,
     modelo_sarima,
     modelo_holt_winters,
     construir_lstm,
     treinar_lstm,
+    criar_dataset_lstm,
     prever_lstm,
+    prever_futuro_lstm,
     gerar_df_metricas,
     consolidar_metricas,
-    salvar_metricas
+    salvar_metricas,
+    atualizar_estados_metricas,
+    metricas_dos_estados,
+    carregar_previsao,
+    fixar_seeds,
+    executar_tarefas,
+    CacheAjustes,
+    buscar_ordem_sarima,
+    impressao_digital_serie,
+    salvar_modelo,
+    listar_modelos_registrados,
+    carregar_modelo,
+    backtest,
+    Pipeline,
+    salvar_repositorio_previsoes,
+    RepositorioPrevisoes,
+    carregar_populacao,
+    taxa_por_100k,
+    carregar_painel,
+    salvar_previsoes_painel,
+    pivotar_painel,
+    prever_painel_classico,
+    treinar_lstm_painel,
+    prever_futuro_painel
 )
 
 
@@ -43,39 +77,113 @@ DATA_PATH = "Data/processed/serie_temporal_mensal.csv"
 OUTPUT_DIR = "Data/processed"
 SEQ_LENGTH = 12
 
+# Formato dos arquivos de saída: "csv" ou "parquet"
+FORMATO_SAIDA = "csv"
+EXTENSAO_SAIDA = ".parquet" if FORMATO_SAIDA == "parquet" else ".csv"
+
+# Treino das LSTMs via tf.data (janelas sob demanda, cache e prefetch)
+# e validação só a cada N épocas
+USAR_TF_DATA = False
+VALIDACAO_A_CADA = 1
+
+# Early stopping (épocas sem melhora no val_loss; None = desligado)
+# e checkpoints por configuração para retomar treinos interrompidos
+PACIENCIA_LSTM = 20
+CHECKPOINT_DIR = f"{OUTPUT_DIR}/checkpoints_lstm"
+
+# Registro dos modelos LSTM treinados (inferência sem retreino)
+REGISTRO_DIR = f"{OUTPUT_DIR}/modelos"
+
+# Repositório consolidado das previsões (lido pelo dashboard via memory-map)
+REPOSITORIO_DIR = f"{OUTPUT_DIR}/repositorio_previsoes"
+
+# Meses previstos além do fim da série (previsão recursiva das LSTMs)
+HORIZONTE_FUTURO = 12
+
+# População por UF e ano (taxas por 100 mil habitantes: python main.py --taxa).
+# A planilha é convertida uma vez para o .npz; as saídas do pipeline de
+# taxas ficam em TAXA_DIR, com a mesma estrutura das de contagens
+PLANILHA_POPULACAO = "Data/raw/População_Estadual_2010-2021.xlsx"
+POPULACAO_PATH = f"{OUTPUT_DIR}/populacao_uf.npz"
+TAXA_DIR = f"{OUTPUT_DIR}/taxa_100k"
+
+# Backtesting com origem móvel (python main.py --backtest)
+N_ORIGENS_BACKTEST = 6
+HORIZONTE_BACKTEST = 12
+JANELA_BACKTEST = "expansiva"
+
+# Estados dos acumuladores de métricas (atualização incremental mensal)
+ESTADOS_METRICAS = f"{OUTPUT_DIR}/estados_metricas{EXTENSAO_SAIDA}"
+
+# Estado do pipeline incremental (impressões digitais e resultados das etapas)
+PIPELINE_DIR = f"{OUTPUT_DIR}/pipeline"
+
+# Busca automática da ordem do SARIMA (senão usa (1,1,1)(1,1,1,12))
+BUSCAR_ORDEM_SARIMA = False
+CRITERIO_ORDEM_SARIMA = "aic"
+
+# Cache em disco dos ajustes SARIMA / Holt-Winters
+CACHE_DIR = f"{OUTPUT_DIR}/cache_ajustes"
+MAX_ENTRADAS_CACHE = 20_000
+
+# Painel (várias séries): dataset de previsões particionado por modelo
+PAINEL_DIR = f"{OUTPUT_DIR}/previsoes_painel"
+FUTURO_PAINEL_DIR = f"{OUTPUT_DIR}/futuro_painel"
+BATCH_SIZE_PAINEL = 256
+
+# Processos em paralelo (1 = execução sequencial no processo atual)
+N_WORKERS = int(os.environ.get("N_WORKERS", os.cpu_count() or 1))
+
+CONFIGURACOES_LSTM = {
+    "LSTM_E1_Adam": {
+        "unidades_lstm": [128, 128, 64],
+        "unidades_dense": [32, 16],
+        "optimizer": "adam",
+        "epochs": 120,
+        "batch_size": 16
+    },
+    "LSTM_E2_AdamW": {
+        "unidades_lstm": [128, 128, 64],
+        "unidades_dense": [32, 16],
+        "optimizer": "adamw",
+        "weight_decay": 0.004,
+        "epochs": 120,
+        "batch_size": 16
+    },
+    "LSTM_E3_Adam": {
+        "unidades_lstm": [64, 32],
+        "unidades_dense": [16],
+        "optimizer": "adam",
+        "epochs": 60,
+        "batch_size": 32
+    },
+    "LSTM_E4_AdamW": {
+        "unidades_lstm": [64, 32],
+        "unidades_dense": [16],
+        "optimizer": "adamw",
+        "weight_decay": 0.005,
+        "epochs": 60,
+        "batch_size": 32
+    }
+}
+
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 
 # =====================================================
-# FUNÇÃO PRINCIPAL
+# TAREFAS POR MODELO (executadas nos workers)
 # =====================================================
 
-def main():
+def executar_sarima(train, test, cache=None,
+                    order=(1, 1, 1), seasonal_order=(1, 1, 1, 12)):
     
-    print("📊 Iniciando pipeline de previsão...\n")
-    
-    # ✅ VALIDAÇÃO DE ARQUIVO
-    if not os.path.exists(DATA_PATH):
-        raise FileNotFoundError(
-            f"❌ Arquivo não encontrado: {DATA_PATH}\n"
-            f"Execute primeiro os notebooks de tratamento!"
-        )
-    
-    # 1️⃣ CARREGAR SÉRIE
-    serie = carregar_serie(DATA_PATH)
-    
-    train_size = int(len(serie) * 0.8)
-    train = serie[:train_size]
-    test = serie[train_size:]
-    
-    lista_metricas = []
-    
-    # =====================================================
-    # 2️⃣ MODELOS CLÁSSICOS
-    # =====================================================
-    
-    print("🔹 Executando SARIMA...")
-    forecast_sarima = modelo_sarima(train, test)
+    forecast_sarima = modelo_sarima(
+        train,
+        test,
+        order=order,
+        seasonal_order=seasonal_order,
+        cache=cache
+    )
     
     df_sarima = pd.DataFrame({
         "DATA": test.index,
@@ -83,15 +191,12 @@ def main():
         "PREVISAO": forecast_sarima.values
     })
     
-    df_sarima.to_csv(f"{OUTPUT_DIR}/previsao_sarima.csv", index=False)
-    
-    lista_metricas.append(
-        gerar_df_metricas("SARIMA", test.values, forecast_sarima.values)
-    )
-    
+    return df_sarima, gerar_df_metricas("SARIMA", test.values, forecast_sarima.values)
+
+
+def executar_holt_winters(train, test, cache=None):
     
-    print("🔹 Executando Holt-Winters...")
-    forecast_hw = modelo_holt_winters(train, test)
+    forecast_hw = modelo_holt_winters(train, test, cache=cache)
     
     df_hw = pd.DataFrame({
         "DATA": test.index,
@@ -99,127 +204,657 @@ def main():
         "PREVISAO": forecast_hw.values
     })
     
-    df_hw.to_csv(f"{OUTPUT_DIR}/previsao_holt_winters.csv", index=False)
+    return df_hw, gerar_df_metricas("Holt-Winters", test.values, forecast_hw.values)
+
+
+def executar_lstm(nome_modelo, config, serie,
+                  registro_dir=REGISTRO_DIR, checkpoint_dir=CHECKPOINT_DIR,
+                  seq_length=SEQ_LENGTH, usar_tf_data=USAR_TF_DATA,
+                  validacao_a_cada=VALIDACAO_A_CADA, paciencia=PACIENCIA_LSTM):
     
-    lista_metricas.append(
-        gerar_df_metricas("Holt-Winters", test.values, forecast_hw.values)
+    # ✅ RESETAR SEED ANTES DE CADA MODELO
+    fixar_seeds(SEED, tensorflow=True)
+    
+    scaler, X_train, X_test, y_train, y_test = preparar_dados_lstm(
+        serie,
+        seq_length=seq_length
     )
     
+    model = construir_lstm(
+        input_shape=(seq_length, 1),
+        unidades_lstm=config["unidades_lstm"],
+        unidades_dense=config["unidades_dense"],
+        optimizer=config["optimizer"],
+        weight_decay=config.get("weight_decay", 0.0)
+    )
     
-    # =====================================================
-    # 3️⃣ PREPARAR DADOS LSTM
-    # =====================================================
+    if usar_tf_data:
+        # Mesma validação, interpolação e escala de preparar_dados_lstm
+        serie_tratada = tratar_nulos(validar_serie(serie))
+        ds_treino, ds_validacao = criar_dataset_lstm(
+            scaler.transform(serie_tratada.values.reshape(-1, 1)),
+            seq_length=seq_length,
+            batch_size=config["batch_size"],
+            seed=SEED
+        )
+        dados_treino = (ds_treino, None, ds_validacao, None)
+    else:
+        dados_treino = (X_train, y_train, X_test, y_test)
     
-    print("🔹 Preparando dados para LSTM...")
-    scaler, X_train, X_test, y_train, y_test = preparar_dados_lstm(
+    inicio = time.perf_counter()
+    
+    history = treinar_lstm(
+        model,
+        *dados_treino,
+        epochs=config["epochs"],
+        batch_size=config["batch_size"],
+        verbose=0,
+        validacao_a_cada=validacao_a_cada,
+        paciencia=paciencia,
+        dir_checkpoint=f"{checkpoint_dir}/{nome_modelo}"
+    )
+    
+    segundos = time.perf_counter() - inicio
+    
+    # history.epoch começa na época retomada do checkpoint
+    epocas_executadas = len(history.epoch)
+    ultima_epoca = history.epoch[-1] + 1 if history.epoch else 0
+    
+    resumo_treino = {
+        "MODELO": nome_modelo,
+        "EPOCAS_CONFIG": config["epochs"],
+        "EPOCAS_EXECUTADAS": epocas_executadas,
+        "RETOMADO_DA_EPOCA": ultima_epoca - epocas_executadas,
+        "TEMPO_S": segundos,
+        "TEMPO_ECONOMIZADO_S": (
+            (config["epochs"] - ultima_epoca) * segundos / max(epocas_executadas, 1)
+        )
+    }
+    
+    salvar_modelo(
+        nome_modelo,
+        model,
+        scaler,
+        seq_length,
+        config,
         serie,
-        seq_length=SEQ_LENGTH
+        diretorio=registro_dir
     )
     
+    df_lstm = prever_lstm(
+        model,
+        X_test,
+        scaler,
+        y_test,
+        serie.index,
+        seq_length=seq_length
+    )
     
-    # =====================================================
-    # 4️⃣ MODELOS LSTM
-    # =====================================================
+    return df_lstm, gerar_df_metricas(
+        nome_modelo,
+        df_lstm["REAL"].values,
+        df_lstm["PREVISAO"].values
+    ), resumo_treino
+
+
+def executar_lstm_painel(nome_modelo, config, largo):
     
-    configuracoes_lstm = {
-        "LSTM_E1_Adam": {
-            "unidades_lstm": [128, 128, 64],
-            "unidades_dense": [32, 16],
-            "optimizer": "adam",
-            "epochs": 120,
-            "batch_size": 16
-        },
-        "LSTM_E2_AdamW": {
-            "unidades_lstm": [128, 128, 64],
-            "unidades_dense": [32, 16],
-            "optimizer": "adamw",
-            "weight_decay": 0.004,
-            "epochs": 120,
-            "batch_size": 16
-        },
-        "LSTM_E3_Adam": {
-            "unidades_lstm": [64, 32],
-            "unidades_dense": [16],
-            "optimizer": "adam",
-            "epochs": 60,
-            "batch_size": 32
-        },
-        "LSTM_E4_AdamW": {
-            "unidades_lstm": [64, 32],
-            "unidades_dense": [16],
-            "optimizer": "adamw",
-            "weight_decay": 0.005,
-            "epochs": 60,
-            "batch_size": 32
-        }
+    # ✅ RESETAR SEED ANTES DE CADA MODELO
+    fixar_seeds(SEED, tensorflow=True)
+    
+    inicio = time.perf_counter()
+    
+    df_lstm, model = treinar_lstm_painel(
+        largo,
+        nome_modelo,
+        config,
+        seq_length=SEQ_LENGTH,
+        batch_size=BATCH_SIZE_PAINEL,
+        retornar_modelo=True
+    )
+    
+    segundos = time.perf_counter() - inicio
+    
+    df_futuro = prever_futuro_painel(
+        model,
+        largo,
+        nome_modelo,
+        seq_length=SEQ_LENGTH,
+        horizonte=HORIZONTE_FUTURO
+    )
+    
+    return df_lstm, segundos, df_futuro
+
+
+def gerar_futuro_lstm(serie, registro_dir=REGISTRO_DIR, diretorio=OUTPUT_DIR,
+                      horizonte=HORIZONTE_FUTURO):
+    """
+    Previsão dos próximos `horizonte` meses com todas as
+    LSTMs do registro (uma chamada em lote por passo).
+    """
+    
+    registros = {
+        nome: carregar_modelo(nome, diretorio=registro_dir)
+        for nome in listar_modelos_registrados(registro_dir)
     }
     
+    df_futuro = prever_futuro_lstm(registros, serie, horizonte=horizonte)
     
-    for nome_modelo, config in configuracoes_lstm.items():
-        
-        print(f"🔹 Treinando {nome_modelo}...")
+    salvar_tabela(df_futuro, f"{diretorio}/futuro_lstm{EXTENSAO_SAIDA}")
+    
+    return df_futuro
+
+
+# =====================================================
+# ALVO: CONTAGENS OU TAXA POR 100 MIL HABITANTES
+# =====================================================
+
+def diretorios_saida(taxa=False):
+    """
+    (saída, pipeline, registro, checkpoints, repositório, estados das
+    métricas) das contagens ou, com `taxa`, da taxa por 100 mil
+    habitantes (tudo sob TAXA_DIR). Usado por todos os modos do main.
+    """
+    
+    if not taxa:
+        return (
+            OUTPUT_DIR, PIPELINE_DIR, REGISTRO_DIR, CHECKPOINT_DIR,
+            REPOSITORIO_DIR, ESTADOS_METRICAS
+        )
+    
+    return (
+        TAXA_DIR,
+        f"{TAXA_DIR}/pipeline",
+        f"{TAXA_DIR}/modelos",
+        f"{TAXA_DIR}/checkpoints_lstm",
+        f"{TAXA_DIR}/repositorio_previsoes",
+        f"{TAXA_DIR}/estados_metricas{EXTENSAO_SAIDA}"
+    )
+
+
+def preparar_populacao():
+    
+    # Converte a planilha de população só na primeira vez
+    os.makedirs(TAXA_DIR, exist_ok=True)
+    carregar_populacao(POPULACAO_PATH, planilha=PLANILHA_POPULACAO)
+    print(f"🔹 Alvo: taxa por 100 mil habitantes ({POPULACAO_PATH})")
+
+
+# =====================================================
+# ETAPAS DO PIPELINE (DAG INCREMENTAL)
+# =====================================================
+
+def etapa_carregar(path, populacao=None):
+    """
+    Série de óbitos; com `populacao` (cache .npz), a taxa mensal
+    por 100 mil habitantes.
+    """
+    
+    serie = carregar_serie(path)
+    
+    if populacao is not None:
+        serie = taxa_por_100k(serie, carregar_populacao(populacao))
+    
+    return serie
+
+
+def etapa_dividir(serie, proporcao_treino=0.8):
+    
+    train_size = int(len(serie) * proporcao_treino)
+    
+    return serie, serie[:train_size], serie[train_size:]
+
+
+def etapa_ordem_sarima(dados, criterio="aic"):
+    
+    _, train, _ = dados
+    
+    print("🔹 Buscando ordem do SARIMA...")
+    (order, seasonal_order), _ = buscar_ordem_sarima(
+        train,
+        criterio=criterio,
+        n_workers=N_WORKERS
+    )
+    print(f"   Melhor ordem: {order}{seasonal_order}")
+    
+    return order, seasonal_order
+
+
+def etapa_sarima(dados, ordem=None, order=(1, 1, 1), seasonal_order=(1, 1, 1, 12),
+                 cache_dir=CACHE_DIR):
+    
+    _, train, test = dados
+    order, seasonal_order = ordem or (tuple(order), tuple(seasonal_order))
+    cache = CacheAjustes(cache_dir, max_entradas=MAX_ENTRADAS_CACHE)
+    
+    return executar_sarima(train, test, cache, order, seasonal_order)
+
+
+def etapa_holt_winters(dados, cache_dir=CACHE_DIR):
+    
+    _, train, test = dados
+    cache = CacheAjustes(cache_dir, max_entradas=MAX_ENTRADAS_CACHE)
+    
+    return executar_holt_winters(train, test, cache)
+
+
+def etapa_lstm(dados, nome_modelo, config, registro_dir=REGISTRO_DIR,
+               checkpoint_dir=CHECKPOINT_DIR, seq_length=SEQ_LENGTH,
+               usar_tf_data=USAR_TF_DATA, validacao_a_cada=VALIDACAO_A_CADA,
+               paciencia=PACIENCIA_LSTM):
+    
+    serie, _, _ = dados
+    
+    return executar_lstm(
+        nome_modelo, config, serie, registro_dir, checkpoint_dir,
+        seq_length=seq_length,
+        usar_tf_data=usar_tf_data,
+        validacao_a_cada=validacao_a_cada,
+        paciencia=paciencia
+    )
+
+
+def etapa_avaliar(resultado, path):
+    
+    # LSTMs retornam também o resumo do treino (épocas e tempo)
+    df_previsao, df_metricas_modelo, *resumo = resultado
+    
+    salvar_tabela(df_previsao, path)
+    
+    return (
+        df_metricas_modelo,
+        df_previsao.assign(MODELO=df_metricas_modelo["Modelo"].iloc[0]),
+        resumo
+    )
+
+
+def etapa_consolidar(dados, *avaliacoes, path_metricas, path_estados, path_treino,
+                     dir_repositorio):
+    
+    serie, _, _ = dados
+    
+    print("📈 Consolidando métricas...")
+    
+    df_metricas = consolidar_metricas([metricas for metricas, _, _ in avaliacoes])
+    salvar_metricas(df_metricas, path=path_metricas)
+    
+    df_previsoes = pd.concat([previsao for _, previsao, _ in avaliacoes], ignore_index=True)
+    
+    # Estados para as próximas atualizações incrementais (--atualizar-metricas)
+    salvar_tabela(atualizar_estados_metricas(None, df_previsoes), path_estados)
+    
+    # Todas as previsões + série histórica em um único arquivo para o dashboard
+    salvar_repositorio_previsoes(df_previsoes, dir_repositorio, serie=serie)
+    
+    df_treino = pd.DataFrame([r for _, _, resumo in avaliacoes for r in resumo])
+    salvar_tabela(df_treino, path_treino)
+    
+    return df_metricas, df_treino
+
+
+def etapa_futuro_lstm(dados, *ajustes_lstm, horizonte=HORIZONTE_FUTURO,
+                      registro_dir=REGISTRO_DIR, diretorio=OUTPUT_DIR):
+    
+    serie, _, _ = dados
+    
+    print(f"🔹 Prevendo {horizonte} meses à frente com as LSTMs...")
+    
+    return gerar_futuro_lstm(serie, registro_dir, diretorio, horizonte=horizonte)
+
+
+def montar_pipeline(taxa=False):
+    """
+    DAG: carregar → dividir → ajustar_<modelo> → avaliar_<modelo>
+    → consolidar (+ futuro_lstm a partir das LSTMs ajustadas).
+    
+    Com `taxa`, a série é a taxa por 100 mil habitantes e todas as
+    saídas (inclusive registro e checkpoints das LSTMs) vão para TAXA_DIR.
+    """
+    
+    saida, pipeline_dir, registro_dir, checkpoint_dir, repositorio_dir, path_estados = (
+        diretorios_saida(taxa)
+    )
+    
+    if taxa:
+        populacao, arquivos = POPULACAO_PATH, [DATA_PATH, POPULACAO_PATH]
+    else:
+        populacao, arquivos = None, [DATA_PATH]
+    
+    pipeline = Pipeline(pipeline_dir)
+    
+    pipeline.adicionar("carregar", etapa_carregar,
+                       parametros={"path": DATA_PATH, "populacao": populacao},
+                       arquivos=arquivos, paralela=False)
+    pipeline.adicionar("dividir", etapa_dividir, ["carregar"],
+                       parametros={"proporcao_treino": 0.8}, paralela=False)
+    
+    ajustes = {}
+    
+    if BUSCAR_ORDEM_SARIMA:
+        pipeline.adicionar("ordem_sarima", etapa_ordem_sarima, ["dividir"],
+                           parametros={"criterio": CRITERIO_ORDEM_SARIMA}, paralela=False)
+        ajustes["sarima"] = (etapa_sarima, ["dividir", "ordem_sarima"], {}, [executar_sarima])
+    else:
+        ajustes["sarima"] = (etapa_sarima, ["dividir"], {}, [executar_sarima])
+    
+    ajustes["holt_winters"] = (etapa_holt_winters, ["dividir"], {}, [executar_holt_winters])
+    
+    for nome_modelo, config in CONFIGURACOES_LSTM.items():
+        ajustes[nome_modelo.lower()] = (
+            etapa_lstm,
+            ["dividir"],
+            {
+                "nome_modelo": nome_modelo,
+                "config": config,
+                "seq_length": SEQ_LENGTH,
+                "usar_tf_data": USAR_TF_DATA,
+                "validacao_a_cada": VALIDACAO_A_CADA,
+                "paciencia": PACIENCIA_LSTM,
+                "registro_dir": registro_dir,
+                "checkpoint_dir": checkpoint_dir
+            },
+            [executar_lstm]
+        )
+    
+    for nome, (funcao, dependencias, parametros, codigo) in ajustes.items():
+        pipeline.adicionar(f"ajustar_{nome}", funcao, dependencias,
+                           parametros=parametros, codigo=codigo)
+        pipeline.adicionar(f"avaliar_{nome}", etapa_avaliar, [f"ajustar_{nome}"],
+                           parametros={"path": f"{saida}/previsao_{nome}{EXTENSAO_SAIDA}"},
+                           paralela=False)
+    
+    pipeline.adicionar(
+        "consolidar",
+        etapa_consolidar,
+        ["dividir"] + [f"avaliar_{nome}" for nome in ajustes],
+        parametros={
+            "path_metricas": f"{saida}/metricas_modelos{EXTENSAO_SAIDA}",
+            "path_estados": path_estados,
+            "path_treino": f"{saida}/treino_lstm{EXTENSAO_SAIDA}",
+            "dir_repositorio": repositorio_dir
+        },
+        paralela=False
+    )
+    
+    pipeline.adicionar(
+        "futuro_lstm",
+        etapa_futuro_lstm,
+        ["dividir"] + [f"ajustar_{nome.lower()}" for nome in CONFIGURACOES_LSTM],
+        parametros={"horizonte": HORIZONTE_FUTURO, "registro_dir": registro_dir, "diretorio": saida},
+        codigo=[gerar_futuro_lstm],
+        paralela=False
+    )
+    
+    return pipeline
+
+
+# =====================================================
+# FUNÇÃO PRINCIPAL
+# =====================================================
+
+def main(n_workers=N_WORKERS, dry_run=False, taxa=False):
+    
+    print("📊 Iniciando pipeline de previsão...\n")
+    
+    # ✅ VALIDAÇÃO DE ARQUIVO
+    if not os.path.exists(DATA_PATH):
+        raise FileNotFoundError(
+            f"❌ Arquivo não encontrado: {DATA_PATH}\n"
+            f"Execute primeiro os notebooks de tratamento!"
+        )
+    
+    # O cache da população entra na impressão digital da etapa carregar
+    if taxa:
+        preparar_populacao()
+    
+    pipeline = montar_pipeline(taxa)
+    
+    # Só as etapas cuja impressão digital mudou são executadas;
+    # as independentes (ajustes dos modelos) rodam em paralelo
+    print(f"🔹 Etapas do pipeline (até {n_workers} processos):")
+    plano = pipeline.executar(n_workers=n_workers, dry_run=dry_run, seed=SEED)
+    
+    if dry_run:
+        print(f"\n🔎 Simulação: {sum(1 for m in plano.values() if m)} etapas seriam executadas")
+        return
+    
+    df_metricas, df_treino = pipeline.resultado("consolidar")
+    
+    print("\n✅ Pipeline finalizado com sucesso!")
+    print(f"📂 Arquivos salvos em {diretorios_saida(taxa)[0]}/")
+    
+    print("\n⏱️ Treino das LSTMs:")
+    print(df_treino.to_string(index=False))
+    print(f"   Tempo economizado: {df_treino['TEMPO_ECONOMIZADO_S'].sum():.0f}s")
+    print("\n🏆 Ranking dos Modelos:")
+    print(df_metricas)
+
+
+# =====================================================
+# MODO SOMENTE INFERÊNCIA (MODELOS DO REGISTRO)
+# =====================================================
+
+def main_inferencia(taxa=False):
+    
+    print("📊 Gerando previsões com os modelos registrados...\n")
+    
+    saida, _, registro_dir, _, repositorio_dir, _ = diretorios_saida(taxa)
+    nomes = listar_modelos_registrados(registro_dir)
+    
+    if not nomes:
+        raise FileNotFoundError(
+            f"❌ Nenhum modelo em {registro_dir}\n"
+            f"Execute primeiro o pipeline completo (main.py{' --taxa' if taxa else ''})!"
+        )
+    
+    if taxa:
+        preparar_populacao()
+    
+    serie = etapa_carregar(DATA_PATH, POPULACAO_PATH if taxa else None)
+    impressao_digital = impressao_digital_serie(serie)
+    
+    lista_metricas = []
+    lista_previsoes = []
+    
+    for nome_modelo in nomes:
         
-        # ✅ RESETAR SEED ANTES DE CADA MODELO
-        tf.random.set_seed(SEED)
-        np.random.seed(SEED)
+        registro = carregar_modelo(nome_modelo, diretorio=registro_dir)
         
-        model = construir_lstm(
-            input_shape=(SEQ_LENGTH, 1),
-            unidades_lstm=config["unidades_lstm"],
-            unidades_dense=config["unidades_dense"],
-            optimizer=config["optimizer"],
-            weight_decay=config.get("weight_decay", 0.0)
-        )
+        if registro["impressao_digital"] != impressao_digital:
+            print(f"⚠️ {nome_modelo}: série mudou desde o treino ({registro['fim_serie']})")
         
-        treinar_lstm(
-            model,
-            X_train,
-            y_train,
-            X_test,
-            y_test,
-            epochs=config["epochs"],
-            batch_size=config["batch_size"],
-            verbose=0
-        )
+        # Mesmo scaler do treino (não reajusta na série atual)
+        seq_length = registro["seq_length"]
+        serie_escalada = registro["scaler"].transform(serie.values.reshape(-1, 1))
+        X, y = criar_sequencias(serie_escalada, seq_length)
+        _, X_test, _, y_test = split_temporal(X, y)
         
         df_lstm = prever_lstm(
-            model,
+            registro["model"],
             X_test,
-            scaler,
+            registro["scaler"],
             y_test,
             serie.index,
-            seq_length=SEQ_LENGTH
+            seq_length=seq_length,
+            rapido=True
         )
         
-        df_lstm.to_csv(
-            f"{OUTPUT_DIR}/previsao_{nome_modelo.lower()}.csv",
-            index=False  # ✅ IMPORTANTE: não salvar índice
+        salvar_tabela(
+            df_lstm,
+            f"{saida}/previsao_{nome_modelo.lower()}{EXTENSAO_SAIDA}"
         )
         
-        lista_metricas.append(
-            gerar_df_metricas(
-                nome_modelo,
-                df_lstm["REAL"].values,
-                df_lstm["PREVISAO"].values
-            )
+        lista_metricas.append(gerar_df_metricas(
+            nome_modelo,
+            df_lstm["REAL"].values,
+            df_lstm["PREVISAO"].values
+        ))
+        lista_previsoes.append(df_lstm.assign(MODELO=nome_modelo))
+    
+    # Repositório do dashboard: substitui só as LSTMs reprevistas
+    df_previsoes = pd.concat(lista_previsoes, ignore_index=True)
+    
+    if os.path.exists(repositorio_dir):
+        anteriores = RepositorioPrevisoes(repositorio_dir).para_dataframe()
+        df_previsoes = pd.concat(
+            [anteriores[~anteriores["MODELO"].isin(nomes)], df_previsoes],
+            ignore_index=True
         )
     
+    salvar_repositorio_previsoes(df_previsoes, repositorio_dir, serie=serie)
     
-    # =====================================================
-    # 5️⃣ CONSOLIDAR MÉTRICAS
-    # =====================================================
+    gerar_futuro_lstm(serie, registro_dir, saida)
     
-    print("📈 Consolidando métricas...")
+    print("\n✅ Previsões geradas sem retreino!")
+    print("\n🏆 Modelos registrados:")
+    print(consolidar_metricas(lista_metricas))
+
+
+# =====================================================
+# ATUALIZAÇÃO INCREMENTAL DAS MÉTRICAS
+# =====================================================
+
+def main_atualizar_metricas(path_novos, taxa=False):
+    
+    print("📊 Atualizando métricas com os meses novos...\n")
+    
+    saida, *_, path_estados = diretorios_saida(taxa)
+    
+    if not os.path.exists(path_estados):
+        raise FileNotFoundError(
+            f"❌ Estados não encontrados: {path_estados}\n"
+            f"Execute primeiro o pipeline completo (main.py{' --taxa' if taxa else ''})!"
+        )
+    
+    # Pontos novos: MODELO, DATA, REAL, PREVISAO
+    novos = carregar_previsao(path_novos)
+    
+    if "MODELO" not in novos.columns:
+        raise ValueError("O arquivo de pontos novos deve conter a coluna 'MODELO'.")
+    
+    if path_estados.endswith(".parquet"):
+        estados = pd.read_parquet(path_estados)
+    else:
+        estados = pd.read_csv(path_estados)
+    
+    # Só os pontos novos são percorridos; meses já acumulados são ignorados
+    n_anterior = estados["n"].sum()
+    estados = atualizar_estados_metricas(estados, novos)
+    salvar_tabela(estados, path_estados)
+    
+    df_metricas = metricas_dos_estados(estados)
+    
+    salvar_metricas(
+        df_metricas,
+        path=f"{saida}/metricas_modelos{EXTENSAO_SAIDA}"
+    )
+    
+    print(f"✅ {int(estados['n'].sum() - n_anterior)} de {len(novos)} pontos incorporados")
+    print("\n🏆 Ranking dos Modelos:")
+    print(df_metricas)
+
+
+# =====================================================
+# MODO BACKTEST (ORIGEM MÓVEL)
+# =====================================================
+
+def main_backtest(n_workers=N_WORKERS, taxa=False):
+    
+    print("📊 Iniciando backtest com origem móvel...\n")
+    
+    saida = diretorios_saida(taxa)[0]
+    
+    if taxa:
+        preparar_populacao()
+    
+    serie = etapa_carregar(DATA_PATH, POPULACAO_PATH if taxa else None)
+    cache = CacheAjustes(CACHE_DIR, max_entradas=MAX_ENTRADAS_CACHE)
+    
+    df_previsoes, metricas_origem, metricas_horizonte = backtest(
+        serie,
+        configuracoes_lstm=CONFIGURACOES_LSTM,
+        n_origens=N_ORIGENS_BACKTEST,
+        horizonte=HORIZONTE_BACKTEST,
+        janela=JANELA_BACKTEST,
+        seq_length=SEQ_LENGTH,
+        n_workers=n_workers,
+        cache=cache,
+        seed=SEED
+    )
+    
+    salvar_tabela(df_previsoes, f"{saida}/backtest_previsoes{EXTENSAO_SAIDA}")
+    salvar_tabela(metricas_origem, f"{saida}/backtest_metricas_origem{EXTENSAO_SAIDA}")
+    salvar_tabela(metricas_horizonte, f"{saida}/backtest_metricas_horizonte{EXTENSAO_SAIDA}")
+    
+    print("\n✅ Backtest finalizado!")
+    print(f"🔹 Origens: {', '.join(str(o.date()) for o in df_previsoes['ORIGEM'].unique())}")
+    print("\n🏆 MSE médio por modelo (todas as origens):")
+    print(metricas_origem.groupby("MODELO")["MSE"].mean().sort_values())
+
+
+# =====================================================
+# MODO PAINEL (UFs / MUNICÍPIOS)
+# =====================================================
+
+def main_painel(path_painel, n_workers=N_WORKERS):
+    
+    print("📊 Iniciando pipeline de previsão em painel...\n")
+    
+    # 1️⃣ CARREGAR PAINEL (CHAVE, DATA, VALOR)
+    largo = pivotar_painel(carregar_painel(path_painel))
+    n_series = largo.shape[1]
+    
+    print(f"🔹 {n_series} séries × {len(largo)} meses")
+    
+    # 2️⃣ MODELOS CLÁSSICOS POR SÉRIE
+    print("🔹 Executando SARIMA e Holt-Winters por série...")
+    cache = CacheAjustes(CACHE_DIR, max_entradas=MAX_ENTRADAS_CACHE)
+    df_classico, desempenho = prever_painel_classico(
+        largo,
+        n_workers=n_workers,
+        cache=cache
+    )
+    
+    # 3️⃣ LSTM GLOBAL (UMA REDE POR CONFIGURAÇÃO)
+    print("🔹 Treinando LSTMs globais...")
+    tarefas = {
+        nome_modelo: (executar_lstm_painel, (nome_modelo, config, largo))
+        for nome_modelo, config in CONFIGURACOES_LSTM.items()
+    }
+    
+    resultados = executar_tarefas(tarefas, n_workers=n_workers, seed=SEED)
+    
+    lista_previsoes = [df_classico]
+    
+    lista_futuros = []
+    
+    for nome_modelo, (df_lstm, segundos, df_futuro) in resultados.items():
+        lista_previsoes.append(df_lstm)
+        lista_futuros.append(df_futuro)
+        desempenho[nome_modelo] = n_series / segundos * 60
+    
+    df_previsoes = pd.concat(lista_previsoes, ignore_index=True)
+    salvar_previsoes_painel(df_previsoes, PAINEL_DIR)
+    salvar_previsoes_painel(pd.concat(lista_futuros, ignore_index=True), FUTURO_PAINEL_DIR)
+    
+    # 4️⃣ MÉTRICAS POR MODELO (TODAS AS SÉRIES)
+    lista_metricas = [
+        gerar_df_metricas(modelo, grupo["REAL"].values, grupo["PREVISAO"].values)
+        for modelo, grupo in df_previsoes.dropna().groupby("MODELO", sort=False)
+    ]
     
     df_metricas = consolidar_metricas(lista_metricas)
     
     salvar_metricas(
         df_metricas,
-        path=f"{OUTPUT_DIR}/metricas_modelos.csv"
+        path=f"{OUTPUT_DIR}/metricas_painel{EXTENSAO_SAIDA}"
     )
     
-    print("\n✅ Pipeline finalizado com sucesso!")
-    print("📂 Arquivos salvos em Data/processed/")
+    print("\n✅ Pipeline de painel finalizado com sucesso!")
+    print(f"📂 Previsões salvas em {PAINEL_DIR}/")
+    print("\n⏱️ Vazão (séries por minuto):")
+    for modelo, vazao in desempenho.items():
+        print(f"   {modelo:<15} {vazao:10.1f}")
     print("\n🏆 Ranking dos Modelos:")
     print(df_metricas)
 
@@ -229,4 +864,52 @@ def main():
 # =====================================================
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    
+    parser = argparse.ArgumentParser(description="Pipeline de previsão de óbitos")
+    parser.add_argument(
+        "--painel",
+        help="Painel no formato longo (CHAVE, DATA, valor) em CSV ou Parquet"
+    )
+    parser.add_argument("--workers", type=int, default=N_WORKERS)
+    parser.add_argument(
+        "--somente-inferencia",
+        action="store_true",
+        help="Prevê com os modelos LSTM do registro, sem retreinar"
+    )
+    parser.add_argument(
+        "--backtest",
+        action="store_true",
+        help="Backtest com origem móvel de todos os modelos"
+    )
+    parser.add_argument(
+        "--atualizar-metricas",
+        metavar="ARQUIVO",
+        help="Incorpora pontos novos (MODELO, DATA, REAL, PREVISAO) às métricas"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Mostra quais etapas do pipeline seriam executadas, sem executá-las"
+    )
+    parser.add_argument(
+        "--taxa",
+        action="store_true",
+        help="Prevê a taxa de óbitos por 100 mil habitantes em vez das contagens "
+             "(também com --somente-inferencia, --backtest e --atualizar-metricas)"
+    )
+    args = parser.parse_args()
+    
+    # A população é por UF: o painel pode ser de municípios
+    if args.taxa and args.painel:
+        parser.error("--taxa não se aplica a --painel (use src.taxa_por_100k no painel por UF)")
+    
+    if args.atualizar_metricas:
+        main_atualizar_metricas(args.atualizar_metricas, taxa=args.taxa)
+    elif args.backtest:
+        main_backtest(n_workers=args.workers, taxa=args.taxa)
+    elif args.somente_inferencia:
+        main_inferencia(taxa=args.taxa)
+    elif args.painel:
+        main_painel(args.painel, n_workers=args.workers)
+    else:
+        main(n_workers=args.workers, dry_run=args.dry_run, taxa=args.taxa)
@@ -2,108 +2,280 @@
 Pacote de Modelagem de Séries Temporais
 
 Este módulo centraliza:
+- Ingestão dos registros brutos do SIM (CSV ou .dbc do DATASUS)
+- População por UF e ano e taxas por 100 mil habitantes
 - Carregamento de dados
 - Pré-processamento
 - Modelos de previsão
+- Previsão em painel (várias séries)
+- Registro local dos modelos LSTM treinados
+- Repositório consolidado de previsões (dashboard)
+- Redução de pontos para os gráficos (LTTB, mín/máx)
+- Previsões sob demanda em thread de fundo (dashboard)
+- Backtesting com origem móvel
+- Pipeline incremental (DAG de etapas)
 - Métricas de avaliação
 
 Projeto estruturado para uso acadêmico e produção.
+
+Carregamento preguiçoso: cada submódulo (e o TensorFlow, statsmodels
+e sklearn que ele usa) só é importado no primeiro acesso a um nome
+exportado por ele, ex.: `src.carregar_serie` não carrega o TensorFlow.
 """
 
 __version__ = "1.0.0"
 __author__ = "Vitor Hugo Amadeu da Silva"
 
+import importlib
 
-# ==========================
-# DATA LOADER
-# ==========================
 
-from .data_loader import (
-    carregar_serie,
-    carregar_previsao,
-    carregar_metricas,
-    listar_arquivos_processados
-)
+# Nome exportado → submódulo que o define
+_EXPORTS = {}
 
 
 # ==========================
-# PREPROCESSING
+# INGESTION
 # ==========================
 
-from .preprocessing import (
-    validar_serie,
-    tratar_nulos,
-    normalizar_serie,
-    criar_sequencias,
-    split_temporal,
-    preparar_dados_lstm  # ✅ ADICIONADO
-)
+_EXPORTS.update(dict.fromkeys([
+    "decodificar_idade",
+    "decodificar_dtobito",
+    "extrair_codigo_uf",
+    "mapear_uf",
+    "decodificar_registros",
+    "marcar_cids",
+    "ler_sim_em_blocos",
+    "agregar_serie_mensal",
+    "agregar_painel_mensal",
+    "ler_arquivos_sim",
+    "agregar_arquivos_sim"
+], ".ingestion"))
 
 
 # ==========================
-# FORECASTING
+# DBC (DATASUS)
 # ==========================
 
-from .forecasting import (
-    modelo_sarima,        # ✅ ADICIONADO
-    modelo_holt_winters,
-    construir_lstm,       # ✅ ADICIONADO
-    treinar_lstm,         # ✅ ADICIONADO
-    prever_lstm          # ✅ ADICIONADO
-)
+_EXPORTS.update(dict.fromkeys([
+    "explodir",
+    "implodir",
+    "ler_campos_dbc",
+    "ler_dbc_em_blocos",
+    "ler_dbc",
+    "gravar_dbc"
+], ".dbc"))
 
 
 # ==========================
-# METRICS
+# POPULATION
 # ==========================
 
-from .metrics import (
-    calcular_mse,
-    calcular_rmse,
-    calcular_mae,
-    calcular_mape,
-    calcular_r2,
-    avaliar_modelo,
-    gerar_df_metricas,    # ✅ ADICIONADO
-    consolidar_metricas,  # ✅ ADICIONADO
-    salvar_metricas       # ✅ ADICIONADO
-)
+_EXPORTS.update(dict.fromkeys([
+    "converter_planilha_populacao",
+    "carregar_populacao",
+    "TabelaPopulacao",
+    "taxa_por_100k"
+], ".population"))
 
 
 # ==========================
-# EXPORTS PÚBLICOS
+# DATA LOADER
 # ==========================
 
-__all__ = [
-    # Data Loader
+_EXPORTS.update(dict.fromkeys([
     "carregar_serie",
     "carregar_previsao",
     "carregar_metricas",
-    "listar_arquivos_processados",
-    
-    # Preprocessing
+    "carregar_painel",
+    "salvar_previsoes_painel",
+    "carregar_previsoes_painel",
+    "salvar_tabela",
+    "listar_arquivos_processados"
+], ".data_loader"))
+
+
+# ==========================
+# PREPROCESSING
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
     "validar_serie",
     "tratar_nulos",
     "normalizar_serie",
+    "normalizar_painel",
     "criar_sequencias",
     "split_temporal",
-    "preparar_dados_lstm",
-    
-    # Forecasting
+    "preparar_dados_lstm"
+], ".preprocessing"))
+
+
+# ==========================
+# FORECASTING
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
     "modelo_sarima",
     "modelo_holt_winters",
     "construir_lstm",
     "treinar_lstm",
+    "criar_dataset_lstm",
     "prever_lstm",
-    
-    # Metrics
+    "inferir_rapido",
+    "prever_recursivo",
+    "prever_futuro_lstm"
+], ".forecasting"))
+
+
+# ==========================
+# METRICS
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
     "calcular_mse",
     "calcular_rmse",
     "calcular_mae",
     "calcular_mape",
     "calcular_r2",
     "avaliar_modelo",
+    "calcular_metricas_lote",
+    "AcumuladorMetricas",
+    "atualizar_estados_metricas",
+    "metricas_dos_estados",
     "gerar_df_metricas",
     "consolidar_metricas",
     "salvar_metricas"
-]
+], ".metrics"))
+
+
+# ==========================
+# PARALLEL
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
+    "fixar_seeds",
+    "threads_por_worker",
+    "executar_tarefas"
+], ".parallel"))
+
+
+# ==========================
+# CACHE
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
+    "CacheAjustes"
+], ".cache"))
+
+
+# ==========================
+# REGISTRY
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
+    "impressao_digital_serie",
+    "salvar_modelo",
+    "listar_modelos_registrados",
+    "carregar_metadados",
+    "carregar_modelo",
+    "limpar_cache_modelos"
+], ".registry"))
+
+
+# ==========================
+# FORECAST STORE
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
+    "salvar_repositorio_previsoes",
+    "RepositorioPrevisoes"
+], ".forecast_store"))
+
+
+# ==========================
+# FORECAST SERVICE
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
+    "prever_sob_demanda",
+    "ServicoPrevisao"
+], ".forecast_service"))
+
+
+# ==========================
+# DOWNSAMPLING
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
+    "lttb",
+    "minmax",
+    "reduzir_serie"
+], ".downsampling"))
+
+
+# ==========================
+# BACKTESTING
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
+    "gerar_origens",
+    "backtest"
+], ".backtesting"))
+
+
+# ==========================
+# PIPELINE
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
+    "Etapa",
+    "Pipeline"
+], ".pipeline"))
+
+
+# ==========================
+# GRID SEARCH
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
+    "gerar_candidatos",
+    "escolher_diferenciacao",
+    "buscar_ordem_sarima"
+], ".grid_search"))
+
+
+# ==========================
+# PANEL
+# ==========================
+
+_EXPORTS.update(dict.fromkeys([
+    "pivotar_painel",
+    "prever_painel_classico",
+    "treinar_lstm_painel",
+    "prever_futuro_painel"
+], ".panel"))
+
+
+# ==========================
+# EXPORTS PÚBLICOS
+# ==========================
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(nome):
+    """
+    Importa o submódulo no primeiro acesso ao nome e guarda o
+    objeto no pacote (acessos seguintes não passam por aqui).
+    """
+
+    if nome not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+    valor = getattr(importlib.import_module(_EXPORTS[nome], __name__), nome)
+    globals()[nome] = valor
+
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pelo backtesting com origem móvel (rolling origin).
+
+Inclui:
+- Geração de K origens em janela expansiva ou deslizante
+- Mesmas origens e mesmos meses de teste para SARIMA, Holt-Winters e LSTM
+- Blocos de origens consecutivas em paralelo (ProcessPoolExecutor)
+- Reaproveitamento do ajuste entre origens do mesmo bloco:
+  extensão do estado do SARIMA e warm-start da LSTM
+- Métricas por origem e por horizonte
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from .preprocessing import criar_sequencias, split_temporal
+from .forecasting import (
+    modelo_sarima,
+    modelo_holt_winters,
+    construir_lstm,
+    treinar_lstm,
+    prever_recursivo
+)
+from .metrics import calcular_metricas_lote
+from .parallel import executar_tarefas, fixar_seeds
+
+
+JANELAS = ("expansiva", "deslizante")
+TREINO_MINIMO = 36
+
+
+# =====================================================
+# ORIGENS
+# =====================================================
+
+def gerar_origens(n_obs: int,
+                  n_origens: int = 6,
+                  horizonte: int = 12,
+                  passo: int = None,
+                  janela: str = "expansiva",
+                  tamanho_janela: int = None) -> list:
+    """
+    Define as K origens como pares (inicio, fim) de posições do treino:
+    o treino é serie[inicio:fim] e o teste serie[fim:fim + horizonte].
+
+    A última origem termina `horizonte` meses antes do fim da série;
+    as anteriores recuam `passo` meses (padrão: `horizonte`, sem
+    sobreposição dos períodos de teste).
+
+    - 'expansiva': o treino sempre começa no primeiro mês
+    - 'deslizante': o treino tem `tamanho_janela` meses
+      (padrão: o tamanho do treino da primeira origem)
+    """
+
+    if janela not in JANELAS:
+        raise ValueError(f"Janela deve ser uma de {JANELAS}")
+
+    passo = passo or horizonte
+
+    fins = [
+        n_obs - horizonte - (n_origens - 1 - k) * passo
+        for k in range(n_origens)
+    ]
+
+    if fins[0] < TREINO_MINIMO:
+        raise ValueError(
+            f"Série curta demais: a primeira origem teria {fins[0]} meses "
+            f"de treino (mínimo {TREINO_MINIMO})."
+        )
+
+    if janela == "expansiva":
+        return [(0, fim) for fim in fins]
+
+    tamanho_janela = tamanho_janela or fins[0]
+
+    if tamanho_janela > fins[0]:
+        raise ValueError("tamanho_janela maior que o treino da primeira origem.")
+
+    return [(fim - tamanho_janela, fim) for fim in fins]
+
+
+def _dividir_em_blocos(origens: list, n_blocos: int) -> list:
+    """
+    Divide as origens em blocos de origens consecutivas.
+    """
+
+    tamanho = math.ceil(len(origens) / max(1, n_blocos))
+
+    return [
+        origens[i:i + tamanho]
+        for i in range(0, len(origens), tamanho)
+    ]
+
+
+def _resultado_origem(modelo, serie, fim, horizonte, previsao) -> pd.DataFrame:
+    """
+    Previsões de uma origem no formato longo
+    MODELO, ORIGEM, HORIZONTE, DATA, REAL, PREVISAO.
+    """
+
+    teste = serie.iloc[fim:fim + horizonte]
+
+    return pd.DataFrame({
+        "MODELO": modelo,
+        "ORIGEM": teste.index[0],
+        "HORIZONTE": np.arange(1, horizonte + 1),
+        "DATA": teste.index,
+        "REAL": teste.to_numpy(dtype=np.float64),
+        "PREVISAO": np.asarray(previsao, dtype=np.float64)
+    })
+
+
+# =====================================================
+# MODELOS POR BLOCO DE ORIGENS (EXECUTADOS NOS WORKERS)
+# =====================================================
+
+def _backtest_sarima(serie, origens, horizonte, modo_incremental="reajustar",
+                     order=(1, 1, 1), seasonal_order=(1, 1, 1, 12)):
+    """
+    SARIMA nas origens do bloco: ajuste completo só na primeira;
+    nas seguintes o estado é estendido (ver `_atualizar_sarima`).
+    """
+
+    ajuste = None
+    resultados = []
+
+    for inicio, fim in origens:
+        train = serie.iloc[inicio:fim]
+        test = serie.iloc[fim:fim + horizonte]
+
+        forecast, ajuste = modelo_sarima(
+            train,
+            test,
+            order=order,
+            seasonal_order=seasonal_order,
+            ajuste_anterior=ajuste,
+            modo_incremental=modo_incremental,
+            retornar_ajuste=True
+        )
+
+        resultados.append(_resultado_origem("SARIMA", serie, fim, horizonte, forecast))
+
+    return resultados
+
+
+def _backtest_holt_winters(serie, origens, horizonte, cache=None):
+    """
+    Holt-Winters nas origens do bloco (ajuste barato; usa o cache
+    em disco quando disponível).
+    """
+
+    resultados = []
+
+    for inicio, fim in origens:
+        train = serie.iloc[inicio:fim]
+        test = serie.iloc[fim:fim + horizonte]
+
+        forecast = modelo_holt_winters(train, test, cache=cache)
+
+        resultados.append(_resultado_origem("Holt-Winters", serie, fim, horizonte, forecast))
+
+    return resultados
+
+
+def _backtest_lstm(serie, origens, horizonte, nome_modelo, config,
+                   seq_length=12, epocas_aquecimento=None, seed=42):
+    """
+    LSTM nas origens do bloco: a primeira treina do zero com
+    config['epochs']; as seguintes continuam dos pesos anteriores por
+    `epocas_aquecimento` épocas (padrão: um quarto das épocas).
+
+    O scaler é ajustado só no treino de cada origem e a previsão dos
+    `horizonte` meses é recursiva (`prever_recursivo`).
+    """
+
+    from sklearn.preprocessing import MinMaxScaler
+
+    fixar_seeds(seed, tensorflow=True)
+
+    epocas_aquecimento = epocas_aquecimento or max(1, config["epochs"] // 4)
+
+    model = None
+    resultados = []
+
+    for inicio, fim in origens:
+        train = serie.iloc[inicio:fim].to_numpy(dtype=np.float64).reshape(-1, 1)
+
+        scaler = MinMaxScaler(feature_range=(0, 1))
+        escalado = scaler.fit_transform(train)
+
+        X, y = criar_sequencias(escalado, seq_length)
+        X_train, X_val, y_train, y_val = split_temporal(X, y, proporcao_treino=0.9)
+
+        if model is None:
+            model = construir_lstm(
+                input_shape=(seq_length, 1),
+                unidades_lstm=config["unidades_lstm"],
+                unidades_dense=config["unidades_dense"],
+                optimizer=config["optimizer"],
+                weight_decay=config.get("weight_decay", 0.0)
+            )
+            epochs = config["epochs"]
+        else:
+            epochs = epocas_aquecimento
+
+        treinar_lstm(
+            model,
+            X_train,
+            y_train,
+            X_val,
+            y_val,
+            epochs=epochs,
+            batch_size=config["batch_size"],
+            verbose=0
+        )
+
+        pred = prever_recursivo(model, escalado[None, -seq_length:], horizonte)
+        previsao = scaler.inverse_transform(pred.reshape(-1, 1)).ravel()
+
+        resultados.append(_resultado_origem(nome_modelo, serie, fim, horizonte, previsao))
+
+    return resultados
+
+
+# =====================================================
+# MÉTRICAS
+# =====================================================
+
+def _metricas_por(df_previsoes: pd.DataFrame, colunas: list, coluna_pontos: str) -> pd.DataFrame:
+    """
+    Métricas por grupo (ex.: MODELO × ORIGEM): cada grupo vira uma
+    linha da matriz grupo × `coluna_pontos` e todas são calculadas
+    de uma vez por `calcular_metricas_lote`.
+    """
+
+    real = df_previsoes.pivot_table(index=colunas, columns=coluna_pontos, values="REAL")
+    previsto = df_previsoes.pivot_table(index=colunas, columns=coluna_pontos, values="PREVISAO")
+
+    metricas = calcular_metricas_lote(real.to_numpy(), previsto.to_numpy())
+
+    return pd.concat(
+        [real.index.to_frame(index=False), metricas.drop(columns="MASE")],
+        axis=1
+    )
+
+
+# =====================================================
+# BACKTEST COMPLETO
+# =====================================================
+
+def backtest(serie: pd.Series,
+             modelos=("SARIMA", "Holt-Winters"),
+             configuracoes_lstm: dict = None,
+             n_origens: int = 6,
+             horizonte: int = 12,
+             passo: int = None,
+             janela: str = "expansiva",
+             tamanho_janela: int = None,
+             seq_length: int = 12,
+             n_workers: int = None,
+             blocos_por_modelo: int = None,
+             modo_sarima: str = "reajustar",
+             epocas_aquecimento: int = None,
+             cache=None,
+             seed: int = 42):
+    """
+    Backtest com origem móvel de todos os modelos nas mesmas origens.
+
+    Cada modelo tem suas origens divididas em `blocos_por_modelo`
+    blocos de origens consecutivas (padrão: o suficiente para ocupar
+    os workers); os blocos rodam em paralelo e, dentro de cada bloco,
+    o ajuste de uma origem é o ponto de partida da seguinte.
+
+    Retorna:
+    - previsões: MODELO, ORIGEM, HORIZONTE, DATA, REAL, PREVISAO
+    - métricas por origem (MODELO × ORIGEM)
+    - métricas por horizonte (MODELO × HORIZONTE)
+    """
+
+    origens = gerar_origens(
+        len(serie), n_origens, horizonte, passo, janela, tamanho_janela
+    )
+
+    configuracoes_lstm = configuracoes_lstm or {}
+    n_modelos = len(modelos) + len(configuracoes_lstm)
+
+    if blocos_por_modelo is None:
+        blocos_por_modelo = max(1, (n_workers or 1) // max(1, n_modelos))
+
+    blocos = _dividir_em_blocos(origens, blocos_por_modelo)
+
+    tarefas = {}
+
+    for b, bloco in enumerate(blocos):
+
+        if "SARIMA" in modelos:
+            tarefas[("SARIMA", b)] = (
+                _backtest_sarima, (serie, bloco, horizonte, modo_sarima)
+            )
+
+        if "Holt-Winters" in modelos:
+            tarefas[("Holt-Winters", b)] = (
+                _backtest_holt_winters, (serie, bloco, horizonte, cache)
+            )
+
+        for nome_modelo, config in configuracoes_lstm.items():
+            tarefas[(nome_modelo, b)] = (
+                _backtest_lstm,
+                (serie, bloco, horizonte, nome_modelo, config,
+                 seq_length, epocas_aquecimento, seed)
+            )
+
+    resultados = executar_tarefas(tarefas, n_workers=n_workers, seed=seed)
+
+    df_previsoes = pd.concat(
+        [df for lista in resultados.values() for df in lista],
+        ignore_index=True
+    ).sort_values(["MODELO", "ORIGEM", "HORIZONTE"], ignore_index=True)
+
+    return (
+        df_previsoes,
+        _metricas_por(df_previsoes, ["MODELO", "ORIGEM"], "HORIZONTE"),
+        _metricas_por(df_previsoes, ["MODELO", "HORIZONTE"], "ORIGEM")
+    )
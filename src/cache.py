@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pelo cache em disco dos ajustes de modelos clássicos.
+
+Cada entrada é identificada pelo hash (SHA-256) de:
+- dados de treino (valores + datas)
+- hiperparâmetros do modelo e horizonte
+- versões do statsmodels / NumPy
+
+Guarda os parâmetros ajustados e a previsão. Política de remoção LRU
+limitada pelo número de entradas, com contadores de acertos/falhas.
+"""
+
+import os
+import json
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+
+def atualizar_hash_serie(h, serie: pd.Series):
+    """
+    Acrescenta ao hash `h` os valores (float64) e, se houver, as
+    datas da série. Usado pela chave do cache e pela impressão
+    digital do registro de modelos.
+    """
+
+    h.update(np.ascontiguousarray(serie.to_numpy(dtype=np.float64)).tobytes())
+
+    if isinstance(serie.index, pd.DatetimeIndex):
+        h.update(serie.index.asi8.tobytes())
+
+    return h
+
+
+class CacheAjustes:
+    """
+    Cache LRU em disco de ajustes (um arquivo .npz por entrada).
+
+    A ordem de uso é a data de modificação do arquivo, o que permite
+    compartilhar o mesmo diretório entre processos do pool.
+    """
+
+    def __init__(self, diretorio: str, max_entradas: int = 10_000):
+
+        self.diretorio = diretorio
+        self.max_entradas = max_entradas
+        self.acertos = 0
+        self.falhas = 0
+
+        os.makedirs(diretorio, exist_ok=True)
+
+        # Estimativa local do número de entradas (evita listar o
+        # diretório a cada gravação)
+        self._n_entradas = self._contar_entradas()
+
+    # =====================================================
+    # CHAVE
+    # =====================================================
+
+    def chave(self, modelo: str, train: pd.Series, steps: int, parametros: dict) -> str:
+        """
+        Hash do conteúdo: dados de treino, parâmetros e versões.
+        """
+
+        import statsmodels
+
+        h = atualizar_hash_serie(hashlib.sha256(), train)
+
+        h.update(json.dumps({
+            "modelo": modelo,
+            "steps": int(steps),
+            "parametros": parametros,
+            "statsmodels": statsmodels.__version__,
+            "numpy": np.__version__
+        }, sort_keys=True, default=str).encode())
+
+        return h.hexdigest()
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, f"{chave}.npz")
+
+    def _contar_entradas(self) -> int:
+        return sum(1 for nome in os.listdir(self.diretorio) if nome.endswith(".npz"))
+
+    # =====================================================
+    # LEITURA / ESCRITA
+    # =====================================================
+
+    def obter(self, chave: str):
+        """
+        Retorna dict com 'forecast' e 'params' (dict nome → valor),
+        ou None se a entrada não existir.
+        """
+
+        path = self._caminho(chave)
+
+        try:
+            with np.load(path) as dados:
+                entrada = {
+                    "forecast": dados["forecast"],
+                    "params": {
+                        nome[len("param_"):]: dados[nome]
+                        for nome in dados.files
+                        if nome.startswith("param_")
+                    }
+                }
+        except (FileNotFoundError, OSError, ValueError):
+            self.falhas += 1
+            return None
+
+        # Marca como usado recentemente
+        os.utime(path)
+        self.acertos += 1
+
+        return entrada
+
+    def guardar(self, chave: str, forecast, params: dict):
+        """
+        Grava a entrada (escrita atômica) e aplica a política LRU.
+        """
+
+        dados = {"forecast": np.asarray(forecast, dtype=np.float64)}
+
+        for nome, valor in params.items():
+            dados[f"param_{nome}"] = np.asarray(valor, dtype=np.float64)
+
+        path = self._caminho(chave)
+        temporario = f"{path}.{os.getpid()}.tmp"
+        nova = not os.path.exists(path)
+
+        with open(temporario, "wb") as arquivo:
+            np.savez(arquivo, **dados)
+
+        os.replace(temporario, path)
+
+        # Sobrescrever uma chave existente não aumenta o número de entradas
+        if nova:
+            self._n_entradas += 1
+
+        if self._n_entradas > self.max_entradas:
+            self._remover_excedentes()
+
+    def _remover_excedentes(self):
+        """
+        Remove as entradas usadas há mais tempo além de `max_entradas`.
+        """
+
+        entradas = [
+            entrada for entrada in os.scandir(self.diretorio)
+            if entrada.name.endswith(".npz")
+        ]
+
+        excedente = len(entradas) - self.max_entradas
+        self._n_entradas = min(len(entradas), self.max_entradas)
+
+        if excedente <= 0:
+            return
+
+        entradas.sort(key=lambda entrada: entrada.stat().st_mtime)
+
+        for entrada in entradas[:excedente]:
+            try:
+                os.remove(entrada.path)
+            except FileNotFoundError:
+                pass
+
+    # =====================================================
+    # ESTATÍSTICAS
+    # =====================================================
+
+    def estatisticas(self) -> dict:
+
+        total = self.acertos + self.falhas
+
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acerto": self.acertos / total if total else np.nan,
+            "entradas": self._contar_entradas()
+        }
+
+    def limpar(self):
+
+        for nome in os.listdir(self.diretorio):
+            if nome.endswith(".npz"):
+                os.remove(os.path.join(self.diretorio, nome))
+
+        self.acertos = 0
+        self.falhas = 0
+        self._n_entradas = 0
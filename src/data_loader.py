@@ -4,12 +4,23 @@ Inclui:
 - Série temporal principal
 - Arquivos de previsão
 - Arquivo consolidado de métricas
+- Painel de séries (formato longo) e previsões particionadas por modelo
+
+Formatos suportados: CSV e Parquet (colunar, com DATA já tipada).
+O formato é detectado pela extensão ou informado via `formato=`.
 """
 
 import os
 import pandas as pd
 
 
+FORMATOS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet"
+}
+
+
 # =====================================================
 # FUNÇÃO INTERNA DE VALIDAÇÃO
 # =====================================================
@@ -19,24 +30,65 @@ def _verificar_arquivo(path: str):
         raise FileNotFoundError(f"Arquivo não encontrado: {path}")
 
 
+# =====================================================
+# FUNÇÕES INTERNAS DE FORMATO
+# =====================================================
+
+def _detectar_formato(path: str, formato: str = None) -> str:
+    """
+    Retorna 'csv' ou 'parquet' (argumento explícito ou extensão).
+    """
+
+    if formato is None:
+        extensao = os.path.splitext(path)[1].lower()
+        formato = FORMATOS.get(extensao, "csv")
+
+    if formato not in ("csv", "parquet"):
+        raise ValueError("Formato deve ser 'csv' ou 'parquet'")
+
+    return formato
+
+
+def _ler_tabela(path: str, formato: str = None, colunas: list = None) -> pd.DataFrame:
+    """
+    Lê CSV ou Parquet, apenas com as colunas pedidas.
+    """
+
+    _verificar_arquivo(path)
+
+    if _detectar_formato(path, formato) == "parquet":
+        return pd.read_parquet(path, columns=colunas)
+
+    return pd.read_csv(path, usecols=colunas)
+
+
+def _garantir_data(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte DATA apenas quando ainda não é datetime (CSV).
+    """
+
+    if not pd.api.types.is_datetime64_any_dtype(df["DATA"]):
+        df["DATA"] = pd.to_datetime(df["DATA"])
+
+    return df
+
+
 # =====================================================
 # CARREGAR SÉRIE TEMPORAL PRINCIPAL
 # =====================================================
 
-def carregar_serie(path: str) -> pd.Series:
+def carregar_serie(path: str, formato: str = None) -> pd.Series:
     """
     Carrega a série temporal principal.
     Espera colunas: DATA + valor numérico.
     """
 
-    _verificar_arquivo(path)
-
-    df = pd.read_csv(path)
+    df = _ler_tabela(path, formato)
 
     if "DATA" not in df.columns:
         raise ValueError("O arquivo deve conter a coluna 'DATA'.")
 
-    df["DATA"] = pd.to_datetime(df["DATA"])
+    df = _garantir_data(df)
     df.set_index("DATA", inplace=True)
 
     # Garante frequência mensal
@@ -50,24 +102,28 @@ def carregar_serie(path: str) -> pd.Series:
 # CARREGAR PREVISÕES
 # =====================================================
 
-def carregar_previsao(path: str) -> pd.DataFrame:
+def carregar_previsao(path: str, formato: str = None, colunas: list = None) -> pd.DataFrame:
     """
     Carrega arquivos de previsão.
     Espera colunas: DATA, REAL, PREVISAO
+
+    `colunas` permite carregar só parte delas (ex.: ['PREVISAO']).
     """
 
-    _verificar_arquivo(path)
+    colunas_necessarias = {"DATA", "REAL", "PREVISAO"}
 
-    df = pd.read_csv(path)
+    if colunas is not None:
+        colunas_necessarias = {"DATA"} | set(colunas)
+        colunas = list(dict.fromkeys(["DATA", *colunas]))
 
-    colunas_necessarias = {"DATA", "REAL", "PREVISAO"}
+    df = _ler_tabela(path, formato, colunas)
 
     if not colunas_necessarias.issubset(df.columns):
         raise ValueError(
             f"O arquivo deve conter as colunas: {colunas_necessarias}"
         )
 
-    df["DATA"] = pd.to_datetime(df["DATA"])
+    df = _garantir_data(df)
     df.set_index("DATA", inplace=True)
 
     return df.sort_index()
@@ -77,16 +133,17 @@ def carregar_previsao(path: str) -> pd.DataFrame:
 # CARREGAR MÉTRICAS
 # =====================================================
 
-def carregar_metricas(path: str) -> pd.DataFrame:
+def carregar_metricas(path: str, formato: str = None, colunas: list = None) -> pd.DataFrame:
     """
     Carrega o arquivo consolidado de métricas.
     Espera colunas como:
     Modelo, MSE, MAPE (%)
     """
 
-    _verificar_arquivo(path)
+    if colunas is not None:
+        colunas = list(dict.fromkeys(["Modelo", "MSE", *colunas]))
 
-    df = pd.read_csv(path)
+    df = _ler_tabela(path, formato, colunas)
 
     if "Modelo" not in df.columns:
         raise ValueError("O arquivo de métricas deve conter a coluna 'Modelo'.")
@@ -94,13 +151,121 @@ def carregar_metricas(path: str) -> pd.DataFrame:
     return df.sort_values(by="MSE")
 
 
+# =====================================================
+# CARREGAR PAINEL (FORMATO LONGO)
+# =====================================================
+
+def carregar_painel(path: str, formato: str = None) -> pd.DataFrame:
+    """
+    Carrega painel no formato longo.
+    Espera colunas: CHAVE, DATA + valor numérico.
+
+    Retorna DataFrame com colunas CHAVE, DATA, VALOR.
+    """
+
+    df = _ler_tabela(path, formato)
+
+    if not {"CHAVE", "DATA"}.issubset(df.columns):
+        raise ValueError("O painel deve conter as colunas 'CHAVE' e 'DATA'.")
+
+    valores = [col for col in df.columns if col not in ("CHAVE", "DATA")]
+
+    if not valores:
+        raise ValueError("O painel deve conter uma coluna de valores.")
+
+    df = _garantir_data(df)
+
+    return df[["CHAVE", "DATA", valores[0]]].rename(columns={valores[0]: "VALOR"})
+
+
+# =====================================================
+# PREVISÕES DO PAINEL (PARQUET PARTICIONADO)
+# =====================================================
+
+def salvar_previsoes_painel(df: pd.DataFrame, diretorio: str):
+    """
+    Grava previsões do painel (MODELO, CHAVE, DATA, REAL, PREVISAO)
+    em um único dataset Parquet particionado por MODELO.
+
+    Partições existentes de outros modelos são mantidas;
+    as dos modelos presentes em `df` são substituídas.
+    """
+
+    os.makedirs(diretorio, exist_ok=True)
+
+    df = df.copy()
+    df["DATA"] = pd.to_datetime(df["DATA"])
+    df[["REAL", "PREVISAO"]] = df[["REAL", "PREVISAO"]].astype("float64")
+
+    df.to_parquet(
+        diretorio,
+        index=False,
+        partition_cols=["MODELO"],
+        existing_data_behavior="delete_matching"
+    )
+
+
+def carregar_previsoes_painel(diretorio: str,
+                              modelos: list = None,
+                              chaves: list = None) -> pd.DataFrame:
+    """
+    Carrega previsões do painel, lendo apenas as partições
+    (modelos) e chaves pedidas.
+    """
+
+    _verificar_arquivo(diretorio)
+
+    filtros = []
+
+    if modelos is not None:
+        filtros.append(("MODELO", "in", list(modelos)))
+
+    if chaves is not None:
+        filtros.append(("CHAVE", "in", list(chaves)))
+
+    df = pd.read_parquet(diretorio, filters=filtros or None)
+    df["MODELO"] = df["MODELO"].astype(str)
+
+    return df.sort_values(["MODELO", "CHAVE", "DATA"], ignore_index=True)
+
+
+# =====================================================
+# SALVAR TABELAS (CSV / PARQUET)
+# =====================================================
+
+def salvar_tabela(df: pd.DataFrame, path: str, formato: str = None):
+    """
+    Salva DataFrame em CSV ou Parquet.
+
+    No Parquet, DATA é gravada como datetime e as colunas de ponto
+    flutuante como float64, dispensando conversões na leitura; as
+    inteiras (HORIZONTE, contagens, chaves) mantêm o tipo, como no CSV.
+    """
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    if _detectar_formato(path, formato) == "csv":
+        df.to_csv(path, index=False)
+        return
+
+    df = df.copy()
+
+    if "DATA" in df.columns:
+        df["DATA"] = pd.to_datetime(df["DATA"])
+
+    for coluna in df.select_dtypes("floating").columns:
+        df[coluna] = df[coluna].astype("float64")
+
+    df.to_parquet(path, index=False)
+
+
 # =====================================================
 # FUNÇÃO UTILITÁRIA OPCIONAL
 # =====================================================
 
 def listar_arquivos_processados(diretorio: str) -> list:
     """
-    Lista todos os CSV dentro da pasta processed.
+    Lista todos os CSV e Parquet dentro da pasta processed.
     """
 
     if not os.path.isdir(diretorio):
@@ -109,5 +274,5 @@ def listar_arquivos_processados(diretorio: str) -> list:
     return [
         arquivo
         for arquivo in os.listdir(diretorio)
-        if arquivo.endswith(".csv")
-    ]
\ No newline at end of file
+        if os.path.splitext(arquivo)[1].lower() in FORMATOS
+    ]
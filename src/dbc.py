@@ -0,0 +1,627 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pela leitura nativa dos arquivos .dbc do DATASUS.
+
+Um .dbc é o cabeçalho de um DBF (dBase III), seguido de 4 bytes de
+CRC e dos registros comprimidos no formato "implode" da PKWare
+(Data Compression Library).
+
+Inclui:
+- Descompressor PKWare DCL em streaming (janela de 4 KB)
+- Leitura dos registros DBF em lotes, só dos campos pedidos, direto
+  para colunas categóricas (como `DTYPES_SIM` na leitura do CSV)
+- Gravação de .dbc/.dbf pequenos (fixtures para testes offline)
+
+Referência do formato: blast.c (Mark Adler, zlib/contrib/blast).
+"""
+
+import io
+import os
+import struct
+import zlib
+
+import numpy as np
+import pandas as pd
+
+
+# =====================================================
+# TABELAS DO FORMATO PKWARE DCL
+# =====================================================
+
+# Comprimentos dos códigos de Huffman em forma compacta: cada byte
+# é (repetições - 1) << 4 | comprimento
+_COMPRIMENTOS_LITERAIS = bytes([
+    11, 124, 8, 7, 28, 7, 188, 13, 76, 4, 10, 8, 12, 10, 12, 10, 8, 23, 8,
+    9, 7, 6, 7, 8, 7, 6, 55, 8, 23, 24, 12, 11, 7, 9, 11, 12, 6, 7, 22, 5,
+    7, 24, 6, 11, 9, 6, 7, 22, 7, 11, 38, 7, 9, 8, 25, 11, 8, 11, 9, 12,
+    8, 12, 5, 38, 5, 38, 5, 11, 7, 5, 6, 21, 6, 10, 53, 8, 7, 24, 10, 27,
+    44, 253, 253, 253, 252, 252, 252, 13, 12, 45, 12, 45, 12, 61, 12, 45,
+    44, 173
+])
+_COMPRIMENTOS_TAMANHO = bytes([2, 35, 36, 53, 38, 23])
+_COMPRIMENTOS_DISTANCIA = bytes([2, 20, 53, 230, 247, 151, 248])
+
+# Tamanho da cópia: base + bits extras, por símbolo
+_BASE_TAMANHO = (3, 2, 4, 5, 6, 7, 8, 9, 10, 12, 16, 24, 40, 72, 136, 264)
+_EXTRA_TAMANHO = (0, 0, 0, 0, 0, 0, 0, 0, 1, 2, 3, 4, 5, 6, 7, 8)
+
+# Tamanho 519 marca o fim do fluxo
+_FIM = 519
+
+_JANELA = 4096
+
+
+def _expandir_comprimentos(compacto: bytes) -> list:
+
+    comprimentos = []
+
+    for byte in compacto:
+        comprimentos += [byte & 15] * ((byte >> 4) + 1)
+
+    return comprimentos
+
+
+def _codigos_canonicos(comprimentos: list) -> list:
+    """
+    Código canônico (símbolos em ordem de comprimento e valor) de cada
+    símbolo, como (código, comprimento).
+    """
+
+    codigos = [None] * len(comprimentos)
+    codigo = 0
+    anterior = 0
+
+    for comprimento, simbolo in sorted((c, s) for s, c in enumerate(comprimentos) if c):
+        codigo <<= comprimento - anterior
+        codigos[simbolo] = (codigo, comprimento)
+        codigo += 1
+        anterior = comprimento
+
+    return codigos
+
+
+def _bits_no_fluxo(codigo: int, comprimento: int) -> int:
+    """
+    Valor dos bits como aparecem no fluxo (lidos do bit menos
+    significativo): o código vai do bit mais significativo para o
+    menos, invertido.
+    """
+
+    valor = 0
+
+    for i in range(comprimento):
+        bit = ((codigo >> (comprimento - 1 - i)) & 1) ^ 1
+        valor |= bit << i
+
+    return valor
+
+
+def _tabela_decodificacao(compacto: bytes):
+    """
+    Tabela indexada pelos próximos `largura` bits do fluxo:
+    entrada = símbolo << 4 | comprimento do código.
+    """
+
+    codigos = _codigos_canonicos(_expandir_comprimentos(compacto))
+    largura = max(c for _, c in filter(None, codigos))
+    tabela = [0] * (1 << largura)
+
+    for simbolo, entrada in enumerate(codigos):
+        if entrada is None:
+            continue
+
+        codigo, comprimento = entrada
+        valor = _bits_no_fluxo(codigo, comprimento)
+
+        for alto in range(1 << (largura - comprimento)):
+            tabela[valor | (alto << comprimento)] = simbolo << 4 | comprimento
+
+    return tabela, (1 << largura) - 1
+
+
+def _tabela_copia():
+    """
+    Tabela das cópias indexada pelo bit de tipo + código do tamanho:
+    (bits usados, tamanho base, máscara dos bits extras).
+    """
+
+    tabela, mascara = _tabela_decodificacao(_COMPRIMENTOS_TAMANHO)
+
+    copia = []
+    for indice in range((mascara + 1) << 1):
+        entrada = tabela[indice >> 1]
+        simbolo = entrada >> 4
+        copia.append((
+            1 + (entrada & 15),
+            _BASE_TAMANHO[simbolo],
+            (1 << _EXTRA_TAMANHO[simbolo]) - 1
+        ))
+
+    return copia, (mascara << 1) | 1
+
+
+_TABELAS = {}
+
+
+def _tabelas():
+
+    if not _TABELAS:
+        _TABELAS["literais"] = _tabela_decodificacao(_COMPRIMENTOS_LITERAIS)
+        _TABELAS["copia"] = _tabela_copia()
+        _TABELAS["distancia"] = _tabela_decodificacao(_COMPRIMENTOS_DISTANCIA)
+
+    return _TABELAS
+
+
+# =====================================================
+# DESCOMPRESSÃO (STREAMING)
+# =====================================================
+
+def explodir(dados, inicio: int = 0, tamanho_bloco: int = 1 << 22,
+             tamanho_leitura: int = 1 << 20):
+    """
+    Descomprime um fluxo PKWare DCL ("implode") a partir da posição
+    `inicio` de `dados` (bytes ou arquivo binário aberto).
+
+    A entrada é lida em pedaços de `tamanho_leitura` bytes e a saída
+    sai em blocos de ~`tamanho_bloco`; só os últimos 4 KB (janela das
+    cópias) ficam retidos entre um bloco e o seguinte.
+    """
+
+    if isinstance(dados, (bytes, bytearray, memoryview)):
+        dados = io.BytesIO(dados)
+
+    dados.seek(inicio)
+    ler = dados.read
+
+    comprimido = ler(max(tamanho_leitura, 2))
+
+    if len(comprimido) < 2:
+        raise ValueError("Fluxo PKWare truncado.")
+
+    literais_codificados, bits_dicionario = comprimido[0], comprimido[1]
+
+    if literais_codificados not in (0, 1) or bits_dicionario not in (4, 5, 6):
+        raise ValueError("Cabeçalho PKWare DCL inválido.")
+
+    tabelas = _tabelas()
+    tab_literais, mascara_literais = tabelas["literais"]
+    tab_copia, mascara_copia = tabelas["copia"]
+    tab_distancia, mascara_distancia = tabelas["distancia"]
+
+    mascara_baixos = (1 << bits_dicionario) - 1
+
+    # Lido até `limite`, o pedaço ainda tem os 8 bytes da próxima recarga
+    limite = len(comprimido) - 8
+    esgotado = False
+    pos = 2
+    buffer = 0
+    n_bits = 0
+
+    saida = bytearray()
+    anexar = saida.append
+
+    while True:
+
+        # Recarrega 64 bits de uma vez (o maior token tem 1 + 7 + 8 + 8 + 6 bits);
+        # a saída só é conferida aqui, não a cada token
+        if n_bits < 32:
+            if pos > limite:
+                while pos > limite and not esgotado:
+                    novo = ler(tamanho_leitura)
+                    esgotado = not novo
+                    comprimido = comprimido[pos:] + novo
+                    pos = 0
+                    limite = len(comprimido) - 8
+
+                # Fim do arquivo: os bits que faltam são lidos como zero
+                if pos >= limite + 16:
+                    raise ValueError("Fluxo PKWare truncado (sem marca de fim).")
+
+            buffer |= int.from_bytes(comprimido[pos:pos + 8], "little") << n_bits
+            pos += 8
+            n_bits += 64
+
+            if len(saida) >= tamanho_bloco + _JANELA:
+                yield bytes(saida[:-_JANELA])
+                del saida[:-_JANELA]
+
+        if buffer & 1:
+            # Cópia: tamanho (código + bits extras) e distância
+            usados, tamanho, mascara_extra = tab_copia[buffer & mascara_copia]
+            tamanho += (buffer >> usados) & mascara_extra
+            usados += mascara_extra.bit_length()
+
+            if tamanho == _FIM:
+                break
+
+            entrada = tab_distancia[(buffer >> usados) & mascara_distancia]
+            usados += entrada & 15
+
+            if tamanho == 2:
+                distancia = ((entrada >> 4) << 2) + ((buffer >> usados) & 3) + 1
+                usados += 2
+            else:
+                distancia = ((entrada >> 4) << bits_dicionario) + ((buffer >> usados) & mascara_baixos) + 1
+                usados += bits_dicionario
+
+            buffer >>= usados
+            n_bits -= usados
+
+            origem = len(saida) - distancia
+
+            if origem < 0:
+                raise ValueError("Distância de cópia além do início dos dados.")
+
+            if distancia >= tamanho:
+                saida += saida[origem:origem + tamanho]
+            else:
+                # Sobreposição: repete o padrão de `distancia` bytes
+                saida += (saida[origem:] * (tamanho // distancia + 1))[:tamanho]
+
+        elif literais_codificados:
+            entrada = tab_literais[(buffer >> 1) & mascara_literais]
+            anexar(entrada >> 4)
+
+            usados = 1 + (entrada & 15)
+            buffer >>= usados
+            n_bits -= usados
+
+        else:
+            anexar((buffer >> 1) & 255)
+
+            buffer >>= 9
+            n_bits -= 9
+
+    yield bytes(saida)
+
+
+# =====================================================
+# COMPRESSÃO (FIXTURES)
+# =====================================================
+
+class _EscritorBits:
+
+    def __init__(self):
+        self.buffer = 0
+        self.n_bits = 0
+        self.saida = bytearray()
+
+    def escrever(self, valor: int, n: int):
+        self.buffer |= (valor & ((1 << n) - 1)) << self.n_bits
+        self.n_bits += n
+
+        while self.n_bits >= 8:
+            self.saida.append(self.buffer & 255)
+            self.buffer >>= 8
+            self.n_bits -= 8
+
+    def codigo(self, entrada):
+        codigo, comprimento = entrada
+        self.escrever(_bits_no_fluxo(codigo, comprimento), comprimento)
+
+    def finalizar(self) -> bytes:
+        if self.n_bits:
+            self.saida.append(self.buffer & 255)
+
+        return bytes(self.saida)
+
+
+def implodir(dados: bytes, literais_codificados: bool = True, bits_dicionario: int = 6) -> bytes:
+    """
+    Comprime no formato PKWare DCL com busca gulosa de repetições.
+
+    Lento (Python puro): serve para gerar fixtures pequenos, não
+    para produção.
+    """
+
+    if bits_dicionario not in (4, 5, 6):
+        raise ValueError("bits_dicionario deve ser 4, 5 ou 6.")
+
+    codigos_literais = _codigos_canonicos(_expandir_comprimentos(_COMPRIMENTOS_LITERAIS))
+    codigos_tamanho = _codigos_canonicos(_expandir_comprimentos(_COMPRIMENTOS_TAMANHO))
+    codigos_distancia = _codigos_canonicos(_expandir_comprimentos(_COMPRIMENTOS_DISTANCIA))
+
+    janela = 64 << bits_dicionario
+    escritor = _EscritorBits()
+    escritor.escrever(int(literais_codificados), 8)
+    escritor.escrever(bits_dicionario, 8)
+
+    def escrever_tamanho(tamanho):
+        # Símbolos 0 e 1 são os tamanhos 3 e 2; do 2 em diante, bases crescentes
+        if tamanho <= 3:
+            simbolo = 3 - tamanho
+        else:
+            simbolo = max(s for s in range(2, 16) if _BASE_TAMANHO[s] <= tamanho)
+
+        escritor.codigo(codigos_tamanho[simbolo])
+        escritor.escrever(tamanho - _BASE_TAMANHO[simbolo], _EXTRA_TAMANHO[simbolo])
+
+    ultimas = {}
+    i = 0
+
+    while i < len(dados):
+
+        melhor_tamanho, melhor_distancia = 0, 0
+        trinca = dados[i:i + 3]
+
+        for j in reversed(ultimas.get(trinca, [])[-16:]):
+            distancia = i - j
+
+            if distancia > janela:
+                break
+
+            tamanho = 0
+
+            while (tamanho < 518 and i + tamanho < len(dados)
+                   and dados[j + tamanho] == dados[i + tamanho]):
+                tamanho += 1
+
+            if tamanho > melhor_tamanho:
+                melhor_tamanho, melhor_distancia = tamanho, distancia
+
+        if melhor_tamanho >= 3:
+            escritor.escrever(1, 1)
+            escrever_tamanho(melhor_tamanho)
+
+            bits_baixos = bits_dicionario
+            escritor.codigo(codigos_distancia[(melhor_distancia - 1) >> bits_baixos])
+            escritor.escrever(melhor_distancia - 1, bits_baixos)
+            avanco = melhor_tamanho
+
+        else:
+            escritor.escrever(0, 1)
+
+            if literais_codificados:
+                escritor.codigo(codigos_literais[dados[i]])
+            else:
+                escritor.escrever(dados[i], 8)
+
+            avanco = 1
+
+        for k in range(i, i + avanco):
+            ultimas.setdefault(dados[k:k + 3], []).append(k)
+
+        i += avanco
+
+    escritor.escrever(1, 1)
+    escrever_tamanho(_FIM)
+
+    return escritor.finalizar()
+
+
+# =====================================================
+# DBF
+# =====================================================
+
+def _ler_cabecalho_dbf(cabecalho: bytes, encoding: str = "latin1") -> dict:
+    """
+    Número de registros, tamanhos e campos (nome, tipo, deslocamento
+    no registro e tamanho) de um cabeçalho dBase III.
+    """
+
+    n_registros, tamanho_cabecalho, tamanho_registro = struct.unpack("<IHH", cabecalho[4:12])
+
+    campos = {}
+    deslocamento = 1  # primeiro byte: marca de registro apagado
+
+    for pos in range(32, tamanho_cabecalho - 1, 32):
+
+        if cabecalho[pos] == 0x0D:
+            break
+
+        descritor = cabecalho[pos:pos + 32]
+        nome = descritor[:11].split(b"\x00")[0].decode(encoding).strip()
+        tamanho = descritor[16]
+
+        campos[nome] = {
+            "tipo": chr(descritor[11]),
+            "deslocamento": deslocamento,
+            "tamanho": tamanho
+        }
+        deslocamento += tamanho
+
+    return {
+        "n_registros": n_registros,
+        "tamanho_cabecalho": tamanho_cabecalho,
+        "tamanho_registro": tamanho_registro,
+        "campos": campos
+    }
+
+
+def _coluna_categorica(registros: np.ndarray, deslocamento: int, tamanho: int,
+                       encoding: str) -> pd.Categorical:
+    """
+    Campo de largura fixa → categoria. Só os valores distintos são
+    decodificados; brancos viram nulos.
+    """
+
+    valores = np.ascontiguousarray(
+        registros[:, deslocamento:deslocamento + tamanho]
+    ).view(f"S{tamanho}").ravel()
+
+    unicos, codigos = np.unique(valores, return_inverse=True)
+
+    textos = pd.Index([u.decode(encoding).strip() for u in unicos])
+    categorias = textos[textos != ""].unique()
+
+    # Valores iguais após remover espaços compartilham a categoria
+    codigos = categorias.get_indexer(textos)[codigos]
+
+    return pd.Categorical.from_codes(codigos, categorias)
+
+
+def _registros_em_blocos(blocos_bytes, cabecalho: dict, colunas: list,
+                         registros_por_bloco: int, encoding: str):
+    """
+    Agrupa o fluxo de bytes dos registros em lotes de
+    `registros_por_bloco` e monta um DataFrame por lote.
+    """
+
+    tamanho = cabecalho["tamanho_registro"]
+    restantes = cabecalho["n_registros"]
+    campos = cabecalho["campos"]
+
+    presentes = [c for c in colunas if c in campos]
+    ausentes = [c for c in colunas if c not in campos]
+
+    pendente = bytearray()
+    blocos_bytes = iter(blocos_bytes)
+    esgotado = False
+
+    while restantes > 0:
+
+        alvo = min(registros_por_bloco, restantes) * tamanho
+
+        while len(pendente) < alvo and not esgotado:
+            try:
+                pendente += next(blocos_bytes)
+            except StopIteration:
+                esgotado = True
+
+        n = min(len(pendente) // tamanho, restantes)
+
+        if n == 0:
+            raise ValueError("Arquivo DBF truncado: faltam registros.")
+
+        registros = np.frombuffer(bytes(pendente[:n * tamanho]), dtype=np.uint8).reshape(n, tamanho)
+        del pendente[:n * tamanho]
+        restantes -= n
+
+        # Registros marcados como apagados ('*') são ignorados
+        registros = registros[registros[:, 0] != ord("*")]
+
+        bloco = pd.DataFrame({
+            nome: _coluna_categorica(
+                registros, campos[nome]["deslocamento"], campos[nome]["tamanho"], encoding
+            )
+            for nome in presentes
+        }, index=pd.RangeIndex(len(registros)))
+
+        # Campos que não existem neste ano do SIM entram nulos
+        for nome in ausentes:
+            bloco[nome] = pd.Categorical([None] * len(registros))
+
+        yield bloco[colunas]
+
+
+def ler_campos_dbc(path: str, encoding: str = "latin1") -> list:
+    """
+    Nomes dos campos de um .dbc ou .dbf (só lê o cabeçalho).
+    """
+
+    with open(path, "rb") as arquivo:
+        inicio = arquivo.read(32)
+        tamanho_cabecalho = struct.unpack("<H", inicio[8:10])[0]
+        cabecalho = inicio + arquivo.read(tamanho_cabecalho - 32)
+
+    return list(_ler_cabecalho_dbf(cabecalho, encoding)["campos"])
+
+
+# =====================================================
+# LEITURA EM BLOCOS (.DBC / .DBF)
+# =====================================================
+
+def ler_dbc_em_blocos(path: str,
+                      colunas: list = None,
+                      registros_por_bloco: int = 500_000,
+                      encoding: str = "latin1"):
+    """
+    Lê um .dbc (ou .dbf) do DATASUS em lotes de registros, só com os
+    campos em `colunas` (padrão: todos), como colunas categóricas.
+
+    O arquivo é lido em pedaços e a descompressão acompanha a
+    leitura: a memória de pico depende de `registros_por_bloco`, não
+    do tamanho do arquivo.
+    """
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+
+    with open(path, "rb") as arquivo:
+        inicio = arquivo.read(32)
+        tamanho_cabecalho = struct.unpack("<H", inicio[8:10])[0]
+        cabecalho = _ler_cabecalho_dbf(inicio + arquivo.read(tamanho_cabecalho - 32), encoding)
+        colunas = list(cabecalho["campos"]) if colunas is None else list(colunas)
+
+        if path.lower().endswith(".dbf"):
+            fluxo = iter(lambda: arquivo.read(1 << 22), b"")
+        else:
+            # Cabeçalho DBF + 4 bytes de CRC + registros comprimidos
+            fluxo = explodir(arquivo, inicio=tamanho_cabecalho + 4)
+
+        yield from _registros_em_blocos(fluxo, cabecalho, colunas, registros_por_bloco, encoding)
+
+
+def ler_dbc(path: str, colunas: list = None, encoding: str = "latin1") -> pd.DataFrame:
+    """
+    Lê um .dbc (ou .dbf) inteiro em um DataFrame.
+    """
+
+    blocos = list(ler_dbc_em_blocos(path, colunas, encoding=encoding))
+
+    return pd.concat(blocos, ignore_index=True) if len(blocos) > 1 else blocos[0]
+
+
+# =====================================================
+# GRAVAÇÃO (FIXTURES)
+# =====================================================
+
+def _montar_dbf(df: pd.DataFrame, encoding: str = "latin1") -> tuple:
+    """
+    DataFrame → (cabeçalho, registros) de um DBF com campos texto (C).
+    """
+
+    textos = {
+        coluna: df[coluna].astype(object).where(df[coluna].notna(), "").astype(str)
+        for coluna in df.columns
+    }
+    larguras = {
+        coluna: max(1, int(valores.map(lambda v: len(v.encode(encoding))).max() or 1))
+        for coluna, valores in textos.items()
+    }
+
+    tamanho_cabecalho = 32 + 32 * len(df.columns) + 1
+    tamanho_registro = 1 + sum(larguras.values())
+
+    cabecalho = bytearray(struct.pack(
+        "<BBBBIHH20x", 0x03, 126, 1, 1, len(df), tamanho_cabecalho, tamanho_registro
+    ))
+
+    for coluna, largura in larguras.items():
+        cabecalho += struct.pack(
+            "<11sc4xBB14x", coluna.encode(encoding)[:10], b"C", largura, 0
+        )
+
+    cabecalho += b"\x0D"
+
+    registros = bytearray()
+
+    for linha in zip(*textos.values()):
+        registros += b" "
+
+        for coluna, valor in zip(larguras, linha):
+            registros += valor.encode(encoding).ljust(larguras[coluna])
+
+    return bytes(cabecalho), bytes(registros) + b"\x1A"
+
+
+def gravar_dbc(df: pd.DataFrame, path: str, encoding: str = "latin1",
+               literais_codificados: bool = True):
+    """
+    Grava `df` como .dbc (ou .dbf, conforme a extensão), com todos os
+    campos como texto. Para fixtures pequenos de teste.
+    """
+
+    cabecalho, registros = _montar_dbf(df, encoding)
+
+    with open(path, "wb") as arquivo:
+        arquivo.write(cabecalho)
+
+        if path.lower().endswith(".dbf"):
+            arquivo.write(registros)
+            return
+
+        comprimido = implodir(registros, literais_codificados=literais_codificados)
+        arquivo.write(struct.pack("<I", zlib.crc32(comprimido)))
+        arquivo.write(comprimido)
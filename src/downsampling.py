@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pela redução de pontos das séries antes de plotar.
+
+Inclui:
+- LTTB (largest-triangle-three-buckets): preserva a forma visual
+- Mín/máx por bucket: preserva picos e vales
+- Recorte do período exibido + redução a um número de pontos
+  limitado pela largura do gráfico
+"""
+
+import numpy as np
+import pandas as pd
+
+
+METODOS = ("lttb", "minmax")
+
+# Acima deste número de pontos por bucket, o LTTB usa NumPy
+BUCKET_VETORIZADO = 64
+
+
+def _eixo_numerico(x) -> np.ndarray:
+    """
+    Eixo x como float64 relativo ao primeiro ponto (datas em ns).
+    """
+
+    x = np.asarray(x)
+
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype("datetime64[ns]").astype(np.int64)
+
+    x = x.astype(np.float64)
+
+    return x - x[0] if len(x) else x
+
+
+# =====================================================
+# ALGORITMOS (RETORNAM AS POSIÇÕES MANTIDAS)
+# =====================================================
+
+def lttb(x, y, n_pontos: int) -> np.ndarray:
+    """
+    Posições dos `n_pontos` pontos escolhidos pelo LTTB.
+
+    O primeiro e o último ponto são sempre mantidos; de cada bucket
+    intermediário fica o ponto que forma o maior triângulo com o
+    ponto escolhido no bucket anterior e a média do bucket seguinte.
+    """
+
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+
+    if n_pontos >= n or n_pontos < 3:
+        return np.arange(n)
+
+    x = _eixo_numerico(x)
+
+    # n_pontos - 2 buckets entre o primeiro e o último ponto
+    bordas = np.linspace(1, n - 1, n_pontos - 1).astype(np.int64)
+    bordas = np.append(bordas, n)
+
+    # Médias de todos os buckets de uma vez (o seguinte de cada bucket)
+    contagens = np.diff(bordas)
+    medias_x = (np.add.reduceat(x, bordas[:-1]) / contagens).tolist()
+    medias_y = (np.add.reduceat(y, bordas[:-1]) / contagens).tolist()
+
+    # Buckets pequenos: laço em floats Python (evita o custo fixo de
+    # uma operação NumPy por bucket); grandes: vetorizado
+    xs, ys = x.tolist(), y.tolist()
+    bordas = bordas.tolist()
+
+    indices = np.empty(n_pontos, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+
+    for i in range(n_pontos - 2):
+        inicio, fim = bordas[i], bordas[i + 1]
+        xa, ya = xs[a], ys[a]
+        dx, dy = xa - medias_x[i + 1], medias_y[i + 1] - ya
+
+        if fim - inicio > BUCKET_VETORIZADO:
+            area = np.abs(dx * (y[inicio:fim] - ya) - (xa - x[inicio:fim]) * dy)
+            a = inicio + int(np.argmax(area))
+        else:
+            maior = -1.0
+
+            for j in range(inicio, fim):
+                area = abs(dx * (ys[j] - ya) - (xa - xs[j]) * dy)
+
+                if area > maior:
+                    maior, a = area, j
+
+        indices[i + 1] = a
+
+    return indices
+
+
+def minmax(x, y, n_pontos: int) -> np.ndarray:
+    """
+    Posições do mínimo e do máximo de cada um de `n_pontos // 2`
+    buckets (em ordem), mais o primeiro e o último ponto.
+    """
+
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+
+    if n_pontos >= n or n_pontos < 4:
+        return np.arange(n)
+
+    n_buckets = (n_pontos - 2) // 2
+    bucket = np.arange(n) * n_buckets // n
+
+    # Ordena por bucket e valor: o primeiro de cada bucket é o mínimo
+    # e o último, o máximo
+    ordem = np.lexsort((y, bucket))
+    inicios = np.flatnonzero(np.diff(bucket, prepend=-1))
+    fins = np.append(inicios[1:], n) - 1
+
+    return np.unique(np.concatenate([[0, n - 1], ordem[inicios], ordem[fins]]))
+
+
+# =====================================================
+# RECORTE + REDUÇÃO
+# =====================================================
+
+def reduzir_serie(df: pd.DataFrame,
+                  coluna: str,
+                  n_pontos: int = 1000,
+                  inicio=None,
+                  fim=None,
+                  metodo: str = "lttb",
+                  coluna_x: str = "DATA") -> pd.DataFrame:
+    """
+    Recorta `df` ao período [inicio, fim] e reduz a coluna `coluna`
+    a no máximo `n_pontos` pontos.
+
+    Retorna DataFrame com `coluna_x` e `coluna` (sem NaN).
+    """
+
+    if metodo not in METODOS:
+        raise ValueError(f"Método deve ser um de {METODOS}")
+
+    df = df[[coluna_x, coluna]].dropna()
+
+    if inicio is not None:
+        df = df[df[coluna_x] >= pd.Timestamp(inicio)]
+
+    if fim is not None:
+        df = df[df[coluna_x] <= pd.Timestamp(fim)]
+
+    funcao = lttb if metodo == "lttb" else minmax
+    indices = funcao(df[coluna_x].to_numpy(), df[coluna].to_numpy(), n_pontos)
+
+    return df.iloc[indices].reset_index(drop=True)
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pelas previsões sob demanda do dashboard.
+
+Inclui:
+- Previsão de um modelo com horizonte, divisão treino/teste e ordem
+  do SARIMA escolhidos na hora (SARIMA, Holt-Winters ou LSTM do
+  registro, sem retreino)
+- Serviço com uma thread de fundo: o pedido retorna na hora e o
+  resultado fica memorizado por parâmetros (pedidos repetidos não
+  recalculam; só os MAX_PEDIDOS mais recentes ficam em memória)
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .forecasting import modelo_sarima, modelo_holt_winters, prever_futuro_lstm
+from .registry import DIRETORIO_PADRAO, carregar_modelo
+
+
+MODELOS_CLASSICOS = ("SARIMA", "Holt-Winters")
+
+# Pedidos memorizados pelo serviço (os usados há mais tempo saem primeiro)
+MAX_PEDIDOS = 64
+
+
+# =====================================================
+# PREVISÃO SOB DEMANDA
+# =====================================================
+
+def prever_sob_demanda(serie: pd.Series,
+                       modelo: str,
+                       horizonte: int = 12,
+                       proporcao_treino: float = 0.8,
+                       order=(1, 1, 1),
+                       seasonal_order=(1, 1, 1, 12),
+                       cache=None,
+                       registro_dir: str = DIRETORIO_PADRAO) -> pd.DataFrame:
+    """
+    Prevê `horizonte` meses a partir do fim do treino
+    (serie[:proporcao_treino]).
+
+    `modelo` é 'SARIMA', 'Holt-Winters' ou o nome de uma LSTM do
+    registro. O período previsto pode passar do fim da série (REAL
+    fica NaN).
+
+    Retorna DataFrame com DATA, REAL, PREVISAO.
+    """
+
+    train = serie.iloc[:int(len(serie) * proporcao_treino)]
+
+    datas = pd.date_range(
+        train.index[-1] + pd.offsets.MonthBegin(),
+        periods=horizonte,
+        freq="MS"
+    )
+    test = serie.reindex(datas)
+
+    if modelo == "SARIMA":
+        previsao = modelo_sarima(
+            train, test, order=tuple(order), seasonal_order=tuple(seasonal_order), cache=cache
+        ).to_numpy()
+
+    elif modelo == "Holt-Winters":
+        previsao = modelo_holt_winters(train, test, cache=cache).to_numpy()
+
+    else:
+        registro = carregar_modelo(modelo, diretorio=registro_dir)
+        previsao = prever_futuro_lstm({modelo: registro}, train, horizonte)["PREVISAO"].to_numpy()
+
+    return pd.DataFrame({
+        "DATA": datas,
+        "REAL": test.to_numpy(dtype=np.float64),
+        "PREVISAO": previsao
+    })
+
+
+# =====================================================
+# SERVIÇO EM THREAD DE FUNDO
+# =====================================================
+
+class ServicoPrevisao:
+    """
+    Executa `prever_sob_demanda` em uma thread de fundo.
+
+    `solicitar` devolve na hora um Future; pedidos com os mesmos
+    parâmetros reutilizam o mesmo Future (em andamento ou concluído).
+    O resultado do Future é (DataFrame, segundos de cálculo).
+
+    Guarda no máximo `max_pedidos` Futures: além disso, os concluídos
+    usados há mais tempo são descartados (os em andamento ficam).
+
+    Uma única thread: os ajustes não disputam a CPU com o dashboard
+    e as redes do registro são usadas por uma thread só.
+    """
+
+    def __init__(self, serie: pd.Series, cache=None,
+                 registro_dir: str = DIRETORIO_PADRAO, max_workers: int = 1,
+                 max_pedidos: int = MAX_PEDIDOS):
+
+        self.serie = serie
+        self.cache = cache
+        self.registro_dir = registro_dir
+        self.max_pedidos = max_pedidos
+
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="previsao")
+        self._pedidos = OrderedDict()
+        self._trava = threading.Lock()
+
+    @staticmethod
+    def chave(modelo, horizonte=12, proporcao_treino=0.8,
+              order=(1, 1, 1), seasonal_order=(1, 1, 1, 12)) -> tuple:
+        """
+        Chave do pedido: a ordem só entra para o SARIMA.
+        """
+
+        if modelo != "SARIMA":
+            order = seasonal_order = None
+        else:
+            order, seasonal_order = tuple(order), tuple(seasonal_order)
+
+        return (modelo, int(horizonte), round(float(proporcao_treino), 4), order, seasonal_order)
+
+    def _calcular(self, modelo, horizonte, proporcao_treino, order, seasonal_order):
+
+        inicio = time.perf_counter()
+
+        df = prever_sob_demanda(
+            self.serie,
+            modelo,
+            horizonte=horizonte,
+            proporcao_treino=proporcao_treino,
+            order=order or (1, 1, 1),
+            seasonal_order=seasonal_order or (1, 1, 1, 12),
+            cache=self.cache,
+            registro_dir=self.registro_dir
+        )
+
+        return df, time.perf_counter() - inicio
+
+    def solicitar(self, modelo, horizonte=12, proporcao_treino=0.8,
+                  order=(1, 1, 1), seasonal_order=(1, 1, 1, 12)):
+        """
+        Agenda (ou reaproveita) a previsão e retorna o Future.
+        Pedidos que falharam são reagendados.
+        """
+
+        chave = self.chave(modelo, horizonte, proporcao_treino, order, seasonal_order)
+
+        with self._trava:
+            futuro = self._pedidos.get(chave)
+
+            if futuro is None or (futuro.done() and futuro.exception() is not None):
+                futuro = self._executor.submit(self._calcular, *chave)
+                self._pedidos[chave] = futuro
+
+            self._pedidos.move_to_end(chave)
+            self._descartar_excedentes()
+
+        return futuro
+
+    def _descartar_excedentes(self):
+        """
+        Remove os pedidos concluídos usados há mais tempo além de
+        `max_pedidos` (chamado com a trava).
+        """
+
+        excedente = len(self._pedidos) - self.max_pedidos
+
+        if excedente <= 0:
+            return
+
+        concluidos = [chave for chave, futuro in self._pedidos.items() if futuro.done()]
+
+        for chave in concluidos[:excedente]:
+            del self._pedidos[chave]
+
+    def em_andamento(self) -> int:
+        """
+        Número de pedidos ainda não concluídos.
+        """
+
+        with self._trava:
+            return sum(not futuro.done() for futuro in self._pedidos.values())
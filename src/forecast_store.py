@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pelo repositório consolidado de previsões,
+lido pelo dashboard.
+
+O repositório é um diretório com:
+- previsoes.npy → array estruturado (DATA, REAL, PREVISAO) de todos
+                  os modelos, ordenado por MODELO, CHAVE e DATA
+- indice.json   → para cada (MODELO, CHAVE): posições inicial e final
+                  no array e período coberto
+
+O array é aberto com memory-map: a previsão de um modelo é uma fatia
+contígua, lida do disco sem parsing de CSV/Parquet.
+"""
+
+import os
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+
+
+DIRETORIO_PADRAO = "Data/processed/repositorio_previsoes"
+
+# Série histórica completa, guardada junto das previsões
+MODELO_HISTORICO = "__historico__"
+
+DTYPE = np.dtype([
+    ("DATA", "M8[ns]"),
+    ("REAL", "f8"),
+    ("PREVISAO", "f8")
+])
+
+
+# =====================================================
+# GRAVAÇÃO
+# =====================================================
+
+def salvar_repositorio_previsoes(df_previsoes: pd.DataFrame,
+                                 diretorio: str = DIRETORIO_PADRAO,
+                                 serie: pd.Series = None) -> str:
+    """
+    Grava as previsões (MODELO, DATA, REAL, PREVISAO e, no painel,
+    CHAVE) de todos os modelos em um único repositório.
+
+    `serie` (opcional) é a série histórica completa, exibida antes
+    do período de teste.
+
+    A gravação é feita em um diretório temporário e só então
+    substitui o repositório anterior.
+    """
+
+    df = df_previsoes[
+        [c for c in ("MODELO", "CHAVE", "DATA", "REAL", "PREVISAO") if c in df_previsoes.columns]
+    ].copy()
+
+    if "CHAVE" not in df.columns:
+        df["CHAVE"] = ""
+
+    if serie is not None:
+        df = pd.concat([df, pd.DataFrame({
+            "MODELO": MODELO_HISTORICO,
+            "CHAVE": "",
+            "DATA": serie.index,
+            "REAL": serie.to_numpy(dtype=np.float64),
+            "PREVISAO": np.nan
+        })], ignore_index=True)
+
+    df["MODELO"] = df["MODELO"].astype(str)
+    df["CHAVE"] = df["CHAVE"].astype(str)
+    df["DATA"] = pd.to_datetime(df["DATA"])
+    df = df.sort_values(["MODELO", "CHAVE", "DATA"], ignore_index=True, kind="stable")
+
+    registros = np.empty(len(df), dtype=DTYPE)
+    registros["DATA"] = df["DATA"].to_numpy(dtype="datetime64[ns]")
+    registros["REAL"] = df["REAL"].to_numpy(dtype=np.float64)
+    registros["PREVISAO"] = df["PREVISAO"].to_numpy(dtype=np.float64)
+
+    # Linhas ordenadas: cada (MODELO, CHAVE) é um trecho contíguo
+    grupos = df.reset_index().groupby(["MODELO", "CHAVE"], sort=False).agg(
+        INICIO=("index", "min"),
+        FIM=("index", "max"),
+        DATA_INICIO=("DATA", "min"),
+        DATA_FIM=("DATA", "max")
+    ).reset_index()
+
+    # Por coluna: leitura rápida do índice na abertura
+    indice = {
+        "MODELO": grupos["MODELO"].tolist(),
+        "CHAVE": grupos["CHAVE"].tolist(),
+        "INICIO": grupos["INICIO"].astype(int).tolist(),
+        "FIM": (grupos["FIM"] + 1).astype(int).tolist(),
+        "DATA_INICIO": grupos["DATA_INICIO"].dt.strftime("%Y-%m-%d").tolist(),
+        "DATA_FIM": grupos["DATA_FIM"].dt.strftime("%Y-%m-%d").tolist()
+    }
+
+    diretorio = diretorio.rstrip(os.sep)
+    temporario = f"{diretorio}.{os.getpid()}.tmp"
+
+    shutil.rmtree(temporario, ignore_errors=True)
+    os.makedirs(temporario)
+
+    np.save(os.path.join(temporario, "previsoes.npy"), registros)
+
+    with open(os.path.join(temporario, "indice.json"), "w", encoding="utf-8") as arquivo:
+        json.dump(indice, arquivo, ensure_ascii=False)
+
+    shutil.rmtree(diretorio, ignore_errors=True)
+    os.replace(temporario, diretorio)
+
+    return diretorio
+
+
+# =====================================================
+# LEITURA
+# =====================================================
+
+class RepositorioPrevisoes:
+    """
+    Leitura do repositório consolidado: só o índice é lido na
+    abertura; as previsões são fatias do array em memory-map.
+    """
+
+    def __init__(self, diretorio: str = DIRETORIO_PADRAO):
+
+        path_indice = os.path.join(diretorio, "indice.json")
+
+        if not os.path.exists(path_indice):
+            raise FileNotFoundError(f"Repositório de previsões não encontrado: {diretorio}")
+
+        with open(path_indice, encoding="utf-8") as arquivo:
+            self._indice = json.load(arquivo)
+
+        self.diretorio = diretorio
+        self._registros = np.load(os.path.join(diretorio, "previsoes.npy"), mmap_mode="r")
+        self._posicoes = dict(zip(
+            zip(self._indice["MODELO"], self._indice["CHAVE"]),
+            zip(self._indice["INICIO"], self._indice["FIM"])
+        ))
+
+        self._chaves = {}
+
+        for modelo, chave in self._posicoes:
+            self._chaves.setdefault(modelo, []).append(chave)
+
+        self.modelos = [m for m in self._chaves if m != MODELO_HISTORICO]
+
+    @property
+    def indice(self) -> pd.DataFrame:
+        """
+        MODELO, CHAVE, INICIO, FIM, DATA_INICIO e DATA_FIM de cada trecho.
+        """
+
+        return pd.DataFrame(self._indice)
+
+    def chaves(self, modelo: str) -> list:
+        return list(self._chaves.get(modelo, []))
+
+    def _fatia(self, modelo: str, chave: str) -> np.ndarray:
+
+        if (modelo, chave) not in self._posicoes:
+            raise KeyError(f"Sem previsões para {modelo!r} (chave {chave!r}).")
+
+        inicio, fim = self._posicoes[(modelo, chave)]
+
+        return self._registros[inicio:fim]
+
+    def previsao(self, modelo: str, chave: str = "") -> pd.DataFrame:
+        """
+        Previsões de um modelo (e chave, no painel): DATA, REAL, PREVISAO.
+        """
+
+        fatia = self._fatia(modelo, chave)
+
+        return pd.DataFrame({
+            "DATA": fatia["DATA"],
+            "REAL": fatia["REAL"],
+            "PREVISAO": fatia["PREVISAO"]
+        })
+
+    def serie(self) -> pd.DataFrame:
+        """
+        Série histórica completa (DATA, REAL), ou None se não foi gravada.
+        """
+
+        if (MODELO_HISTORICO, "") not in self._posicoes:
+            return None
+
+        fatia = self._fatia(MODELO_HISTORICO, "")
+
+        return pd.DataFrame({"DATA": fatia["DATA"], "REAL": fatia["REAL"]})
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """
+        Todas as previsões no formato longo (sem a série histórica),
+        no mesmo formato aceito por `salvar_repositorio_previsoes`.
+        """
+
+        partes = [
+            self.previsao(modelo, chave).assign(MODELO=modelo, CHAVE=chave)
+            for modelo, chave in self._posicoes
+            if modelo != MODELO_HISTORICO
+        ]
+
+        df = pd.concat(partes, ignore_index=True)
+
+        if (df["CHAVE"] == "").all():
+            df = df.drop(columns="CHAVE")
+
+        return df
@@ -6,43 +6,133 @@ Módulo responsável pelos modelos de previsão:
 - Holt-Winters
 - LSTM (Adam)
 - LSTM (AdamW)
+- Pipeline tf.data para o treino das LSTMs
+- Inferência LSTM compilada (tf.function / XLA) para baixa latência
+- Previsão LSTM recursiva multi-passo (além do período de teste)
 
 Modelos organizados para uso modular e produção.
 """
 
+import os
+import math
+import pickle
+import shutil
+import weakref
+
 import numpy as np
 import pandas as pd
 
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-from statsmodels.tsa.holtwinters import ExponentialSmoothing
+from .preprocessing import tratar_nulos
 
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense, Input
-from tensorflow.keras.optimizers import Adam
-from tensorflow.keras.optimizers import AdamW
+# TensorFlow e statsmodels são importados dentro das funções que os
+# usam: `import src` (ex.: só para carregar dados ou calcular
+# métricas) não paga o carregamento dessas bibliotecas.
 
 
 # =====================================================
 # SARIMA
 # =====================================================
 
+def _atualizar_sarima(ajuste_anterior, train, modo="filtrar"):
+    """
+    Acrescenta ao ajuste anterior as observações de `train`
+    posteriores a ele (ou, se `train` começar em outro mês, reaplica
+    o ajuste à nova janela).
+
+    - 'filtrar': mantém os parâmetros e só roda o filtro de Kalman
+      sobre a série completa (sem otimização)
+    - 'reajustar': roda a MLE partindo dos parâmetros anteriores
+    """
+
+    if modo not in ("filtrar", "reajustar"):
+        raise ValueError("Modo incremental deve ser 'filtrar' ou 'reajustar'")
+
+    inicio_anterior = ajuste_anterior.data.row_labels
+
+    # Janela deslizante: a série não começa mais no mesmo mês,
+    # então o ajuste é reaplicado à nova janela (mesmo ponto de partida)
+    if (inicio_anterior is not None and len(train)
+            and train.index[0] != inicio_anterior[0]):
+
+        if modo == "filtrar":
+            return ajuste_anterior.apply(train, refit=False)
+
+        return ajuste_anterior.apply(train, refit=True, fit_kwargs={"disp": False})
+
+    novas = train.iloc[ajuste_anterior.nobs:]
+
+    if novas.empty:
+        return ajuste_anterior
+
+    if modo == "filtrar":
+        return ajuste_anterior.append(novas, refit=False)
+
+    return ajuste_anterior.append(novas, refit=True, fit_kwargs={"disp": False})
+
+
 def modelo_sarima(train, test,
                   order=(1, 1, 1),
-                  seasonal_order=(1, 1, 1, 12)):
+                  seasonal_order=(1, 1, 1, 12),
+                  cache=None,
+                  ajuste_anterior=None,
+                  modo_incremental="filtrar",
+                  retornar_ajuste=False):
+    """
+    Ajusta SARIMA e prevê o período de teste.
 
-    model = SARIMAX(
-        train,
-        order=order,
-        seasonal_order=seasonal_order,
-        enforce_stationarity=False,
-        enforce_invertibility=False
-    )
+    Com `cache` (CacheAjustes), reutiliza a previsão de um ajuste
+    anterior com os mesmos dados e parâmetros, sem rodar o otimizador.
+
+    Modo incremental: com `ajuste_anterior` (resultado de uma chamada
+    com retornar_ajuste=True), `train` é o histórico completo e apenas
+    os meses novos são incorporados (ver `_atualizar_sarima`).
+
+    Com retornar_ajuste=True retorna (forecast, ajuste).
+    """
 
-    fit = model.fit(disp=False)
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    chave = None
+    entrada = None
+
+    if cache is not None and ajuste_anterior is None:
+        chave = cache.chave(
+            "SARIMA", train, len(test),
+            {"order": order, "seasonal_order": seasonal_order}
+        )
+        entrada = cache.obter(chave)
+
+        if entrada is not None and not retornar_ajuste:
+            return pd.Series(entrada["forecast"], index=test.index)
+
+    if ajuste_anterior is not None:
+        fit = _atualizar_sarima(ajuste_anterior, train, modo_incremental)
+
+    else:
+        model = SARIMAX(
+            train,
+            order=order,
+            seasonal_order=seasonal_order,
+            enforce_stationarity=False,
+            enforce_invertibility=False
+        )
+
+        if entrada is not None:
+            # Reconstrói o ajuste a partir dos parâmetros (só filtro)
+            params = [float(entrada["params"][nome]) for nome in model.param_names]
+            fit = model.filter(params)
+        else:
+            fit = model.fit(disp=False)
 
     forecast = fit.forecast(steps=len(test))
     forecast = pd.Series(forecast.values, index=test.index)
 
+    if chave is not None and entrada is None:
+        cache.guardar(chave, forecast.values, fit.params.to_dict())
+
+    if retornar_ajuste:
+        return forecast, fit
+
     return forecast
 
 
@@ -53,7 +143,27 @@ def modelo_sarima(train, test,
 def modelo_holt_winters(train, test,
                         trend='add',
                         seasonal='mul',
-                        seasonal_periods=12):
+                        seasonal_periods=12,
+                        cache=None):
+    """
+    Ajusta Holt-Winters e prevê o período de teste.
+
+    Com `cache` (CacheAjustes), reutiliza a previsão de um ajuste
+    anterior com os mesmos dados e parâmetros, sem rodar o otimizador.
+    """
+
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+    if cache is not None:
+        chave = cache.chave(
+            "Holt-Winters", train, len(test),
+            {"trend": trend, "seasonal": seasonal,
+             "seasonal_periods": seasonal_periods}
+        )
+        entrada = cache.obter(chave)
+
+        if entrada is not None:
+            return pd.Series(entrada["forecast"], index=test.index)
 
     model = ExponentialSmoothing(
         train,
@@ -67,6 +177,13 @@ def modelo_holt_winters(train, test,
     forecast = fit.forecast(steps=len(test))
     forecast = pd.Series(forecast.values, index=test.index)
 
+    if cache is not None:
+        params = {
+            nome: valor for nome, valor in fit.params.items()
+            if valor is not None
+        }
+        cache.guardar(chave, forecast.values, params)
+
     return forecast
 
 
@@ -81,6 +198,10 @@ def construir_lstm(input_shape,
                    learning_rate=0.001,
                    weight_decay=0.0):
 
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import LSTM, Dense, Input
+    from tensorflow.keras.optimizers import Adam, AdamW
+
     model = Sequential()
     model.add(Input(shape=input_shape))
 
@@ -118,6 +239,63 @@ def construir_lstm(input_shape,
 # TREINAMENTO LSTM
 # =====================================================
 
+def _early_stopping_retomavel(path, n_estados=2, **kwargs):
+    """
+    EarlyStopping que grava seu estado a cada época em `path` (junto
+    do checkpoint do BackupAndRestore) e, ao retomar, recupera o
+    estado da época restaurada. Guarda os `n_estados` mais recentes,
+    pois o checkpoint do modelo pode ser gravado a cada N épocas.
+
+    A época restaurada é a primeira recebida em `on_epoch_begin`
+    (o BackupAndRestore roda antes e o fit começa nela).
+    """
+
+    from tensorflow.keras.callbacks import EarlyStopping
+
+    class EarlyStoppingRetomavel(EarlyStopping):
+
+        def on_train_begin(self, logs=None):
+            super().on_train_begin(logs)
+            self._estados = None
+
+        def on_epoch_begin(self, epoch, logs=None):
+            super().on_epoch_begin(epoch, logs)
+
+            if self._estados is not None:
+                return
+
+            self._estados = {}
+
+            # Primeira época do fit: épocas concluídas no checkpoint (0 = do início)
+            if not epoch or not os.path.exists(path):
+                return
+
+            with open(path, "rb") as f:
+                self._estados = pickle.load(f)
+
+            anteriores = [e for e in self._estados if e <= epoch]
+
+            if anteriores:
+                self.wait, self.best, self.best_epoch, self.best_weights = (
+                    self._estados[max(anteriores)]
+                )
+
+        def on_epoch_end(self, epoch, logs=None):
+            super().on_epoch_end(epoch, logs)
+
+            self._estados[epoch + 1] = (self.wait, self.best, self.best_epoch, self.best_weights)
+            for antiga in sorted(self._estados)[:-n_estados]:
+                del self._estados[antiga]
+
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporario = f"{path}.tmp"
+            with open(temporario, "wb") as f:
+                pickle.dump(self._estados, f)
+            os.replace(temporario, path)
+
+    return EarlyStoppingRetomavel(**kwargs)
+
+
 def treinar_lstm(model,
                  X_train,
                  y_train,
@@ -125,7 +303,78 @@ def treinar_lstm(model,
                  y_test,
                  epochs=60,
                  batch_size=32,
-                 verbose=0):
+                 verbose=0,
+                 validacao_a_cada=1,
+                 paciencia=None,
+                 dir_checkpoint=None,
+                 checkpoint_a_cada=1,
+                 retomar=True):
+    """
+    Treina a LSTM.
+
+    Aceita arrays NumPy (X_train, y_train, X_test, y_test) ou
+    datasets de `criar_dataset_lstm` (X_train=ds_treino,
+    X_test=ds_validacao, y_train=y_test=None; o batch já vem do dataset).
+
+    - `validacao_a_cada`: avalia a validação só a cada N épocas
+    - `paciencia`: early stopping no val_loss após N épocas sem
+      melhora, restaurando os melhores pesos. Com `validacao_a_cada`
+      > 1 só as épocas validadas contam: a paciência vira
+      ceil(N / validacao_a_cada) validações (≈ N épocas)
+    - `dir_checkpoint`: grava o estado do treino a cada
+      `checkpoint_a_cada` épocas; se o treino for interrompido, a
+      próxima chamada com `retomar=True` continua da última época
+      gravada, com o estado do early stopping (melhor val_loss,
+      épocas sem melhora e melhores pesos) dessa mesma época. O
+      checkpoint é apagado ao final do treino.
+    """
+
+    import tensorflow as tf
+    from tensorflow.keras.callbacks import EarlyStopping, BackupAndRestore
+
+    callbacks = []
+
+    if dir_checkpoint is not None:
+        if not retomar:
+            shutil.rmtree(dir_checkpoint, ignore_errors=True)
+
+        if isinstance(X_train, tf.data.Dataset):
+            passos_por_epoca = int(X_train.cardinality())
+        else:
+            passos_por_epoca = math.ceil(len(X_train) / batch_size)
+
+        callbacks.append(BackupAndRestore(
+            dir_checkpoint,
+            save_freq="epoch" if checkpoint_a_cada == 1
+            else checkpoint_a_cada * passos_por_epoca
+        ))
+
+    # Depois do BackupAndRestore: ao retomar, a época restaurada já é conhecida
+    if paciencia is not None:
+        parametros_parada = {
+            "monitor": "val_loss",
+            "patience": max(1, math.ceil(paciencia / validacao_a_cada)),
+            "restore_best_weights": True
+        }
+
+        if dir_checkpoint is None:
+            callbacks.append(EarlyStopping(**parametros_parada))
+        else:
+            callbacks.append(_early_stopping_retomavel(
+                os.path.join(dir_checkpoint, "early_stopping.pkl"),
+                n_estados=checkpoint_a_cada + 1,
+                **parametros_parada
+            ))
+
+    if isinstance(X_train, tf.data.Dataset):
+        return model.fit(
+            X_train,
+            epochs=epochs,
+            validation_data=X_test,
+            validation_freq=validacao_a_cada,
+            callbacks=callbacks,
+            verbose=verbose
+        )
 
     history = model.fit(
         X_train,
@@ -133,12 +382,152 @@ def treinar_lstm(model,
         epochs=epochs,
         batch_size=batch_size,
         validation_data=(X_test, y_test),
+        validation_freq=validacao_a_cada,
+        callbacks=callbacks,
         verbose=verbose
     )
 
     return history
 
 
+# =====================================================
+# PIPELINE tf.data
+# =====================================================
+
+def criar_dataset_lstm(serie_escalada,
+                       seq_length,
+                       batch_size=32,
+                       proporcao_treino=0.8,
+                       batch_size_validacao=256,
+                       seed=42):
+    """
+    Cria datasets tf.data de treino e validação a partir da série
+    escalada (T,) ou (T, 1), gerando cada janela sob demanda: a matriz
+    X completa nunca é montada em NumPy.
+
+    Mesmo split de `split_temporal`. O treino é embaralhado a cada
+    época (como `model.fit` com arrays); ambos ficam em cache e com
+    prefetch.
+
+    Retorna (ds_treino, ds_validacao).
+    """
+
+    import tensorflow as tf
+
+    serie = tf.constant(
+        np.asarray(serie_escalada, dtype=np.float32).reshape(-1, 1)
+    )
+
+    n_janelas = int(serie.shape[0]) - seq_length
+
+    if n_janelas <= 0:
+        raise ValueError("Série curta demais para seq_length.")
+
+    split_index = int(n_janelas * proporcao_treino)
+
+    def janela(i):
+        return serie[i:i + seq_length], serie[i + seq_length]
+
+    def indices(inicio, fim):
+        return (
+            tf.data.Dataset.range(inicio, fim)
+            .map(janela, num_parallel_calls=tf.data.AUTOTUNE)
+            .cache()
+        )
+
+    ds_treino = (
+        indices(0, split_index)
+        .shuffle(split_index, seed=seed, reshuffle_each_iteration=True)
+        .batch(batch_size)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+
+    ds_validacao = (
+        indices(split_index, n_janelas)
+        .batch(batch_size_validacao)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+
+    return ds_treino, ds_validacao
+
+
+# =====================================================
+# INFERÊNCIA RÁPIDA (tf.function)
+# =====================================================
+
+# Função compilada por rede. Chaves fracas e closures com weakref:
+# a entrada some quando a rede é descartada (ex.: removida do LRU do
+# registro), sem manter redes e grafos vivos no processo
+_inferencias = weakref.WeakKeyDictionary()
+
+
+def _funcao_inferencia(model):
+    """
+    Compila o forward pass da rede em uma tf.function com assinatura
+    fixa (batch variável), com XLA (jit_compile) quando suportado.
+    Reutilizada enquanto a mesma rede for passada.
+    """
+
+    import tensorflow as tf
+
+    if model in _inferencias:
+        return _inferencias[model]
+
+    rede = weakref.ref(model)
+    assinatura = [tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32)]
+    exemplo = tf.zeros((1,) + tuple(model.input_shape[1:]), tf.float32)
+
+    for jit in (True, False):
+        funcao = tf.function(
+            lambda x: rede()(x, training=False),
+            input_signature=assinatura,
+            jit_compile=jit
+        )
+
+        try:
+            funcao(exemplo)
+            # Função concreta: dispensa a checagem de assinatura a cada chamada
+            funcao = funcao.get_concrete_function()
+            break
+        except tf.errors.OpError as erro:
+            # Camada sem suporte no XLA: tenta o grafo comum
+            falha = erro
+    else:
+        raise falha
+
+    _inferencias[model] = funcao
+
+    return funcao
+
+
+def inferir_rapido(model, X, scaler=None) -> np.ndarray:
+    """
+    Previsão sem o laço do `model.predict` (adaptador de dados,
+    callbacks): chama diretamente a função compilada da rede.
+
+    Com `scaler` (MinMaxScaler), desnormaliza em NumPy.
+    """
+
+    import tensorflow as tf
+
+    pred = _funcao_inferencia(model)(
+        tf.convert_to_tensor(np.asarray(X, dtype=np.float32))
+    ).numpy()
+
+    if scaler is not None:
+        pred = _desnormalizar(pred, scaler)
+
+    return pred
+
+
+def _desnormalizar(valores, scaler) -> np.ndarray:
+    """
+    Inversa do MinMaxScaler: (x - min_) / scale_.
+    """
+
+    return (np.asarray(valores, dtype=np.float64) - scaler.min_) / scaler.scale_
+
+
 # =====================================================
 # PREVISÃO LSTM
 # =====================================================
@@ -149,21 +538,27 @@ def prever_lstm(model,
                 y_test,
                 serie_index,
                 seq_length,
-                proporcao_treino=0.8):
+                proporcao_treino=0.8,
+                rapido=False):
     """
     Gera previsões do modelo LSTM e retorna DataFrame com DATA, REAL, PREVISAO
     
     ✅ CORREÇÃO: Agora retorna DataFrame sem índice, com coluna DATA explícita
+
+    Com rapido=True usa `inferir_rapido` em vez de `model.predict`.
     """
 
-    # Fazer previsões
-    pred = model.predict(X_test, verbose=0)
+    # Fazer previsões e desnormalizar
+    if rapido:
+        pred_real = inferir_rapido(model, X_test, scaler)
+        y_test_real = _desnormalizar(np.reshape(y_test, (-1, 1)), scaler)
+    else:
+        pred = model.predict(X_test, verbose=0)
 
-    # Desnormalizar
-    pred_real = scaler.inverse_transform(pred)
-    y_test_real = scaler.inverse_transform(
-        y_test.reshape(-1, 1)
-    )
+        pred_real = scaler.inverse_transform(pred)
+        y_test_real = scaler.inverse_transform(
+            y_test.reshape(-1, 1)
+        )
 
     # ✅ Recriar índice correto
     total_obs = len(serie_index)
@@ -181,4 +576,162 @@ def prever_lstm(model,
     })
 
     # ✅ NÃO USAR set_index - deixar DATA como coluna
-    return df_resultado
\ No newline at end of file
+    return df_resultado
+
+
+# =====================================================
+# PREVISÃO LSTM MULTI-PASSO (RECURSIVA)
+# =====================================================
+
+# Funções compiladas por conjunto de redes: ids → (weakrefs das redes,
+# tf.function). A entrada é removida quando qualquer uma das redes é
+# coletada (novas redes a cada bloco do backtest ou pedido do dashboard)
+_recursivos = {}
+
+
+def _funcao_recursiva(modelos: dict):
+    """
+    Compila (tf.function) o laço recursivo para o conjunto de redes.
+    Reutilizada enquanto as mesmas redes forem passadas.
+    """
+
+    import tensorflow as tf
+
+    redes = tuple(modelos.values())
+    chave = tuple(id(model) for model in redes)
+
+    if chave in _recursivos and all(
+        ref() is model for ref, model in zip(_recursivos[chave][0], redes)
+    ):
+        return _recursivos[chave][1]
+
+    referencias = tuple(weakref.ref(model) for model in redes)
+
+    @tf.function(reduce_retracing=True)
+    def recursivo(atuais, horizonte):
+        n = len(atuais)
+        redes = [ref() for ref in referencias]
+
+        def passo(h, atuais, passos):
+            # Todas as redes no mesmo passo do grafo (uma chamada por rede)
+            saidas = [
+                model(atual, training=False)
+                for model, atual in zip(redes, atuais)
+            ]
+
+            return (
+                h + 1,
+                tuple(
+                    tf.concat([atual[:, 1:, :], saida[:, None, :]], axis=1)
+                    for atual, saida in zip(atuais, saidas)
+                ),
+                tuple(
+                    ta.write(h, saida[:, 0])
+                    for ta, saida in zip(passos, saidas)
+                )
+            )
+
+        # tf.while_loop: o laço não é desenrolado por passo no grafo
+        _, _, passos = tf.while_loop(
+            lambda h, *_: h < horizonte,
+            passo,
+            (
+                tf.constant(0),
+                tuple(atuais),
+                tuple(tf.TensorArray(tf.float32, size=horizonte) for _ in range(n))
+            )
+        )
+
+        return [tf.transpose(ta.stack()) for ta in passos]
+
+    _recursivos[chave] = (referencias, recursivo)
+
+    for model in redes:
+        weakref.finalize(model, _recursivos.pop, chave, None)
+
+    return recursivo
+
+
+def prever_recursivo(modelos, janelas, horizonte=12):
+    """
+    Previsão recursiva de `horizonte` passos: cada previsão entra
+    no fim da janela para prever o passo seguinte.
+
+    - modelos: rede Keras ou dict nome → rede
+    - janelas: últimas janelas escaladas (S, seq_length, 1) — uma por
+      série — ou dict nome → janelas (escala de cada modelo)
+
+    Cada passo avalia todas as séries de uma vez com
+    `model(x, training=False)`, para todas as redes, dentro de um único
+    grafo compilado e reutilizado entre chamadas.
+
+    Retorna array (S, horizonte) escalado, ou dict nome → array.
+    """
+
+    import tensorflow as tf
+
+    unico = not isinstance(modelos, dict)
+
+    if unico:
+        modelos, janelas = {"modelo": modelos}, {"modelo": janelas}
+
+    atuais = [
+        tf.convert_to_tensor(np.asarray(janelas[nome], dtype=np.float32))
+        for nome in modelos
+    ]
+
+    saidas = _funcao_recursiva(modelos)(atuais, tf.constant(horizonte, dtype=tf.int32))
+
+    previsoes = {
+        nome: saida.numpy()
+        for nome, saida in zip(modelos, saidas)
+    }
+
+    return previsoes["modelo"] if unico else previsoes
+
+
+def prever_futuro_lstm(registros: dict, serie: pd.Series, horizonte=12) -> pd.DataFrame:
+    """
+    Prevê os `horizonte` meses seguintes ao fim da série com várias
+    LSTMs de uma vez.
+
+    `registros`: nome → dict com 'model', 'scaler' e 'seq_length'
+    (ex.: resultado de `carregar_modelo`).
+
+    Meses ausentes da série são interpolados (`tratar_nulos`), como
+    no treino.
+
+    Retorna DataFrame com MODELO, DATA, PREVISAO.
+    """
+
+    valores = tratar_nulos(serie).to_numpy(dtype=np.float64).reshape(-1, 1)
+
+    janelas = {
+        nome: registro["scaler"].transform(
+            valores[-registro["seq_length"]:]
+        )[None, ...]
+        for nome, registro in registros.items()
+    }
+
+    previsoes = prever_recursivo(
+        {nome: registro["model"] for nome, registro in registros.items()},
+        janelas,
+        horizonte
+    )
+
+    datas = pd.date_range(
+        serie.index[-1] + pd.offsets.MonthBegin(),
+        periods=horizonte,
+        freq="MS"
+    )
+
+    return pd.concat([
+        pd.DataFrame({
+            "MODELO": nome,
+            "DATA": datas,
+            "PREVISAO": registros[nome]["scaler"].inverse_transform(
+                previsao.reshape(-1, 1)
+            ).ravel()
+        })
+        for nome, previsao in previsoes.items()
+    ], ignore_index=True)
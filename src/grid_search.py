@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pela busca automática de ordens do SARIMA.
+
+Inclui:
+- Grade configurável (p,d,q)(P,D,Q,s)
+- Avaliação dos candidatos em paralelo (ProcessPoolExecutor)
+- Escolha de d por teste de raiz unitária (ADF): AIC/BIC só são
+  comparáveis entre modelos com a mesma diferenciação
+- Poda em duas etapas: ajuste rápido (poucas iterações) de todos os
+  candidatos e ajuste completo apenas dos que ficam dentro de uma
+  margem do melhor
+- Ranking por AIC, BIC ou erro em holdout, com tempo de ajuste
+"""
+
+import time
+import warnings
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from .parallel import executar_tarefas
+
+
+GRADE_PADRAO = {
+    "p": [0, 1, 2],
+    "d": [0, 1],
+    "q": [0, 1, 2],
+    "P": [0, 1],
+    "D": [1],
+    "Q": [0, 1],
+    "s": [12]
+}
+
+CRITERIOS = ("aic", "bic", "holdout")
+
+# Margens de poda após o ajuste rápido: diferença de AIC/BIC para o
+# melhor (acima de 10 o candidato praticamente não tem suporte) e
+# excesso relativo de MSE no holdout
+MARGEM_CRITERIO = 10.0
+MARGEM_HOLDOUT = 0.5
+
+
+# =====================================================
+# CANDIDATOS
+# =====================================================
+
+def gerar_candidatos(grade: dict = None) -> list:
+    """
+    Produto cartesiano da grade → lista de (order, seasonal_order).
+    """
+
+    grade = {**GRADE_PADRAO, **(grade or {})}
+
+    return [
+        ((p, d, q), (P, D, Q, s))
+        for p, d, q, P, D, Q, s in itertools.product(
+            grade["p"], grade["d"], grade["q"],
+            grade["P"], grade["D"], grade["Q"], grade["s"]
+        )
+    ]
+
+
+def escolher_diferenciacao(serie: pd.Series,
+                           valores_d=(0, 1),
+                           D: int = 1,
+                           s: int = 12,
+                           alfa: float = 0.05) -> int:
+    """
+    Menor d de `valores_d` para o qual o teste ADF rejeita raiz
+    unitária na série já diferenciada sazonalmente (D vezes, lag s).
+    Se nenhum rejeitar, retorna o maior d.
+    """
+
+    from statsmodels.tsa.stattools import adfuller
+
+    x = serie.dropna()
+    for _ in range(D):
+        x = x.diff(s).dropna()
+
+    valores_d = sorted(valores_d)
+
+    for d in valores_d[:-1]:
+        diferenciada = x
+        for _ in range(d):
+            diferenciada = diferenciada.diff().dropna()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", FutureWarning)
+            p_valor = adfuller(diferenciada, autolag="AIC")[1]
+
+        if p_valor < alfa:
+            return d
+
+    return valores_d[-1]
+
+
+# =====================================================
+# AVALIAÇÃO DE UM CANDIDATO (WORKER)
+# =====================================================
+
+def _avaliar_candidato(train, validacao, order, seasonal_order, maxiter,
+                       start_params=None):
+    """
+    Ajusta um candidato e retorna AIC, BIC, MSE no holdout, tempo
+    e parâmetros (usados como ponto de partida da etapa seguinte).
+    Falhas de ajuste recebem pontuação infinita.
+
+    cov_type='none': a matriz de covariância (Hessiana numérica)
+    não é necessária para ranquear e domina o custo de ajustes curtos.
+    """
+
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    inicio = time.perf_counter()
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+
+            fit = SARIMAX(
+                train,
+                order=order,
+                seasonal_order=seasonal_order,
+                enforce_stationarity=False,
+                enforce_invertibility=False
+            ).fit(
+                start_params=start_params,
+                disp=False,
+                maxiter=maxiter,
+                cov_type="none"
+            )
+
+        aic, bic = fit.aic, fit.bic
+        params = fit.params.to_numpy()
+
+        mse = np.nan
+        if validacao is not None and len(validacao):
+            previsao = fit.forecast(steps=len(validacao))
+            mse = float(np.mean((validacao.to_numpy() - previsao.to_numpy()) ** 2))
+
+    except (ValueError, np.linalg.LinAlgError):
+        aic = bic = mse = np.inf
+        params = None
+
+    return {
+        "order": order,
+        "seasonal_order": seasonal_order,
+        "AIC": aic if np.isfinite(aic) else np.inf,
+        "BIC": bic if np.isfinite(bic) else np.inf,
+        "MSE_holdout": mse,
+        "tempo": time.perf_counter() - inicio,
+        "params": params
+    }
+
+
+def _avaliar_lote(train, validacao, candidatos, maxiter):
+    """
+    `candidatos`: lista de (order, seasonal_order, start_params).
+    """
+
+    return [
+        _avaliar_candidato(train, validacao, order, seasonal_order, maxiter, start_params)
+        for order, seasonal_order, start_params in candidatos
+    ]
+
+
+def _avaliar_em_paralelo(train, validacao, candidatos, maxiter, n_workers):
+    """
+    Distribui os candidatos em lotes (um por worker × 2) e junta os resultados.
+    """
+
+    n_lotes = max(1, min(len(candidatos), 2 * (n_workers or 1)))
+    lotes = [candidatos[i::n_lotes] for i in range(n_lotes)]
+
+    tarefas = {
+        i: (_avaliar_lote, (train, validacao, lote, maxiter))
+        for i, lote in enumerate(lotes)
+    }
+
+    resultados = executar_tarefas(tarefas, n_workers=n_workers)
+
+    return pd.DataFrame([r for lote in resultados.values() for r in lote])
+
+
+# =====================================================
+# BUSCA COM PODA
+# =====================================================
+
+def buscar_ordem_sarima(serie: pd.Series,
+                        grade: dict = None,
+                        criterio: str = "aic",
+                        n_holdout: int = 12,
+                        n_workers: int = None,
+                        maxiter_rapido: int = 5,
+                        maxiter_completo: int = 50,
+                        margem: float = None):
+    """
+    Busca a melhor ordem SARIMA na grade.
+
+    1. Ajuste rápido (maxiter_rapido) de todos os candidatos
+    2. Poda dos dominados: segue só quem fica a até `margem` do
+       melhor (AIC/BIC: diferença absoluta, padrão MARGEM_CRITERIO;
+       holdout: excesso relativo de MSE, padrão MARGEM_HOLDOUT)
+    3. Ajuste completo dos sobreviventes e ranking final
+
+    Com AIC/BIC, d é fixado antes por `escolher_diferenciacao` (se a
+    grade tiver mais de um d) e a grade deve ter um único D: critérios
+    de informação não são comparáveis entre diferenciações.
+
+    Critério 'holdout': ajusta sem os últimos `n_holdout` meses e
+    ranqueia pelo MSE da previsão desses meses (comparável entre
+    diferenciações; a grade é usada inteira).
+
+    Retorna:
+    - (order, seasonal_order) vencedor
+    - DataFrame com todos os candidatos (pontuações, tempos, podado)
+    """
+
+    if criterio not in CRITERIOS:
+        raise ValueError(f"Critério deve ser um de {CRITERIOS}")
+
+    coluna = {"aic": "AIC", "bic": "BIC", "holdout": "MSE_holdout"}[criterio]
+
+    if criterio == "holdout":
+        train, validacao = serie.iloc[:-n_holdout], serie.iloc[-n_holdout:]
+    else:
+        train, validacao = serie, None
+
+    candidatos = [
+        (order, seasonal_order, None)
+        for order, seasonal_order in gerar_candidatos(grade)
+    ]
+
+    if criterio != "holdout":
+        valores_D = {seasonal_order[1] for _, seasonal_order, _ in candidatos}
+        valores_s = {seasonal_order[3] for _, seasonal_order, _ in candidatos}
+
+        if len(valores_D) > 1 or len(valores_s) > 1:
+            raise ValueError(
+                "Com AIC/BIC a grade deve ter um único D e s; use criterio='holdout' "
+                "para comparar diferenciações sazonais."
+            )
+
+        valores_d = {order[1] for order, _, _ in candidatos}
+
+        if len(valores_d) > 1:
+            d = escolher_diferenciacao(train, valores_d, valores_D.pop(), valores_s.pop())
+            candidatos = [c for c in candidatos if c[0][1] == d]
+
+    # 1️⃣ Ajuste rápido de todos os candidatos
+    rapido = _avaliar_em_paralelo(train, validacao, candidatos, maxiter_rapido, n_workers)
+    rapido = rapido.sort_values(coluna, ignore_index=True)
+
+    # 2️⃣ Poda dos dominados (margem em relação ao melhor)
+    melhor_rapido = rapido[coluna].min()
+
+    if criterio == "holdout":
+        margem = MARGEM_HOLDOUT if margem is None else margem
+        limite = melhor_rapido * (1 + margem)
+    else:
+        margem = MARGEM_CRITERIO if margem is None else margem
+        limite = melhor_rapido + margem
+
+    sobreviventes = rapido[np.isfinite(rapido[coluna]) & (rapido[coluna] <= limite)]
+
+    # 3️⃣ Ajuste completo dos sobreviventes (partindo do ajuste rápido)
+    completo = _avaliar_em_paralelo(
+        train,
+        validacao,
+        list(zip(
+            sobreviventes["order"],
+            sobreviventes["seasonal_order"],
+            sobreviventes["params"]
+        )),
+        maxiter_completo,
+        n_workers
+    )
+
+    resultado = rapido.drop(columns="params").rename(columns={"tempo": "tempo_rapido"})
+    resultado["tempo_completo"] = np.nan
+    resultado["podado"] = True
+
+    if not completo.empty:
+        chaves = list(zip(completo["order"], completo["seasonal_order"]))
+        indice = {chave: i for i, chave in enumerate(zip(resultado["order"], resultado["seasonal_order"]))}
+        linhas = [indice[chave] for chave in chaves]
+
+        for col in ("AIC", "BIC", "MSE_holdout"):
+            resultado.loc[linhas, col] = completo[col].to_numpy()
+
+        resultado.loc[linhas, "tempo_completo"] = completo["tempo"].to_numpy()
+        resultado.loc[linhas, "podado"] = False
+
+    resultado = resultado.sort_values(["podado", coluna], ignore_index=True)
+
+    if resultado.empty or not np.isfinite(resultado.loc[0, coluna]):
+        raise ValueError("Nenhum candidato SARIMA pôde ser ajustado.")
+
+    melhor = resultado.loc[0]
+
+    return (melhor["order"], melhor["seasonal_order"]), resultado
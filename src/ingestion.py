@@ -0,0 +1,551 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pela ingestão dos registros brutos do SIM/DATASUS.
+
+Inclui decodificadores vetorizados (NumPy) para:
+- Código de idade (IDADE → idade em anos)
+- Data do óbito (DTOBITO → datetime64[D])
+- Unidade da Federação a partir do prefixo de CODMUNOCOR
+- Indicadores de comorbidade por grupos de CID
+- Leitura em blocos (streaming) do CSV bruto ou dos .dbc/.dbf do
+  DATASUS com memória limitada
+- Vários arquivos (um por UF e ano) em paralelo (ProcessPoolExecutor)
+
+Substituem as funções linha a linha dos notebooks
+(`transformar_idade`, `separar_data`, `mapear_estado`, `verificar_cid`).
+"""
+
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from .dbc import ler_dbc_em_blocos
+from .parallel import executar_tarefas
+
+
+# =====================================================
+# TABELAS DE REFERÊNCIA
+# =====================================================
+
+UFS = {
+    "11": "Rondônia", "12": "Acre", "13": "Amazonas", "14": "Roraima",
+    "15": "Pará", "16": "Amapá", "17": "Tocantins", "21": "Maranhão",
+    "22": "Piauí", "23": "Ceará", "24": "Rio Grande do Norte",
+    "25": "Paraíba", "26": "Pernambuco", "27": "Alagoas",
+    "28": "Sergipe", "29": "Bahia", "31": "Minas Gerais",
+    "32": "Espírito Santo", "33": "Rio de Janeiro",
+    "35": "São Paulo", "41": "Paraná", "42": "Santa Catarina",
+    "43": "Rio Grande do Sul", "50": "Mato Grosso do Sul",
+    "51": "Mato Grosso", "52": "Goiás", "53": "Distrito Federal"
+}
+
+COLUNAS_BASE = [
+    'TIPOBITO', 'IDADE', 'SEXO',
+    'LINHAA', 'LINHAB', 'LINHAC', 'LINHAD', 'LINHAII',
+    'CAUSABAS', 'CAUSABAS_O',
+    'RACACOR', 'ESC', 'ATESTADO',
+    'DTOBITO', 'CODMUNRES', 'CODMUNOCOR'
+]
+
+# Tipos compactos para leitura do CSV bruto.
+# Os campos codificados (idade, data, município) têm poucos valores
+# distintos: como categoria, o parser só guarda códigos int8/int16 e
+# os decodificadores trabalham apenas sobre as categorias.
+DTYPES_SIM = {
+    'TIPOBITO': 'category',
+    'IDADE': 'category',
+    'SEXO': 'category',
+    'LINHAA': 'category',
+    'LINHAB': 'category',
+    'LINHAC': 'category',
+    'LINHAD': 'category',
+    'LINHAII': 'category',
+    'CAUSABAS': 'category',
+    'CAUSABAS_O': 'category',
+    'RACACOR': 'category',
+    'ESC': 'category',
+    'ATESTADO': 'category',
+    'DTOBITO': 'category',
+    'CODMUNRES': 'category',
+    'CODMUNOCOR': 'category'
+}
+
+COLUNAS_CID = ['LINHAA', 'LINHAB', 'LINHAC', 'LINHAD', 'LINHAII', 'CAUSABAS_O']
+
+GRUPOS_CID = {
+    "obesidade": ["E66", "E660", "E661", "E662", "E668", "E669"],
+    "hipertensao": ["I10X"],
+    "diabetes": ["E149"],
+    "tmTabaco": ["F172", "F171", "F179"]
+}
+
+# Unidade da idade (primeiro dígito de IDADE):
+# 0 minutos, 1 horas, 2 dias, 3 meses, 4 anos, 5 anos acima de 100
+_FATOR_IDADE = np.array([
+    1 / (60 * 24 * 365),
+    1 / (24 * 365),
+    1 / 365,
+    1 / 12,
+    1.0,
+    1.0
+])
+
+_DESLOCAMENTO_IDADE = np.array([0.0, 0.0, 0.0, 0.0, 0.0, 100.0])
+
+# Tabela de consulta código UF (0–99) → posição em UFS
+_CODIGOS_UF = np.array([int(codigo) for codigo in UFS], dtype=np.int16)
+_NOMES_UF = list(UFS.values())
+
+_POSICAO_UF = np.full(100, -1, dtype=np.int8)
+_POSICAO_UF[_CODIGOS_UF] = np.arange(len(_CODIGOS_UF), dtype=np.int8)
+
+
+# =====================================================
+# FUNÇÃO INTERNA DE CONVERSÃO NUMÉRICA
+# =====================================================
+
+def _para_numerico(valores) -> np.ndarray:
+    """
+    Converte códigos (int, float ou texto com zeros à esquerda)
+    para float64. Valores inválidos viram NaN.
+
+    Para categorias, converte só os valores distintos e
+    propaga pelos códigos.
+    """
+
+    valores = pd.Series(valores, copy=False)
+
+    if isinstance(valores.dtype, pd.CategoricalDtype):
+        categorias = _para_numerico(valores.cat.categories)
+
+        # Posição extra (NaN) atende aos códigos -1 (nulos)
+        return np.append(categorias, np.nan)[valores.cat.codes.to_numpy()]
+
+    return pd.to_numeric(
+        valores,
+        errors="coerce"
+    ).to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+# =====================================================
+# IDADE
+# =====================================================
+
+def decodificar_idade(idade) -> np.ndarray:
+    """
+    Converte o campo IDADE do SIM para idade em anos.
+
+    O código tem três dígitos: unidade (0–5) + quantidade (00–99).
+    Códigos ausentes ou com unidade fora de 0–5 retornam NaN.
+    """
+
+    codigos = _para_numerico(idade)
+
+    validos = (codigos >= 0) & (codigos < 600)
+
+    unidade = np.zeros(len(codigos), dtype=np.intp)
+    unidade[validos] = codigos[validos] // 100
+
+    quantidade = np.mod(codigos, 100)
+
+    anos = quantidade * _FATOR_IDADE[unidade] + _DESLOCAMENTO_IDADE[unidade]
+    anos[~validos] = np.nan
+
+    return anos
+
+
+# =====================================================
+# DATA DO ÓBITO
+# =====================================================
+
+def decodificar_dtobito(dtobito) -> np.ndarray:
+    """
+    Converte DTOBITO (DDMMAAAA, com ou sem zero à esquerda)
+    diretamente para datetime64[D].
+
+    Datas inválidas retornam NaT.
+    """
+
+    valores = _para_numerico(dtobito)
+
+    validos = ~np.isnan(valores)
+    inteiros = np.where(validos, valores, 0).astype(np.int64)
+
+    dia = inteiros // 1_000_000
+    mes = (inteiros // 10_000) % 100
+    ano = inteiros % 10_000
+
+    validos &= (dia >= 1) & (dia <= 31) & (mes >= 1) & (mes <= 12) & (ano >= 1900)
+
+    meses = np.where(validos, (ano - 1970) * 12 + (mes - 1), 0)
+    inicio_mes = meses.astype("datetime64[M]").astype("datetime64[D]")
+
+    datas = inicio_mes + np.where(validos, dia - 1, 0).astype("timedelta64[D]")
+
+    # Dia além do fim do mês (ex.: 31/04)
+    validos &= datas.astype("datetime64[M]") == inicio_mes.astype("datetime64[M]")
+
+    datas[~validos] = np.datetime64("NaT")
+
+    return datas
+
+
+# =====================================================
+# UNIDADE DA FEDERAÇÃO
+# =====================================================
+
+def extrair_codigo_uf(codmun) -> np.ndarray:
+    """
+    Extrai o código IBGE da UF (dois primeiros dígitos)
+    do código de município (6 ou 7 dígitos).
+
+    Retorna int16, com -1 para códigos ausentes ou desconhecidos.
+    """
+
+    valores = _para_numerico(codmun)
+
+    validos = ~np.isnan(valores) & (valores >= 10)
+    inteiros = np.where(validos, valores, 10).astype(np.int64)
+
+    digitos = np.floor(np.log10(inteiros)).astype(np.int64) + 1
+    codigo = inteiros // np.power(10, digitos - 2)
+
+    codigo = np.where(validos, codigo, 0)
+    codigo = np.where(_POSICAO_UF[codigo] >= 0, codigo, -1)
+
+    return codigo.astype(np.int16)
+
+
+def mapear_uf(codmun) -> pd.Categorical:
+    """
+    Mapeia CODMUNOCOR para o nome do Estado.
+
+    Retorna Categorical (sem criar uma string por linha).
+    Códigos desconhecidos viram NaN.
+    """
+
+    codigo = extrair_codigo_uf(codmun)
+
+    posicao = np.where(codigo >= 0, _POSICAO_UF[np.maximum(codigo, 0)], -1)
+
+    return pd.Categorical.from_codes(posicao, categories=_NOMES_UF)
+
+
+# =====================================================
+# DECODIFICAÇÃO COMPLETA
+# =====================================================
+
+def decodificar_registros(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica todos os decodificadores ao DataFrame do SIM.
+
+    Adiciona as colunas:
+    idade_real, DATA_OBITO, MES_OBITO, ANO_OBITO, Estado
+    """
+
+    df = df.copy()
+
+    if "IDADE" in df.columns:
+        df["idade_real"] = decodificar_idade(df["IDADE"])
+
+    if "DTOBITO" in df.columns:
+        datas = decodificar_dtobito(df["DTOBITO"])
+        df["DATA_OBITO"] = datas
+
+        meses = datas.astype("datetime64[M]").astype(np.int64)
+        validas = ~np.isnat(datas)
+
+        meses = np.where(validas, meses, 0)
+
+        df["MES_OBITO"] = pd.arrays.IntegerArray(
+            (meses % 12 + 1).astype(np.int8), ~validas
+        )
+        df["ANO_OBITO"] = pd.arrays.IntegerArray(
+            (meses // 12 + 1970).astype(np.int16), ~validas
+        )
+
+    if "CODMUNOCOR" in df.columns:
+        df["Estado"] = mapear_uf(df["CODMUNOCOR"])
+
+    return df
+
+
+# =====================================================
+# INDICADORES DE CID (COMORBIDADES)
+# =====================================================
+
+def _padrao_grupo(lista_cids) -> str:
+    """
+    Monta um único padrão por grupo (alternância dos CIDs).
+    """
+
+    cids = sorted(set(lista_cids), key=len, reverse=True)
+
+    return "|".join(re.escape(cid) for cid in cids)
+
+
+def marcar_cids(df: pd.DataFrame,
+                grupos: dict = None,
+                colunas: list = None) -> pd.DataFrame:
+    """
+    Cria uma coluna indicadora (0/1) por grupo de CIDs.
+
+    Mesma regra de `verificar_cid`: a linha é marcada se algum CID do
+    grupo aparecer (como substring) em qualquer coluna de causa.
+
+    Cada coluna é fatorada uma única vez; os padrões são testados só
+    nos valores distintos (busca vetorizada do Arrow) e o resultado é
+    propagado para as linhas por indexação.
+    """
+
+    grupos = GRUPOS_CID if grupos is None else grupos
+    colunas = COLUNAS_CID if colunas is None else colunas
+
+    padroes = {nome: _padrao_grupo(cids) for nome, cids in grupos.items()}
+
+    marcadores = {
+        nome: np.zeros(len(df), dtype=bool)
+        for nome in grupos
+    }
+
+    for coluna in colunas:
+        if coluna not in df.columns:
+            continue
+
+        codigos, unicos = pd.factorize(df[coluna])
+        unicos = pd.Series(unicos, dtype="string[pyarrow]")
+
+        for nome, padrao in padroes.items():
+            # Posição extra (False) atende aos códigos -1 (nulos)
+            encontrado = np.zeros(len(unicos) + 1, dtype=bool)
+            encontrado[:-1] = unicos.str.contains(padrao, regex=True).to_numpy(
+                dtype=bool, na_value=False
+            )
+
+            marcadores[nome] |= encontrado[codigos]
+
+    df = df.copy()
+
+    for nome, marcado in marcadores.items():
+        df[nome] = marcado.astype(np.int8)
+
+    return df
+
+
+# =====================================================
+# LEITURA EM BLOCOS (STREAMING)
+# =====================================================
+
+def ler_sim_em_blocos(path: str,
+                      colunas: list = None,
+                      chunksize: int = 500_000,
+                      encoding: str = "latin1"):
+    """
+    Lê o CSV bruto do SIM em blocos, apenas com as colunas
+    necessárias e tipos compactos, já decodificados.
+
+    Arquivos .dbc/.dbf do DATASUS são lidos diretamente (sem
+    conversão para CSV), com `chunksize` registros por bloco.
+
+    Gera um DataFrame por bloco; a memória de pico depende
+    do `chunksize`, não do tamanho do arquivo.
+    """
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Arquivo não encontrado: {path}")
+
+    colunas = COLUNAS_BASE if colunas is None else colunas
+
+    if path.lower().endswith((".dbc", ".dbf")):
+        for bloco in ler_dbc_em_blocos(path, colunas, chunksize, encoding):
+            yield decodificar_registros(bloco)
+        return
+
+    leitor = pd.read_csv(
+        path,
+        sep=",",
+        encoding=encoding,
+        usecols=colunas,
+        dtype={col: DTYPES_SIM[col] for col in colunas if col in DTYPES_SIM},
+        chunksize=chunksize,
+        on_bad_lines="warn"
+    )
+
+    with leitor:
+        for bloco in leitor:
+            yield decodificar_registros(bloco)
+
+
+def agregar_serie_mensal(path: str,
+                         colunas: list = None,
+                         chunksize: int = 500_000,
+                         filtro=None,
+                         encoding: str = "latin1") -> pd.Series:
+    """
+    Agrega o CSV bruto do SIM diretamente na série mensal de óbitos
+    (mesmo formato de `serie_temporal_mensal.csv`).
+
+    `filtro` (opcional) recebe cada bloco decodificado e retorna
+    o subconjunto de registros a contar.
+    """
+
+    contagem = pd.Series(dtype=np.int64)
+
+    for bloco in ler_sim_em_blocos(path, colunas, chunksize, encoding):
+
+        if filtro is not None:
+            bloco = filtro(bloco)
+
+        meses = bloco["DATA_OBITO"].dropna().to_numpy().astype("datetime64[M]")
+
+        valores, n = np.unique(meses, return_counts=True)
+
+        contagem = contagem.add(
+            pd.Series(n, index=valores.astype("datetime64[ns]")),
+            fill_value=0
+        )
+
+    if contagem.empty:
+        raise ValueError("Nenhum óbito com data válida encontrado.")
+
+    serie = contagem.astype(np.int64).sort_index()
+    serie.index = pd.DatetimeIndex(serie.index, name="DATA")
+
+    # Meses sem óbitos entram com zero
+    return serie.asfreq("MS", fill_value=0)
+
+
+def agregar_painel_mensal(path: str,
+                          nivel: str = "uf",
+                          colunas: list = None,
+                          chunksize: int = 500_000,
+                          filtro=None,
+                          encoding: str = "latin1") -> pd.DataFrame:
+    """
+    Agrega o CSV bruto do SIM em painel mensal no formato longo:
+    CHAVE, DATA, OBITOS.
+
+    `nivel`:
+    - 'uf': CHAVE = código IBGE da UF de ocorrência
+    - 'municipio': CHAVE = CODMUNOCOR
+    """
+
+    if nivel not in ("uf", "municipio"):
+        raise ValueError("Nível deve ser 'uf' ou 'municipio'")
+
+    contagem = None
+
+    for bloco in ler_sim_em_blocos(path, colunas, chunksize, encoding):
+
+        if filtro is not None:
+            bloco = filtro(bloco)
+
+        if nivel == "uf":
+            chave = extrair_codigo_uf(bloco["CODMUNOCOR"]).astype(np.int64)
+        else:
+            chave = np.nan_to_num(_para_numerico(bloco["CODMUNOCOR"]), nan=-1).astype(np.int64)
+
+        meses = bloco["DATA_OBITO"].to_numpy().astype("datetime64[M]")
+        validos = (chave >= 0) & ~np.isnat(meses)
+
+        parcial = pd.DataFrame({
+            "CHAVE": chave[validos],
+            "DATA": meses[validos].astype("datetime64[ns]")
+        }).value_counts()
+
+        if contagem is None:
+            contagem = parcial
+        else:
+            contagem = contagem.add(parcial, fill_value=0)
+
+    if contagem is None or contagem.empty:
+        raise ValueError("Nenhum óbito com data e local válidos encontrado.")
+
+    painel = contagem.astype(np.int64).rename("OBITOS").reset_index()
+
+    return painel.sort_values(["CHAVE", "DATA"], ignore_index=True)
+
+
+# =====================================================
+# VÁRIOS ARQUIVOS EM PARALELO (UM POR UF E ANO)
+# =====================================================
+
+def _ler_arquivo_filtrado(path, colunas, chunksize, filtro, encoding):
+    """
+    Registros decodificados de um arquivo (executado nos workers).
+    """
+
+    blocos = [
+        bloco if filtro is None else filtro(bloco)
+        for bloco in ler_sim_em_blocos(path, colunas, chunksize, encoding)
+    ]
+
+    return pd.concat(blocos, ignore_index=True)
+
+
+def ler_arquivos_sim(paths: list,
+                     colunas: list = None,
+                     chunksize: int = 500_000,
+                     filtro=None,
+                     encoding: str = "latin1",
+                     n_workers: int = None) -> pd.DataFrame:
+    """
+    Lê vários arquivos do SIM (CSV, .dbc ou .dbf — ex.: DOSP2019.dbc,
+    DORJ2019.dbc, ...) em paralelo, um arquivo por tarefa.
+
+    `filtro` (função de nível de módulo) é aplicado a cada bloco no
+    worker, antes de os registros voltarem ao processo principal.
+    """
+
+    tarefas = {
+        path: (_ler_arquivo_filtrado, (path, colunas, chunksize, filtro, encoding))
+        for path in paths
+    }
+
+    df = pd.concat(executar_tarefas(tarefas, n_workers=n_workers).values(), ignore_index=True)
+
+    # Categorias diferentes entre arquivos viram object no concat
+    for coluna in df.columns.intersection(list(DTYPES_SIM)):
+        df[coluna] = df[coluna].astype("category")
+
+    return df
+
+
+def agregar_arquivos_sim(paths: list,
+                         nivel: str = None,
+                         colunas: list = None,
+                         chunksize: int = 500_000,
+                         filtro=None,
+                         encoding: str = "latin1",
+                         n_workers: int = None):
+    """
+    Agrega vários arquivos do SIM em paralelo, um arquivo por tarefa.
+
+    - nivel=None: série mensal (como `agregar_serie_mensal`)
+    - nivel='uf' ou 'municipio': painel CHAVE, DATA, OBITOS
+      (como `agregar_painel_mensal`)
+    """
+
+    if nivel is None:
+        tarefas = {
+            path: (agregar_serie_mensal, (path, colunas, chunksize, filtro, encoding))
+            for path in paths
+        }
+        series = executar_tarefas(tarefas, n_workers=n_workers).values()
+
+        serie = pd.concat(series).groupby(level=0).sum().sort_index()
+        serie.index = pd.DatetimeIndex(serie.index, name="DATA")
+
+        return serie.asfreq("MS", fill_value=0)
+
+    tarefas = {
+        path: (agregar_painel_mensal, (path, nivel, colunas, chunksize, filtro, encoding))
+        for path in paths
+    }
+    paineis = executar_tarefas(tarefas, n_workers=n_workers).values()
+
+    painel = pd.concat(paineis).groupby(["CHAVE", "DATA"], as_index=False)["OBITOS"].sum()
+
+    return painel.sort_values(["CHAVE", "DATA"], ignore_index=True)
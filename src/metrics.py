@@ -7,19 +7,20 @@ Inclui:
 - MAE
 - MAPE (seguro)
 - R²
+- Kernel vetorizado em lote (séries × tempo), com sMAPE e MASE
+- Acumuladores online (combináveis e serializáveis) para atualização
+  incremental das métricas
 - Função consolidada de avaliação
 - Geração de DataFrame comparativo
-- Salvamento automático em CSV
+- Salvamento automático em CSV ou Parquet
 """
 
-import os
+import warnings
+
 import numpy as np
 import pandas as pd
-from sklearn.metrics import (
-    mean_squared_error,
-    mean_absolute_error,
-    r2_score
-)
+
+from .data_loader import salvar_tabela
 
 
 # =====================================================
@@ -27,14 +28,20 @@ from sklearn.metrics import (
 # =====================================================
 
 def calcular_mse(y_true, y_pred):
+    from sklearn.metrics import mean_squared_error
+
     return mean_squared_error(y_true, y_pred)
 
 
 def calcular_rmse(y_true, y_pred):
+    from sklearn.metrics import mean_squared_error
+
     return np.sqrt(mean_squared_error(y_true, y_pred))
 
 
 def calcular_mae(y_true, y_pred):
+    from sklearn.metrics import mean_absolute_error
+
     return mean_absolute_error(y_true, y_pred)
 
 
@@ -58,9 +65,294 @@ def calcular_mape(y_true, y_pred):
 
 
 def calcular_r2(y_true, y_pred):
+    from sklearn.metrics import r2_score
+
     return r2_score(y_true, y_pred)
 
 
+# =====================================================
+# KERNEL VETORIZADO (SÉRIES × TEMPO)
+# =====================================================
+
+COLUNAS_LOTE = ["MSE", "RMSE", "MAE", "MAPE (%)", "R2", "sMAPE (%)", "MASE"]
+
+
+def _media_mascarada(valores, mascara):
+    """
+    Média por linha só dos elementos da máscara (NaN se nenhum).
+    """
+
+    n = mascara.sum(axis=1)
+    soma = np.where(mascara, valores, 0.0).sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, soma / np.maximum(n, 1), np.nan)
+
+
+def calcular_metricas_lote(y_true, y_pred, y_treino=None, sazonalidade=12) -> pd.DataFrame:
+    """
+    Calcula MSE, RMSE, MAE, MAPE, R², sMAPE e MASE de uma vez para
+    matrizes (séries × tempo), uma linha de resultado por série.
+    Vetores 1-D são tratados como uma única série.
+
+    - MAPE: ignora os pontos com valor real zero (NaN se todos forem),
+      como `calcular_mape`
+    - R²: mesma convenção do sklearn para série constante
+      (1 se o ajuste é perfeito, senão 0)
+    - sMAPE: 200·|erro| / (|real| + |previsto|), ignorando 0/0
+    - MASE: MAE dividido pelo erro médio do ingênuo sazonal no treino
+      (`y_treino`, séries × tempo de treino); NaN sem `y_treino`
+    """
+
+    y_true = np.atleast_2d(np.asarray(y_true, dtype=np.float64))
+    y_pred = np.atleast_2d(np.asarray(y_pred, dtype=np.float64))
+
+    erro = y_pred - y_true
+    abs_erro = np.abs(erro)
+    abs_real = np.abs(y_true)
+
+    mse = np.mean(erro * erro, axis=1)
+    mae = np.mean(abs_erro, axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mape = _media_mascarada(abs_erro / abs_real, y_true != 0) * 100
+
+        soma_abs = abs_real + np.abs(y_pred)
+        smape = _media_mascarada(2 * abs_erro / soma_abs, soma_abs != 0) * 100
+
+    centrado = y_true - y_true.mean(axis=1, keepdims=True)
+    ss_tot = np.sum(centrado * centrado, axis=1)
+    ss_res = mse * y_true.shape[1]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r2 = np.where(
+            ss_tot > 0,
+            1 - ss_res / ss_tot,
+            np.where(ss_res == 0, 1.0, 0.0)
+        )
+
+    if y_treino is None:
+        mase = np.full(len(y_true), np.nan)
+    else:
+        y_treino = np.atleast_2d(np.asarray(y_treino, dtype=np.float64))
+        escala = np.mean(
+            np.abs(y_treino[:, sazonalidade:] - y_treino[:, :-sazonalidade]),
+            axis=1
+        )
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mase = np.where(escala > 0, mae / escala, np.nan)
+
+    return pd.DataFrame({
+        "MSE": mse,
+        "RMSE": np.sqrt(mse),
+        "MAE": mae,
+        "MAPE (%)": mape,
+        "R2": r2,
+        "sMAPE (%)": smape,
+        "MASE": mase
+    })
+
+
+# =====================================================
+# ACUMULADORES ONLINE
+# =====================================================
+
+class AcumuladorMetricas:
+    """
+    Estado suficiente para MSE, RMSE, MAE, MAPE e R² sem guardar os
+    pontos: somas dos erros e média/variância do valor real (Welford).
+
+    Acumuladores de partições diferentes (UFs, períodos) podem ser
+    combinados com `combinar` (ou `+`); o resultado é o mesmo de
+    calcular as métricas sobre todos os pontos juntos.
+    """
+
+    CAMPOS = ("n", "soma_erro2", "soma_abs_erro", "soma_ape", "n_ape",
+              "media_real", "m2_real")
+
+    def __init__(self, **estado):
+
+        for campo in self.CAMPOS:
+            setattr(self, campo, float(estado.get(campo, 0.0)))
+
+    def atualizar(self, y_true, y_pred):
+        """
+        Incorpora novos pontos em O(len(y_true)).
+        """
+
+        y_true = np.asarray(y_true, dtype=np.float64).ravel()
+        y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+
+        if y_true.size == 0:
+            return self
+
+        erro = y_pred - y_true
+        mascara = y_true != 0
+
+        media = y_true.mean()
+
+        lote = AcumuladorMetricas(
+            n=y_true.size,
+            soma_erro2=np.dot(erro, erro),
+            soma_abs_erro=np.abs(erro).sum(),
+            soma_ape=np.abs(erro[mascara] / y_true[mascara]).sum(),
+            n_ape=mascara.sum(),
+            media_real=media,
+            m2_real=np.sum((y_true - media) ** 2)
+        )
+
+        return self.combinar(lote, inplace=True)
+
+    def combinar(self, outro, inplace=False):
+        """
+        Junta dois acumuladores (fórmula de Chan para a variância).
+        """
+
+        destino = self if inplace else AcumuladorMetricas(**self.para_dict())
+
+        n = self.n + outro.n
+
+        if n == 0:
+            return destino
+
+        delta = outro.media_real - self.media_real
+
+        destino.media_real = self.media_real + delta * outro.n / n
+        destino.m2_real = self.m2_real + outro.m2_real + delta ** 2 * self.n * outro.n / n
+
+        for campo in ("soma_erro2", "soma_abs_erro", "soma_ape", "n_ape"):
+            setattr(destino, campo, getattr(self, campo) + getattr(outro, campo))
+
+        destino.n = n
+
+        return destino
+
+    def __add__(self, outro):
+        return self.combinar(outro)
+
+    def metricas(self) -> dict:
+        """
+        Mesmas chaves e convenções de `avaliar_modelo`.
+        """
+
+        if self.n == 0:
+            return {chave: np.nan for chave in ("MSE", "RMSE", "MAE", "MAPE (%)", "R2")}
+
+        mse = self.soma_erro2 / self.n
+
+        if self.m2_real > 0:
+            r2 = 1 - self.soma_erro2 / self.m2_real
+        else:
+            r2 = 1.0 if self.soma_erro2 == 0 else 0.0
+
+        return {
+            "MSE": mse,
+            "RMSE": np.sqrt(mse),
+            "MAE": self.soma_abs_erro / self.n,
+            "MAPE (%)": self.soma_ape / self.n_ape * 100 if self.n_ape else np.nan,
+            "R2": r2
+        }
+
+    def para_dict(self) -> dict:
+        return {campo: getattr(self, campo) for campo in self.CAMPOS}
+
+
+def atualizar_estados_metricas(estados, novos: pd.DataFrame,
+                               chaves=("MODELO",)) -> pd.DataFrame:
+    """
+    Atualiza a tabela de estados (uma linha por combinação de `chaves`,
+    ex.: MODELO × UF) com os pontos novos (colunas DATA, REAL, PREVISAO;
+    DATA também pode ser o índice, como em `carregar_previsao`).
+
+    `estados` pode ser None (primeira execução). Só os pontos novos
+    são percorridos; a tabela resultante pode ser salva com
+    `salvar_tabela` e recarregada no mês seguinte.
+
+    Cada estado guarda a última DATA acumulada (ULTIMA_DATA): pontos
+    com DATA até ela (já incorporados) e repetidos são ignorados, com
+    um aviso, para que reprocessar um arquivo não conte meses duas vezes.
+    """
+
+    if "DATA" not in novos.columns and novos.index.name == "DATA":
+        novos = novos.reset_index()
+
+    if "DATA" not in novos.columns:
+        raise ValueError("Os pontos novos devem conter a coluna 'DATA'.")
+
+    chaves = list(chaves)
+    acumuladores = {}
+    ultimas = {}
+
+    if estados is not None:
+        if "ULTIMA_DATA" in estados.columns:
+            datas = pd.to_datetime(estados["ULTIMA_DATA"])
+        else:
+            datas = pd.Series(pd.NaT, index=estados.index)
+
+        for linha, ultima in zip(estados.to_dict("records"), datas):
+            chave = tuple(linha[c] for c in chaves)
+            acumuladores[chave] = AcumuladorMetricas(**linha)
+            ultimas[chave] = ultima
+
+    n_recebidos = len(novos)
+    novos = novos.assign(DATA=pd.to_datetime(novos["DATA"]))
+    novos = novos.drop_duplicates(chaves + ["DATA"], keep="last")
+
+    n_incorporados = 0
+
+    for chave, grupo in novos.groupby(chaves, sort=False):
+        chave = chave if isinstance(chave, tuple) else (chave,)
+
+        ultima = ultimas.get(chave, pd.NaT)
+        if pd.notna(ultima):
+            grupo = grupo[grupo["DATA"] > ultima]
+
+        if grupo.empty:
+            continue
+
+        acumuladores.setdefault(chave, AcumuladorMetricas()).atualizar(
+            grupo["REAL"].to_numpy(),
+            grupo["PREVISAO"].to_numpy()
+        )
+        ultimas[chave] = grupo["DATA"].max()
+        n_incorporados += len(grupo)
+
+    if n_incorporados < n_recebidos:
+        warnings.warn(
+            f"{n_recebidos - n_incorporados} pontos já incorporados ou repetidos "
+            f"(DATA até a última acumulada) foram ignorados."
+        )
+
+    return pd.DataFrame([
+        {
+            **dict(zip(chaves, chave)),
+            **acumulador.para_dict(),
+            "ULTIMA_DATA": ultimas.get(chave, pd.NaT)
+        }
+        for chave, acumulador in acumuladores.items()
+    ])
+
+
+def metricas_dos_estados(estados: pd.DataFrame, por: str = "MODELO") -> pd.DataFrame:
+    """
+    Combina as partições de cada `por` e retorna as métricas
+    no formato de `consolidar_metricas`.
+    """
+
+    lista_metricas = []
+
+    for nome, grupo in estados.groupby(por, sort=False):
+        total = AcumuladorMetricas()
+
+        for linha in grupo.to_dict("records"):
+            total.combinar(AcumuladorMetricas(**linha), inplace=True)
+
+        lista_metricas.append(pd.DataFrame([{**total.metricas(), "Modelo": nome}]))
+
+    return consolidar_metricas(lista_metricas)
+
+
 # =====================================================
 # AVALIAÇÃO COMPLETA
 # =====================================================
@@ -118,10 +410,11 @@ def consolidar_metricas(lista_metricas):
 # SALVAR MÉTRICAS
 # =====================================================
 
-def salvar_metricas(df_metricas, path="../Data/processed/metricas_modelos.csv"):
+def salvar_metricas(df_metricas, path="../Data/processed/metricas_modelos.csv",
+                    formato=None):
     """
-    Salva métricas consolidadas.
+    Salva métricas consolidadas (CSV ou Parquet, pela extensão
+    ou pelo argumento `formato`).
     """
 
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    df_metricas.to_csv(path, index=False)
\ No newline at end of file
+    salvar_tabela(df_metricas, path, formato)
\ No newline at end of file
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pela previsão em painel (várias séries: UFs, municípios).
+
+Inclui:
+- Conversão do formato longo (CHAVE, DATA, VALOR) para matriz DATA × CHAVE
+- SARIMA e Holt-Winters por série, em paralelo (lotes de séries por processo)
+- LSTM global: uma única rede treinada com as janelas de todas as séries
+- Previsão recursiva dos meses futuros de todas as séries em lote
+"""
+
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from .preprocessing import normalizar_painel, criar_sequencias
+from .forecasting import (
+    modelo_sarima,
+    modelo_holt_winters,
+    construir_lstm,
+    treinar_lstm,
+    prever_recursivo
+)
+from .parallel import executar_tarefas
+
+
+# =====================================================
+# FORMATO LONGO → MATRIZ
+# =====================================================
+
+def pivotar_painel(df_longo: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte o painel longo em DataFrame DATA × CHAVE,
+    com frequência mensal e meses ausentes preenchidos com zero.
+    """
+
+    largo = df_longo.pivot_table(
+        index="DATA",
+        columns="CHAVE",
+        values="VALOR",
+        aggfunc="sum"
+    ).sort_index()
+
+    return largo.asfreq("MS").fillna(0.0)
+
+
+def _para_longo(real: pd.DataFrame, previsto: pd.DataFrame, modelo: str) -> pd.DataFrame:
+    """
+    Converte matrizes DATA × CHAVE (real e previsto) para o formato
+    longo MODELO, CHAVE, DATA, REAL, PREVISAO.
+    """
+
+    real = real[previsto.columns]
+
+    n_datas, n_chaves = previsto.shape
+
+    return pd.DataFrame({
+        "MODELO": modelo,
+        "CHAVE": np.tile(previsto.columns.to_numpy(), n_datas),
+        "DATA": np.repeat(previsto.index.to_numpy(), n_chaves),
+        "REAL": real.to_numpy(dtype=np.float64).ravel(),
+        "PREVISAO": previsto.to_numpy(dtype=np.float64).ravel()
+    })
+
+
+# =====================================================
+# MODELOS CLÁSSICOS POR SÉRIE
+# =====================================================
+
+def _ajustar_lote(modelo: str, train_lote: pd.DataFrame, test_index,
+                  cache=None) -> pd.DataFrame:
+    """
+    Ajusta o modelo clássico em cada série do lote (executado no worker).
+
+    Séries que o otimizador não consegue ajustar recebem NaN.
+    """
+
+    teste = pd.Series(np.nan, index=test_index)
+    previsoes = {}
+
+    for chave in train_lote.columns:
+        train = train_lote[chave]
+
+        try:
+            if modelo == "SARIMA":
+                forecast = modelo_sarima(train, teste, cache=cache)
+
+            # Sazonalidade multiplicativa exige série estritamente positiva
+            elif (train > 0).all():
+                forecast = modelo_holt_winters(train, teste, cache=cache)
+            else:
+                forecast = modelo_holt_winters(
+                    train, teste, seasonal="add", cache=cache
+                )
+
+            previsoes[chave] = forecast.to_numpy()
+
+        except (ValueError, np.linalg.LinAlgError):
+            previsoes[chave] = np.full(len(test_index), np.nan)
+
+    return pd.DataFrame(previsoes, index=test_index)
+
+
+def prever_painel_classico(largo: pd.DataFrame,
+                           modelos=("SARIMA", "Holt-Winters"),
+                           proporcao_treino: float = 0.8,
+                           n_workers: int = None,
+                           lotes_por_worker: int = 4,
+                           cache=None):
+    """
+    Ajusta SARIMA e Holt-Winters em cada série do painel,
+    distribuindo lotes de séries entre processos.
+
+    Com `cache` (CacheAjustes), séries inalteradas desde a
+    última execução não passam pelo otimizador.
+
+    Retorna:
+    - DataFrame longo MODELO, CHAVE, DATA, REAL, PREVISAO
+    - dict modelo → séries por minuto
+    """
+
+    train_size = int(len(largo) * proporcao_treino)
+    train = largo.iloc[:train_size]
+    test = largo.iloc[train_size:]
+
+    chaves = list(largo.columns)
+    n_lotes = max(1, min(len(chaves), (n_workers or 1) * lotes_por_worker))
+    tamanho_lote = math.ceil(len(chaves) / n_lotes)
+
+    lotes = [
+        chaves[i:i + tamanho_lote]
+        for i in range(0, len(chaves), tamanho_lote)
+    ]
+
+    resultados = []
+    desempenho = {}
+
+    for modelo in modelos:
+
+        tarefas = {
+            i: (_ajustar_lote, (modelo, train[lote], test.index, cache))
+            for i, lote in enumerate(lotes)
+        }
+
+        inicio = time.perf_counter()
+        previsto = pd.concat(
+            executar_tarefas(tarefas, n_workers=n_workers).values(),
+            axis=1
+        )
+        segundos = time.perf_counter() - inicio
+
+        desempenho[modelo] = len(chaves) / segundos * 60
+        resultados.append(_para_longo(test, previsto, modelo))
+
+    return pd.concat(resultados, ignore_index=True), desempenho
+
+
+# =====================================================
+# LSTM GLOBAL
+# =====================================================
+
+def treinar_lstm_painel(largo: pd.DataFrame,
+                        nome_modelo: str,
+                        config: dict,
+                        seq_length: int = 12,
+                        proporcao_treino: float = 0.8,
+                        batch_size: int = None,
+                        retornar_modelo: bool = False):
+    """
+    Treina uma única LSTM com as janelas de todas as séries do painel
+    (cada série normalizada pelo próprio MinMax) e prevê o período
+    de teste de todas elas em uma única chamada em lote.
+
+    O split segue `split_temporal`: os primeiros `proporcao_treino`
+    das janelas de cada série vão para treino.
+
+    Retorna DataFrame longo MODELO, CHAVE, DATA, REAL, PREVISAO
+    (e a rede treinada, com retornar_modelo=True).
+    """
+
+    valores = largo.to_numpy(dtype=np.float64).T        # (S, T)
+    minimos, amplitudes, escalado = normalizar_painel(valores)
+
+    X, y = criar_sequencias(escalado[..., None], seq_length)   # (S, N, L, 1), (S, N, 1)
+
+    n_series, n_janelas = X.shape[:2]
+    split_index = int(n_janelas * proporcao_treino)
+    n_teste = n_janelas - split_index
+
+    X_train = X[:, :split_index].reshape(-1, seq_length, 1)
+    y_train = y[:, :split_index].reshape(-1, 1)
+    X_test = X[:, split_index:].reshape(-1, seq_length, 1)
+    y_test = y[:, split_index:].reshape(-1, 1)
+
+    batch_size = batch_size or config["batch_size"]
+
+    model = construir_lstm(
+        input_shape=(seq_length, 1),
+        unidades_lstm=config["unidades_lstm"],
+        unidades_dense=config["unidades_dense"],
+        optimizer=config["optimizer"],
+        weight_decay=config.get("weight_decay", 0.0)
+    )
+
+    treinar_lstm(
+        model,
+        X_train,
+        y_train,
+        X_test,
+        y_test,
+        epochs=config["epochs"],
+        batch_size=batch_size,
+        verbose=0
+    )
+
+    pred = model.predict(X_test, batch_size=max(batch_size, 1024), verbose=0)
+
+    # Desnormalizar por série
+    pred = pred.reshape(n_series, n_teste) * amplitudes + minimos
+
+    idx_test = largo.index[seq_length + split_index:]
+    real = largo.iloc[seq_length + split_index:]
+
+    previsto = pd.DataFrame(pred.T, index=idx_test, columns=largo.columns)
+
+    df_longo = _para_longo(real, previsto, nome_modelo)
+
+    if retornar_modelo:
+        return df_longo, model
+
+    return df_longo
+
+
+def prever_futuro_painel(model,
+                         largo: pd.DataFrame,
+                         nome_modelo: str,
+                         seq_length: int = 12,
+                         horizonte: int = 12) -> pd.DataFrame:
+    """
+    Prevê os `horizonte` meses seguintes ao fim do painel para todas
+    as séries, com uma chamada da rede global por passo.
+
+    Retorna DataFrame longo MODELO, CHAVE, DATA, REAL (NaN), PREVISAO.
+    """
+
+    minimos, amplitudes, escalado = normalizar_painel(
+        largo.to_numpy(dtype=np.float64).T
+    )
+
+    pred = prever_recursivo(model, escalado[:, -seq_length:, None], horizonte)
+    pred = pred * amplitudes + minimos                    # (S, horizonte)
+
+    datas = pd.date_range(
+        largo.index[-1] + pd.offsets.MonthBegin(),
+        periods=horizonte,
+        freq="MS"
+    )
+
+    previsto = pd.DataFrame(pred.T, index=datas, columns=largo.columns)
+    real = pd.DataFrame(np.nan, index=datas, columns=largo.columns)
+
+    return _para_longo(real, previsto, nome_modelo)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pela execução paralela dos modelos.
+
+Inclui:
+- Fixação de seeds (reprodutibilidade)
+- Configuração de threads do TensorFlow por processo
+- Execução de tarefas em ProcessPoolExecutor
+"""
+
+import os
+import sys
+import random
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+# =====================================================
+# SEEDS
+# =====================================================
+
+def fixar_seeds(seed: int = 42, tensorflow: bool = False):
+    """
+    Fixa as seeds de random, NumPy e TensorFlow (este último apenas
+    se já estiver carregado; com tensorflow=True ele é importado,
+    para os caminhos das LSTMs).
+    """
+
+    # Importado antes das seeds: a importação consome números aleatórios
+    if tensorflow:
+        import tensorflow  # noqa: F401
+
+    random.seed(seed)
+    np.random.seed(seed)
+
+    if "tensorflow" in sys.modules:
+        sys.modules["tensorflow"].random.set_seed(seed)
+
+
+# =====================================================
+# CONFIGURAÇÃO DO WORKER
+# =====================================================
+
+def threads_por_worker(n_workers: int) -> int:
+    """
+    Divide os núcleos disponíveis entre os workers.
+    """
+
+    return max(1, (os.cpu_count() or 1) // max(1, n_workers))
+
+
+def _configurar_worker(n_threads: int, seed: int):
+    """
+    Executado uma vez em cada processo do pool, antes de qualquer
+    operação do TensorFlow: limita threads intra/inter-op para que
+    os workers não disputem os mesmos núcleos.
+    """
+
+    # Bibliotecas numéricas (BLAS/OpenMP) usadas pelo statsmodels
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(n_threads)
+
+    # Lidas pelo TensorFlow se ele só for importado depois
+    os.environ["TF_NUM_INTRAOP_THREADS"] = str(n_threads)
+    os.environ["TF_NUM_INTEROP_THREADS"] = "1"
+
+    # Tarefas só com statsmodels não precisam carregar o TensorFlow
+    if "tensorflow" in sys.modules:
+        tf = sys.modules["tensorflow"]
+        tf.config.threading.set_intra_op_parallelism_threads(n_threads)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
+
+    fixar_seeds(seed)
+
+
+# =====================================================
+# EXECUÇÃO DE TAREFAS
+# =====================================================
+
+def executar_tarefas(tarefas: dict, n_workers: int = None, seed: int = 42) -> dict:
+    """
+    Executa tarefas independentes em paralelo.
+
+    `tarefas` mapeia nome → (função, args). As funções devem ser
+    definidas em nível de módulo (serializáveis).
+
+    Retorna dict nome → resultado, na ordem das tarefas.
+    Com n_workers=1 executa tudo no processo atual.
+    """
+
+    n_workers = n_workers or os.cpu_count() or 1
+    n_workers = min(n_workers, len(tarefas)) or 1
+
+    if n_workers == 1:
+        return {
+            nome: func(*args)
+            for nome, (func, args) in tarefas.items()
+        }
+
+    # "spawn": não herda o estado do TensorFlow do processo pai
+    contexto = multiprocessing.get_context("spawn")
+
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=contexto,
+        initializer=_configurar_worker,
+        initargs=(threads_por_worker(n_workers), seed)
+    ) as executor:
+
+        futuros = {
+            nome: executor.submit(func, *args)
+            for nome, (func, args) in tarefas.items()
+        }
+
+        return {nome: futuro.result() for nome, futuro in futuros.items()}
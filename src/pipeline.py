@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pela execução incremental do pipeline como um DAG.
+
+Inclui:
+- Etapas com dependências explícitas (carregar → pré-processar →
+  ajustar por modelo → avaliar → consolidar)
+- Impressão digital de cada etapa: código da função, dos módulos do
+  pacote que ela usa, parâmetros, arquivos de entrada e impressões
+  digitais das dependências
+- Reexecução apenas das etapas cuja impressão digital mudou
+- Etapas independentes do mesmo nível em paralelo (ProcessPoolExecutor)
+- Simulação (dry run) listando o que seria executado
+"""
+
+import os
+import ast
+import json
+import pickle
+import inspect
+import hashlib
+import importlib.util
+
+from .parallel import executar_tarefas
+
+
+# Pacote cujos módulos entram na impressão digital das etapas
+PACOTE = __name__.partition(".")[0]
+DIRETORIO_PACOTE = os.path.dirname(os.path.abspath(__file__))
+
+
+# =====================================================
+# ETAPA
+# =====================================================
+
+class Etapa:
+    """
+    Uma etapa do pipeline.
+
+    `funcao` (definida em nível de módulo) recebe os resultados das
+    `dependencias`, na ordem, seguidos de `parametros` como argumentos
+    nomeados.
+
+    - `arquivos`: arquivos de entrada lidos pela etapa; mudanças no
+      conteúdo deles também disparam a reexecução
+    - `codigo`: funções auxiliares chamadas pela etapa cujo código
+      também entra na impressão digital
+    - `paralela=False`: etapa leve, executada no processo atual
+    """
+
+    def __init__(self, nome: str, funcao, dependencias=(), parametros: dict = None,
+                 arquivos=(), codigo=(), paralela=True):
+
+        self.nome = nome
+        self.funcao = funcao
+        self.dependencias = list(dependencias)
+        self.parametros = parametros or {}
+        self.arquivos = list(arquivos)
+        self.codigo = list(codigo)
+        self.paralela = paralela
+
+
+def _hash_arquivo(path: str) -> str:
+
+    h = hashlib.sha256()
+
+    with open(path, "rb") as arquivo:
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            h.update(bloco)
+
+    return h.hexdigest()
+
+
+def _nomes_globais(codigo) -> set:
+    """
+    Nomes globais usados pelo código, incluindo funções internas.
+    """
+
+    nomes = set(codigo.co_names)
+
+    for constante in codigo.co_consts:
+        if inspect.iscode(constante):
+            nomes |= _nomes_globais(constante)
+
+    return nomes
+
+
+def _arquivo_modulo(nome) -> str:
+    """
+    Arquivo do módulo `nome` do pacote (sem importá-lo), ou None se
+    `nome` não é um módulo do pacote.
+    """
+
+    if not isinstance(nome, str) or not (nome == PACOTE or nome.startswith(PACOTE + ".")):
+        return None
+
+    path = os.path.join(DIRETORIO_PACOTE, *nome.split(".")[1:])
+
+    for arquivo in (os.path.join(path, "__init__.py"), f"{path}.py"):
+        if os.path.isfile(arquivo):
+            return arquivo
+
+    return None
+
+
+def _modulos_importados(nome: str) -> set:
+    """
+    Módulos do pacote importados pelo módulo `nome` (em qualquer
+    ponto do arquivo, inclusive dentro de funções).
+    """
+
+    arquivo_modulo = _arquivo_modulo(nome)
+    pacote = nome if arquivo_modulo.endswith("__init__.py") else nome.rpartition(".")[0]
+
+    with open(arquivo_modulo, encoding="utf-8") as arquivo:
+        arvore = ast.parse(arquivo.read())
+
+    importados = set()
+
+    for no in ast.walk(arvore):
+        if isinstance(no, ast.Import):
+            importados |= {alias.name for alias in no.names}
+
+        elif isinstance(no, ast.ImportFrom):
+            base = importlib.util.resolve_name("." * no.level + (no.module or ""), pacote)
+            importados.add(base)
+
+            # `from . import modulo`
+            importados |= {f"{base}.{alias.name}" for alias in no.names}
+
+    return {modulo for modulo in importados if _arquivo_modulo(modulo)}
+
+
+def _modulos_usados(funcao) -> set:
+    """
+    Módulos do pacote dos quais a função depende: o dela, os que
+    definem os nomes globais que ela usa e, recursivamente, os que
+    esses módulos importam.
+    """
+
+    pendentes = [funcao.__module__]
+
+    for nome in _nomes_globais(funcao.__code__):
+        valor = funcao.__globals__.get(nome)
+        pendentes.append(
+            valor.__name__ if inspect.ismodule(valor) else getattr(valor, "__module__", None)
+        )
+
+    modulos = set()
+
+    while pendentes:
+        nome = pendentes.pop()
+
+        if nome in modulos or not _arquivo_modulo(nome):
+            continue
+
+        modulos.add(nome)
+
+        # O __init__ do pacote só reexporta os submódulos (carregamento
+        # preguiçoso): segui-lo faria toda etapa depender de todos eles
+        if nome != PACOTE:
+            pendentes += _modulos_importados(nome)
+
+    return modulos
+
+
+# =====================================================
+# PIPELINE
+# =====================================================
+
+class Pipeline:
+    """
+    DAG de etapas com estado em disco.
+
+    Em `diretorio` ficam `estado.json` (impressão digital de cada
+    etapa executada) e o resultado de cada etapa (`<nome>.pkl`), que
+    é usado pelas etapas seguintes quando a etapa não precisa rodar.
+    """
+
+    def __init__(self, diretorio: str):
+
+        self.diretorio = diretorio
+        self.etapas = {}
+
+        os.makedirs(diretorio, exist_ok=True)
+
+    def adicionar(self, nome, funcao, dependencias=(), parametros=None, arquivos=(),
+                  codigo=(), paralela=True):
+
+        for dependencia in dependencias:
+            if dependencia not in self.etapas:
+                raise ValueError(
+                    f"Etapa '{nome}' depende de '{dependencia}', que não foi adicionada antes."
+                )
+
+        self.etapas[nome] = Etapa(
+            nome, funcao, dependencias, parametros, arquivos, codigo, paralela
+        )
+
+        return self
+
+    # =====================================================
+    # ESTADO
+    # =====================================================
+
+    def _path_estado(self) -> str:
+        return os.path.join(self.diretorio, "estado.json")
+
+    def _path_resultado(self, nome: str) -> str:
+        return os.path.join(self.diretorio, f"{nome}.pkl")
+
+    def _ler_estado(self) -> dict:
+
+        if not os.path.exists(self._path_estado()):
+            return {}
+
+        with open(self._path_estado(), encoding="utf-8") as arquivo:
+            return json.load(arquivo)
+
+    def _gravar_estado(self, estado: dict):
+
+        temporario = f"{self._path_estado()}.tmp"
+
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(estado, arquivo, indent=2, sort_keys=True)
+
+        os.replace(temporario, self._path_estado())
+
+    # =====================================================
+    # IMPRESSÕES DIGITAIS
+    # =====================================================
+
+    def impressoes_digitais(self) -> dict:
+        """
+        Impressão digital de todas as etapas, sem executar nada:
+        a de cada etapa inclui as das suas dependências, então uma
+        mudança se propaga para tudo o que vem depois.
+
+        Além do código da etapa e de `codigo`, entra o código de todo
+        módulo do pacote alcançável a partir deles (ex.: mudar
+        src/preprocessing.py reexecuta as etapas LSTM).
+        """
+
+        impressoes = {}
+        fontes = {}
+
+        for nome, etapa in self.etapas.items():
+            h = hashlib.sha256()
+            modulos = set()
+
+            for funcao in [etapa.funcao, *etapa.codigo]:
+                h.update(inspect.getsource(funcao).encode())
+                modulos |= _modulos_usados(funcao)
+
+            # Código dos módulos do pacote usados pela etapa
+            for modulo in sorted(modulos):
+                if modulo not in fontes:
+                    fontes[modulo] = _hash_arquivo(_arquivo_modulo(modulo))
+
+                h.update(modulo.encode())
+                h.update(fontes[modulo].encode())
+
+            h.update(json.dumps(etapa.parametros, sort_keys=True, default=str).encode())
+
+            for path in etapa.arquivos:
+                h.update(path.encode())
+                h.update(_hash_arquivo(path).encode() if os.path.exists(path) else b"ausente")
+
+            for dependencia in etapa.dependencias:
+                h.update(impressoes[dependencia].encode())
+
+            impressoes[nome] = h.hexdigest()
+
+        return impressoes
+
+    def planejar(self) -> dict:
+        """
+        Retorna dict etapa → motivo da execução, ou None se a etapa
+        está atualizada.
+        """
+
+        estado = self._ler_estado()
+        impressoes = self.impressoes_digitais()
+        plano = {}
+
+        for nome, etapa in self.etapas.items():
+
+            if nome not in estado:
+                plano[nome] = "nova"
+            elif not os.path.exists(self._path_resultado(nome)):
+                plano[nome] = "resultado ausente"
+            elif estado[nome] != impressoes[nome]:
+                mudou = [d for d in etapa.dependencias if plano[d] is not None]
+                plano[nome] = (
+                    f"dependência mudou ({', '.join(mudou)})" if mudou
+                    else "código, parâmetros ou arquivos mudaram"
+                )
+            else:
+                plano[nome] = None
+
+        return plano
+
+    def _niveis(self) -> list:
+        """
+        Agrupa as etapas em níveis: cada nível só depende dos anteriores.
+        """
+
+        nivel = {}
+
+        for nome, etapa in self.etapas.items():
+            nivel[nome] = 1 + max((nivel[d] for d in etapa.dependencias), default=-1)
+
+        return [
+            [nome for nome in self.etapas if nivel[nome] == n]
+            for n in range(max(nivel.values(), default=-1) + 1)
+        ]
+
+    # =====================================================
+    # EXECUÇÃO
+    # =====================================================
+
+    def executar(self, n_workers: int = None, dry_run: bool = False, seed: int = 42) -> dict:
+        """
+        Executa as etapas desatualizadas, nível a nível; as de um mesmo
+        nível rodam em paralelo.
+
+        Com dry_run=True só imprime o plano. Retorna o plano
+        (etapa → motivo ou None).
+        """
+
+        plano = self.planejar()
+
+        for nome, motivo in plano.items():
+            print(f"   {'▶' if motivo else '✓'} {nome:<28} {motivo or 'atualizada'}")
+
+        if dry_run:
+            return plano
+
+        estado = self._ler_estado()
+        impressoes = self.impressoes_digitais()
+        resultados = {}
+
+        for nivel in self._niveis():
+
+            pendentes = [nome for nome in nivel if plano[nome]]
+
+            # Resultados (do disco) das dependências das etapas pendentes
+            for nome in pendentes:
+                for dependencia in self.etapas[nome].dependencias:
+                    if dependencia not in resultados:
+                        with open(self._path_resultado(dependencia), "rb") as arquivo:
+                            resultados[dependencia] = pickle.load(arquivo)
+
+            tarefas = {
+                nome: (
+                    _executar_etapa,
+                    (
+                        self.etapas[nome].funcao,
+                        [resultados[d] for d in self.etapas[nome].dependencias],
+                        self.etapas[nome].parametros
+                    )
+                )
+                for nome in pendentes
+            }
+
+            if not tarefas:
+                continue
+
+            paralelas = {n: t for n, t in tarefas.items() if self.etapas[n].paralela}
+            leves = {n: t for n, t in tarefas.items() if not self.etapas[n].paralela}
+
+            concluidas = executar_tarefas(paralelas, n_workers=n_workers, seed=seed) if paralelas else {}
+            concluidas.update(executar_tarefas(leves, n_workers=1))
+
+            for nome, resultado in concluidas.items():
+
+                with open(self._path_resultado(nome), "wb") as arquivo:
+                    pickle.dump(resultado, arquivo)
+
+                resultados[nome] = resultado
+                estado[nome] = impressoes[nome]
+
+            # Grava a cada nível: uma falha adiante não perde o que já rodou
+            self._gravar_estado(estado)
+
+        return plano
+
+    def resultado(self, nome: str):
+        """
+        Resultado gravado da etapa (executada agora ou antes).
+        """
+
+        with open(self._path_resultado(nome), "rb") as arquivo:
+            return pickle.load(arquivo)
+
+
+def _executar_etapa(funcao, entradas, parametros):
+    return funcao(*entradas, **parametros)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pela população de referência por UF e ano,
+usada nas taxas de mortalidade por 100 mil habitantes.
+
+A planilha do IBGE (População_Estadual_2010-2021.xlsx) é convertida
+uma única vez para populacao_uf.npz: uma matriz densa por coluna
+(TOTAL, MASCULINO, FEMININO) indexada por [código da UF, ano - ano
+inicial]. As junções com as contagens são lookups por índice inteiro,
+sem `read_excel` a cada execução nem merge por nome de estado.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from .ingestion import UFS
+
+
+PLANILHA_PADRAO = "Data/raw/População_Estadual_2010-2021.xlsx"
+CACHE_PADRAO = "Data/processed/populacao_uf.npz"
+
+COLUNAS_POPULACAO = ("TOTAL", "MASCULINO", "FEMININO")
+
+# Códigos IBGE das UFs têm dois dígitos: a matriz tem uma linha por código
+N_CODIGOS = 100
+
+
+# =====================================================
+# CONVERSÃO DA PLANILHA (UMA VEZ)
+# =====================================================
+
+def converter_planilha_populacao(planilha: str = PLANILHA_PADRAO,
+                                 destino: str = CACHE_PADRAO) -> str:
+    """
+    Converte a planilha de população (colunas 'Unidade da Federação'
+    como '11 Rondônia', Masculino, Feminino, Total e ano) para o
+    cache .npz. Retorna o caminho do cache.
+    """
+
+    df = pd.read_excel(planilha)
+    df.columns = df.columns.str.strip().str.upper()
+
+    # Código numérico da UF (o nome é descartado); linhas sem código
+    # (notas e totais no rodapé da planilha) são ignoradas
+    codigos = pd.to_numeric(
+        df["UNIDADE DA FEDERAÇÃO"].astype(str).str.extract(r"^\s*(\d{2})\b")[0],
+        errors="coerce"
+    )
+    df = df[codigos.notna()]
+    codigos = codigos[codigos.notna()].astype(np.int64).to_numpy()
+
+    desconhecidos = set(codigos) - {int(codigo) for codigo in UFS}
+    if desconhecidos:
+        raise ValueError(f"Códigos de UF desconhecidos na planilha: {sorted(desconhecidos)}")
+
+    anos = df["ANO"].astype(np.int64).to_numpy()
+
+    temporario = f"{destino}.{os.getpid()}.tmp.npz"
+    os.makedirs(os.path.dirname(destino) or ".", exist_ok=True)
+
+    np.savez(
+        temporario,
+        CODIGO_UF=codigos.astype(np.int16),
+        ANO=anos.astype(np.int16),
+        **{coluna: df[coluna].to_numpy(np.int64) for coluna in COLUNAS_POPULACAO}
+    )
+    os.replace(temporario, destino)
+
+    return destino
+
+
+# =====================================================
+# TABELA INDEXADA POR (UF, ANO)
+# =====================================================
+
+class TabelaPopulacao:
+    """
+    População por (código da UF, ano) em matrizes densas.
+
+    Anos fora do período da tabela usam o ano mais próximo disponível
+    (ex.: 2022 usa 2021); códigos que não são UFs resultam em NaN.
+    """
+
+    def __init__(self, codigos, anos, colunas: dict):
+
+        codigos = np.asarray(codigos, dtype=np.int64)
+        anos = np.asarray(anos, dtype=np.int64)
+
+        self.ano_inicial = int(anos.min())
+        self.ano_final = int(anos.max())
+
+        coluna_ano = anos - self.ano_inicial
+
+        self._matrizes = {}
+
+        for coluna, valores in colunas.items():
+            matriz = np.full((N_CODIGOS, self.ano_final - self.ano_inicial + 1), np.nan)
+            matriz[codigos, coluna_ano] = valores
+            self._matrizes[coluna] = matriz
+
+    @property
+    def colunas(self) -> list:
+        return list(self._matrizes)
+
+    def _coluna_ano(self, anos) -> np.ndarray:
+        anos = np.asarray(anos, dtype=np.int64)
+        return np.clip(anos, self.ano_inicial, self.ano_final) - self.ano_inicial
+
+    def populacao(self, codigos_uf, anos, coluna: str = "TOTAL") -> np.ndarray:
+        """
+        População de cada par (código da UF, ano), vetorizada.
+        """
+
+        codigos = np.asarray(codigos_uf, dtype=np.int64)
+        validos = (codigos >= 0) & (codigos < N_CODIGOS)
+
+        valores = self._matrizes[coluna][np.where(validos, codigos, 0), self._coluna_ano(anos)]
+
+        return np.where(validos, valores, np.nan)
+
+    def nacional(self, anos, coluna: str = "TOTAL") -> np.ndarray:
+        """
+        População do Brasil (soma das UFs) em cada ano.
+        """
+
+        totais = np.nansum(self._matrizes[coluna], axis=0)
+
+        return totais[self._coluna_ano(anos)]
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """
+        Tabela longa indexada por (CODIGO_UF, ANO).
+        """
+
+        matriz = self._matrizes[self.colunas[0]]
+        codigos, colunas_ano = np.nonzero(~np.isnan(matriz))
+
+        return pd.DataFrame(
+            {coluna: m[codigos, colunas_ano].astype(np.int64) for coluna, m in self._matrizes.items()},
+            index=pd.MultiIndex.from_arrays(
+                [codigos, colunas_ano + self.ano_inicial],
+                names=["CODIGO_UF", "ANO"]
+            )
+        )
+
+
+def carregar_populacao(path: str = CACHE_PADRAO,
+                       planilha: str = PLANILHA_PADRAO) -> TabelaPopulacao:
+    """
+    Carrega a tabela de população do cache .npz.
+
+    O cache é (re)gerado a partir da planilha só quando não existe
+    ou quando a planilha é mais recente.
+    """
+
+    desatualizado = (
+        not os.path.exists(path)
+        or (os.path.exists(planilha) and os.path.getmtime(planilha) > os.path.getmtime(path))
+    )
+
+    if desatualizado:
+        if not os.path.exists(planilha):
+            raise FileNotFoundError(f"Planilha de população não encontrada: {planilha}")
+
+        converter_planilha_populacao(planilha, path)
+
+    with np.load(path) as dados:
+        return TabelaPopulacao(
+            dados["CODIGO_UF"],
+            dados["ANO"],
+            {coluna: dados[coluna] for coluna in COLUNAS_POPULACAO if coluna in dados}
+        )
+
+
+# =====================================================
+# TAXAS POR 100 MIL HABITANTES
+# =====================================================
+
+def taxa_por_100k(contagens,
+                  populacao: TabelaPopulacao = None,
+                  coluna: str = "OBITOS",
+                  coluna_populacao: str = "TOTAL"):
+    """
+    Taxa mensal de óbitos por 100 mil habitantes.
+
+    - Series mensal (índice DATA, ex.: `agregar_serie_mensal`):
+      taxa nacional, dividida pela soma da população das UFs
+    - Painel CHAVE, DATA, `coluna` (ex.: `agregar_painel_mensal`
+      com nivel='uf'): adiciona POPULACAO e TAXA_100K
+
+    A população de cada mês é a do seu ano.
+    """
+
+    populacao = carregar_populacao() if populacao is None else populacao
+
+    if isinstance(contagens, pd.Series):
+        anos = pd.DatetimeIndex(contagens.index).year
+        pessoas = populacao.nacional(anos, coluna_populacao)
+
+        return (contagens / pessoas * 100_000).rename("TAXA_100K")
+
+    anos = pd.DatetimeIndex(contagens["DATA"]).year
+    pessoas = populacao.populacao(contagens["CHAVE"].to_numpy(), anos, coluna_populacao)
+
+    return contagens.assign(
+        POPULACAO=pessoas,
+        TAXA_100K=contagens[coluna].to_numpy() / pessoas * 100_000
+    )
@@ -5,14 +5,13 @@ Inclui:
 - Validação da série
 - Tratamento de valores nulos
 - Garantia de frequência mensal
-- Normalização (MinMaxScaler)
+- Normalização (MinMaxScaler e MinMax vetorizado por série)
 - Criação de sequências para LSTM
 - Split temporal sem shuffle
 """
 
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
 
 
 # =====================================================
@@ -67,6 +66,8 @@ def normalizar_serie(serie: pd.Series):
     - série escalada
     """
 
+    from sklearn.preprocessing import MinMaxScaler
+
     scaler = MinMaxScaler(feature_range=(0, 1))
 
     serie_scaled = scaler.fit_transform(
@@ -76,22 +77,91 @@ def normalizar_serie(serie: pd.Series):
     return scaler, serie_scaled
 
 
+def normalizar_painel(valores: np.ndarray):
+    """
+    MinMax (0,1) por série, vetorizado, para painel (S, T).
+
+    Retorna:
+    - mínimos (S, 1)
+    - amplitudes (S, 1) — séries constantes usam amplitude 1
+    - painel escalado (S, T)
+    """
+
+    valores = np.asarray(valores, dtype=np.float64)
+
+    minimos = np.nanmin(valores, axis=1, keepdims=True)
+    amplitudes = np.nanmax(valores, axis=1, keepdims=True) - minimos
+    amplitudes[amplitudes == 0] = 1.0
+
+    return minimos, amplitudes, (valores - minimos) / amplitudes
+
+
 # =====================================================
 # CRIAÇÃO DE SEQUÊNCIAS (LSTM)
 # =====================================================
 
-def criar_sequencias(data: np.ndarray, seq_length: int):
+def criar_sequencias(data: np.ndarray,
+                     seq_length: int,
+                     horizonte: int = 1,
+                     copiar: bool = False):
     """
     Converte série escalada em janelas deslizantes.
+
+    Usa `sliding_window_view`: X e y são visões somente leitura
+    sobre `data`, sem copiar cada janela. Use `copiar=True`
+    para obter arrays contíguos (graváveis).
+
+    Formatos:
+    - data (T,)           → X (N, seq_length),       y (N,)
+    - data (T, F)         → X (N, seq_length, F),    y (N, F)
+    - data (S, T, F)      → X (S, N, seq_length, F), y (S, N, F)
+    Com horizonte > 1, y ganha o eixo do horizonte:
+    y (N, horizonte), (N, horizonte, F) ou (S, N, horizonte, F).
+
+    N = T - seq_length - horizonte + 1; série curta demais
+    resulta em N = 0 (arrays vazios).
     """
 
-    X, y = [], []
+    data = np.asarray(data)
+
+    # Série 1-D: janelas sem o eixo de features (como antes)
+    if data.ndim == 1:
+        X, y = criar_sequencias(data.reshape(-1, 1), seq_length, horizonte, copiar)
+        return X[..., 0], y[..., 0]
+
+    eixo_tempo = data.ndim - 2
+    n_janelas = data.shape[eixo_tempo] - seq_length - horizonte + 1
+
+    if n_janelas <= 0:
+        lote, n_features = data.shape[:eixo_tempo], data.shape[-1]
+        eixo_horizonte = () if horizonte == 1 else (horizonte,)
+
+        return (
+            np.empty(lote + (0, seq_length, n_features), dtype=data.dtype),
+            np.empty(lote + (0,) + eixo_horizonte + (n_features,), dtype=data.dtype)
+        )
+
+    # (..., T - seq_length + 1, F, seq_length) → (..., N, seq_length, F)
+    X = np.lib.stride_tricks.sliding_window_view(
+        data, seq_length, axis=eixo_tempo
+    )
+    X = np.moveaxis(X, -1, -2)
+    X = X[..., :n_janelas, :, :]
+
+    alvo = data[..., seq_length:, :]
+
+    if horizonte == 1:
+        y = alvo[..., :n_janelas, :]
+    else:
+        y = np.lib.stride_tricks.sliding_window_view(
+            alvo, horizonte, axis=eixo_tempo
+        )
+        y = np.moveaxis(y, -1, -2)
 
-    for i in range(len(data) - seq_length):
-        X.append(data[i:i + seq_length])
-        y.append(data[i + seq_length])
+    if copiar:
+        return np.ascontiguousarray(X), np.ascontiguousarray(y)
 
-    return np.array(X), np.array(y)
+    return X, y
 
 
 # =====================================================
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo responsável pelo registro local dos modelos LSTM treinados.
+
+Cada modelo fica em <diretorio>/<nome>/ com:
+- modelo.keras     → rede treinada (formato Keras)
+- scaler.pkl       → MinMaxScaler ajustado em `preparar_dados_lstm`
+- metadados.json   → SEQ_LENGTH, configuração, impressão digital dos
+                     dados de treino e versões
+
+`carregar_modelo` lê do disco só quando necessário e mantém os
+modelos usados mais recentemente em memória (LRU limitado).
+"""
+
+import os
+import json
+import pickle
+import shutil
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from .cache import atualizar_hash_serie
+
+
+DIRETORIO_PADRAO = "Data/processed/modelos"
+MAX_EM_MEMORIA = 4
+
+# (diretorio, nome) → (mtime dos metadados, entrada)
+_em_memoria = OrderedDict()
+
+
+# =====================================================
+# IMPRESSÃO DIGITAL DOS DADOS
+# =====================================================
+
+def impressao_digital_serie(serie: pd.Series) -> str:
+    """
+    Hash SHA-256 dos valores e datas da série usada no treino.
+    """
+
+    return atualizar_hash_serie(hashlib.sha256(), serie).hexdigest()
+
+
+# =====================================================
+# GRAVAÇÃO
+# =====================================================
+
+def salvar_modelo(nome: str,
+                  model,
+                  scaler,
+                  seq_length: int,
+                  config: dict,
+                  serie: pd.Series,
+                  diretorio: str = DIRETORIO_PADRAO) -> str:
+    """
+    Grava modelo, scaler e metadados no registro.
+
+    A gravação é feita em um diretório temporário e só então
+    substitui a versão anterior do modelo.
+
+    Retorna o caminho do modelo no registro.
+    """
+
+    import tensorflow as tf
+
+    destino = os.path.join(diretorio, nome)
+    temporario = f"{destino}.{os.getpid()}.tmp"
+
+    shutil.rmtree(temporario, ignore_errors=True)
+    os.makedirs(temporario)
+
+    model.save(os.path.join(temporario, "modelo.keras"))
+
+    with open(os.path.join(temporario, "scaler.pkl"), "wb") as arquivo:
+        pickle.dump(scaler, arquivo)
+
+    metadados = {
+        "nome": nome,
+        "seq_length": int(seq_length),
+        "config": config,
+        "impressao_digital": impressao_digital_serie(serie),
+        "inicio_serie": str(serie.index[0]),
+        "fim_serie": str(serie.index[-1]),
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+        "tensorflow": tf.__version__,
+        "numpy": np.__version__
+    }
+
+    with open(os.path.join(temporario, "metadados.json"), "w", encoding="utf-8") as arquivo:
+        json.dump(metadados, arquivo, ensure_ascii=False, indent=2)
+
+    shutil.rmtree(destino, ignore_errors=True)
+    os.replace(temporario, destino)
+
+    _em_memoria.pop((os.path.abspath(diretorio), nome), None)
+
+    return destino
+
+
+# =====================================================
+# LEITURA
+# =====================================================
+
+def listar_modelos_registrados(diretorio: str = DIRETORIO_PADRAO) -> list:
+    """
+    Lista os nomes dos modelos presentes no registro.
+    """
+
+    if not os.path.isdir(diretorio):
+        return []
+
+    return sorted(
+        nome for nome in os.listdir(diretorio)
+        if os.path.isfile(os.path.join(diretorio, nome, "metadados.json"))
+    )
+
+
+def carregar_metadados(nome: str, diretorio: str = DIRETORIO_PADRAO) -> dict:
+    """
+    Lê apenas os metadados (sem carregar a rede).
+    """
+
+    path = os.path.join(diretorio, nome, "metadados.json")
+
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Modelo não registrado: {nome}")
+
+    with open(path, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def carregar_modelo(nome: str, diretorio: str = DIRETORIO_PADRAO) -> dict:
+    """
+    Carrega um modelo do registro.
+
+    Retorna dict com 'model', 'scaler', 'seq_length', 'config',
+    'impressao_digital' e demais metadados.
+
+    Modelos já carregados são reutilizados enquanto o registro
+    não for regravado; além de MAX_EM_MEMORIA, o usado há mais
+    tempo é descartado.
+    """
+
+    from tensorflow.keras.models import load_model
+
+    chave = (os.path.abspath(diretorio), nome)
+    path_metadados = os.path.join(diretorio, nome, "metadados.json")
+
+    if not os.path.exists(path_metadados):
+        raise FileNotFoundError(f"Modelo não registrado: {nome}")
+
+    mtime = os.path.getmtime(path_metadados)
+
+    if chave in _em_memoria and _em_memoria[chave][0] == mtime:
+        _em_memoria.move_to_end(chave)
+        return _em_memoria[chave][1]
+
+    entrada = carregar_metadados(nome, diretorio)
+
+    # Só inferência: não é preciso restaurar o otimizador
+    entrada["model"] = load_model(
+        os.path.join(diretorio, nome, "modelo.keras"),
+        compile=False
+    )
+
+    with open(os.path.join(diretorio, nome, "scaler.pkl"), "rb") as arquivo:
+        entrada["scaler"] = pickle.load(arquivo)
+
+    _em_memoria[chave] = (mtime, entrada)
+    _em_memoria.move_to_end(chave)
+
+    while len(_em_memoria) > MAX_EM_MEMORIA:
+        _em_memoria.popitem(last=False)
+
+    return entrada
+
+
+def limpar_cache_modelos():
+    """
+    Descarta os modelos mantidos em memória.
+    """
+
+    _em_memoria.clear()
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Testes offline do leitor .dbc: vetor publicado do PKWare DCL,
+ida e volta implodir → explodir e .dbc gerado por `gravar_dbc`
+contra o CSV equivalente.
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.dbc import explodir, implodir, gravar_dbc, ler_dbc, ler_campos_dbc
+from src.ingestion import COLUNAS_BASE, agregar_serie_mensal
+
+
+def registros_sim(n=3000, seed=0) -> pd.DataFrame:
+    """
+    Registros do SIM sintéticos (todas as COLUNAS_BASE, como texto).
+    """
+
+    rng = np.random.default_rng(seed)
+    cids = np.array(["I219", "I10X", "E149", "J189", "C349"])
+    linha = lambda: np.where(rng.random(n) < 0.4, "", "*" + rng.choice(cids, n))  # noqa: E731
+
+    df = pd.DataFrame({
+        "TIPOBITO": "2",
+        "IDADE": np.char.add("4", rng.integers(10, 99, n).astype(str)),
+        "SEXO": rng.choice(["1", "2"], n),
+        "LINHAA": linha(),
+        "LINHAB": linha(),
+        "LINHAC": linha(),
+        "LINHAD": linha(),
+        "LINHAII": linha(),
+        "CAUSABAS": rng.choice(cids, n),
+        "CAUSABAS_O": rng.choice(cids, n),
+        "RACACOR": rng.choice(["1", "2", "3", ""], n),
+        "ESC": rng.choice(["1", "2", "9", ""], n),
+        "ATESTADO": linha(),
+        "DTOBITO": [
+            f"{d:02d}{m:02d}{a}"
+            for d, m, a in zip(rng.integers(1, 29, n), rng.integers(1, 13, n), rng.integers(2018, 2020, n))
+        ],
+        "CODMUNRES": np.char.add("35", rng.integers(1000, 9999, n).astype(str)),
+        "CODMUNOCOR": np.char.add("35", rng.integers(1000, 9999, n).astype(str)),
+    })
+
+    return df[COLUNAS_BASE]
+
+
+def test_vetor_pkware():
+    # Vetor de teste do blast.c (zlib/contrib/blast)
+    assert b"".join(explodir(bytes.fromhex("00048224258f807f"))) == b"AIAIAIAIAIAIA"
+
+
+@pytest.mark.parametrize("literais_codificados", [True, False])
+@pytest.mark.parametrize("bits_dicionario", [4, 5, 6])
+def test_ida_e_volta(literais_codificados, bits_dicionario):
+
+    rng = np.random.default_rng(bits_dicionario)
+    dados = rng.choice(list(b"ABCD 0123"), 6000).astype(np.uint8).tobytes() + b"x" * 2000
+
+    comprimido = implodir(dados, literais_codificados, bits_dicionario)
+
+    assert b"".join(explodir(comprimido)) == dados
+
+    # Arquivo lido em pedaços mínimos e saída em blocos pequenos
+    for tamanho_leitura in (1, 7, 64):
+        arquivo = io.BytesIO(b"??" + comprimido)
+        saida = explodir(arquivo, inicio=2, tamanho_bloco=1000, tamanho_leitura=tamanho_leitura)
+        assert b"".join(saida) == dados
+
+
+def test_fluxo_truncado():
+
+    comprimido = implodir(b"AIAIAIAIAIAIA" * 50)
+
+    with pytest.raises(ValueError):
+        list(explodir(comprimido[:len(comprimido) // 2], tamanho_leitura=4))
+
+
+def test_cabecalho_invalido():
+
+    with pytest.raises(ValueError):
+        list(explodir(b"\x07\x09" + bytes(16)))
+
+
+@pytest.mark.parametrize("extensao", ["dbc", "dbf"])
+def test_leitura_igual_ao_dataframe(tmp_path, extensao):
+
+    df = registros_sim(500)
+    path = str(tmp_path / f"DOSP2019.{extensao}")
+    gravar_dbc(df, path)
+
+    lido = ler_dbc(path)
+
+    assert ler_campos_dbc(path) == COLUNAS_BASE
+    assert list(lido.columns) == COLUNAS_BASE
+    pd.testing.assert_frame_equal(
+        lido.astype(object).where(lido.notna(), ""),
+        df.astype(object),
+        check_dtype=False
+    )
+
+
+def test_serie_mensal_dbc_igual_csv(tmp_path):
+
+    df = registros_sim()
+    path_dbc = str(tmp_path / "DOSP2019.dbc")
+    path_csv = str(tmp_path / "DOSP2019.csv")
+
+    gravar_dbc(df, path_dbc)
+    df.to_csv(path_csv, index=False)
+
+    # Blocos pequenos: vários lotes por arquivo
+    serie_dbc = agregar_serie_mensal(path_dbc, chunksize=700)
+    serie_csv = agregar_serie_mensal(path_csv, chunksize=700)
+
+    assert serie_dbc.sum() == len(df)
+    pd.testing.assert_series_equal(serie_dbc, serie_csv)
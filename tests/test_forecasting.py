@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Testes do SARIMA: modo incremental (ajuste_anterior) contra o
+reajuste completo e reaproveitamento da previsão pelo cache.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cache import CacheAjustes
+from src.forecasting import modelo_sarima
+
+
+@pytest.fixture(autouse=True)
+def sem_avisos():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        yield
+
+
+def serie_sazonal(n=96, seed=0):
+    """
+    Série mensal sintética: tendência + sazonalidade anual + ruído.
+    """
+
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    valores = 1000 + 2 * t + 80 * np.sin(2 * np.pi * t / 12) + rng.normal(0, 10, n)
+
+    return pd.Series(valores, index=pd.date_range("2010-01-01", periods=n, freq="MS"))
+
+
+@pytest.mark.parametrize("modo", ["filtrar", "reajustar"])
+def test_sarima_incremental_proximo_do_reajuste(modo):
+
+    serie = serie_sazonal()
+    horizonte = 12
+    origem = len(serie) - horizonte - 3
+
+    _, ajuste = modelo_sarima(
+        serie[:origem], serie[origem:origem + horizonte], retornar_ajuste=True
+    )
+
+    # Três meses novos, um por vez, como na atualização mensal
+    for fim in range(origem + 1, origem + 4):
+        train, test = serie[:fim], serie[fim:fim + horizonte]
+
+        incremental, ajuste = modelo_sarima(
+            train, test, ajuste_anterior=ajuste,
+            modo_incremental=modo, retornar_ajuste=True
+        )
+        frio = modelo_sarima(train, test)
+
+        assert ajuste.nobs == len(train)
+        assert incremental.index.equals(test.index)
+        np.testing.assert_allclose(incremental.values, frio.values, rtol=0.02)
+
+
+def test_sarima_modo_incremental_invalido():
+
+    serie = serie_sazonal()
+    _, ajuste = modelo_sarima(serie[:80], serie[80:86], retornar_ajuste=True)
+
+    with pytest.raises(ValueError):
+        modelo_sarima(serie[:81], serie[81:87], ajuste_anterior=ajuste, modo_incremental="x")
+
+
+def test_sarima_cache_devolve_previsao_guardada(tmp_path, monkeypatch):
+
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    serie = serie_sazonal()
+    train, test = serie[:84], serie[84:]
+    cache = CacheAjustes(str(tmp_path))
+
+    primeira = modelo_sarima(train, test, cache=cache)
+
+    # Com a previsão no cache o otimizador não pode rodar
+    def sem_ajuste(*args, **kwargs):
+        raise AssertionError("SARIMAX.fit chamado com a previsão no cache")
+
+    monkeypatch.setattr(SARIMAX, "fit", sem_ajuste)
+
+    segunda = modelo_sarima(train, test, cache=cache)
+    pd.testing.assert_series_equal(segunda, primeira)
+
+    # retornar_ajuste reconstrói o ajuste pelos parâmetros guardados (só filtro)
+    terceira, ajuste = modelo_sarima(train, test, cache=cache, retornar_ajuste=True)
+    np.testing.assert_allclose(terceira.values, primeira.values, rtol=1e-8)
+    assert ajuste.nobs == len(train)